@@ -11,11 +11,16 @@ import math
 import json
 import time
 import unicodedata
-import requests
 import logging
+from bisect import bisect_left, bisect_right
+from contextlib import closing
 from datetime import datetime, timedelta, timezone
 from dateutil import tz
 from unidecode import unidecode
+from alias_store import get_alias_store
+from api_client import ApiFootballClient, FetchError, QuotaExceededError, shared_rate_limiter
+from http_cache import get_http_cache
+from h2h_cache import get_h2h_cache
 
 # Configurar logging
 logger = logging.getLogger(__name__)
@@ -45,37 +50,116 @@ LEAGUE_ALLOWLIST = set([
     103,  # Superligaen Denmark
 ])
 
-# Diccionario de alias ES->EN/OFICIAL expandido
-ALIAS = {
-    "man utd": "manchester united",
-    "man city": "manchester city",
-    "wolfsburgo": "wolfsburg",
-    "américa": "america",
-    "pumas": "pumas unam",
-    "unión berlin": "union berlin",
-    "lokomotiv": "lokomotiv moscow",
-    "zenit": "zenit st. petersburg",
-    "cruz azul": "cruz azul",
-    "guadalajara": "guadalajara",
-    "az": "az alkmaar",
-    "tijuana": "club tijuana",
-    "necaxa": "necaxa",
-    "pachuca": "pachuca",
-    "monterrey": "monterrey",
-    "toluca": "toluca",
-    "leon": "leon",
-    "león": "leon",
-    "atlas": "atlas",
-    "santos": "santos laguna",
-    "crystal palace": "crystal palace",
-    "brighton": "brighton",
-    "eagles": "crystal palace",  # águilas
-    "águilas": "america",
-    # Agregar más según necesidad
-}
-
 SAFE_STOPWORDS = {"cf", "fc", "ac", "bk", "if", "club", "de", "del", "la", "el", "los", "las"}
 
+class PreparedFixtureDay:
+    """
+    Fixtures de una fecha preparados una sola vez para resolver muchas filas:
+    kickoff en segundos epoch ordenado (la ventana temporal es un bisect), nombres
+    normalizados y tokenizados, y elegibilidad de liga ya decidida.
+    len() y la iteración siguen siendo los de la lista original de fixtures.
+    """
+    
+    def __init__(self, fixtures: list, resolver: "AdvancedFixtureResolver"):
+        self.fixtures = fixtures
+        cdmx = tz.gettz(TIMEZONE)
+        entries = []
+        
+        for pos, fx in enumerate(fixtures):
+            try:
+                # Parsear fecha del fixture
+                fx_date_str = fx["fixture"]["date"]
+                if fx_date_str.endswith("Z"):
+                    fx_date_str = fx_date_str[:-1] + "+00:00"
+                kickoff = datetime.fromisoformat(fx_date_str).astimezone(cdmx).timestamp()
+                
+                # Solo ligas permitidas y no bloqueadas pueden ser candidatas
+                league = fx.get("league")
+                if not league or not resolver._allowed_league(league) or resolver._is_blocked_league(league):
+                    continue
+                
+                home_norm = resolver._norm_name(fx["teams"]["home"]["name"])
+                away_norm = resolver._norm_name(fx["teams"]["away"]["name"])
+                league_bonus = 0.05 if league["id"] in LEAGUE_ALLOWLIST else 0
+            except Exception as e:
+                logger.error(f"Error procesando fixture: {e}")
+                continue
+            
+            entries.append((kickoff, pos, home_norm, away_norm, league_bonus))
+        
+        entries.sort(key=lambda e: (e[0], e[1]))
+        self.kickoffs = [e[0] for e in entries]
+        self.positions = [e[1] for e in entries]
+        self.home_norm = [e[2] for e in entries]
+        self.away_norm = [e[3] for e in entries]
+        self.home_tokens = [set(resolver._tokenize(name)) for name in self.home_norm]
+        self.away_tokens = [set(resolver._tokenize(name)) for name in self.away_norm]
+        self.league_bonus = [e[4] for e in entries]
+        
+        # Índice invertido token -> fixtures, por lado (local / visitante)
+        self.home_postings = self._build_postings(self.home_tokens)
+        self.away_postings = self._build_postings(self.away_tokens)
+    
+    def __len__(self) -> int:
+        return len(self.fixtures)
+    
+    def __iter__(self):
+        return iter(self.fixtures)
+    
+    @staticmethod
+    def _token_keys(tokens):
+        """Claves de búsqueda de un conjunto de tokens: el token y su prefijo de 4 letras"""
+        keys = set(tokens)
+        keys.update(token[:4] + "*" for token in tokens if len(token) > 3)
+        return keys
+    
+    def _build_postings(self, token_sets):
+        postings = {}
+        for i, tokens in enumerate(token_sets):
+            for key in self._token_keys(tokens):
+                postings.setdefault(key, []).append(i)
+        return postings
+    
+    def candidates(self, local_tokens, visita_tokens, target_ts: float, window_minutes: int):
+        """
+        Como in_window, pero solo con los fixtures que comparten algún token (o prefijo)
+        con el local en el lado local o con el visitante en el lado visitante.
+        Si ninguno de esos cae en la ventana se recorre la ventana completa
+        """
+        found = set()
+        for key in self._token_keys(local_tokens):
+            found.update(self.home_postings.get(key, ()))
+        for key in self._token_keys(visita_tokens):
+            found.update(self.away_postings.get(key, ()))
+        
+        in_window = []
+        for i in found:
+            mins = int(abs(self.kickoffs[i] - target_ts) // 60)
+            if mins <= window_minutes:
+                in_window.append((i, mins))
+        
+        if not in_window:
+            return self.in_window(target_ts, window_minutes)
+        in_window.sort(key=lambda item: self.positions[item[0]])
+        return in_window
+    
+    def in_window(self, target_ts: float, window_minutes: int):
+        """
+        [(índice, minutos de diferencia)] de los fixtures elegibles dentro de la ventana,
+        en el orden original de la API (así el desempate de scores no cambia)
+        """
+        lo = bisect_left(self.kickoffs, target_ts - (window_minutes + 1) * 60)
+        hi = bisect_right(self.kickoffs, target_ts + (window_minutes + 1) * 60)
+        
+        found = []
+        for i in range(lo, hi):
+            mins = int(abs(self.kickoffs[i] - target_ts) // 60)
+            if mins <= window_minutes:
+                found.append(i)
+        found.sort(key=self.positions.__getitem__)
+        return [(i, int(abs(self.kickoffs[i] - target_ts) // 60)) for i in found]
+
+
 class AdvancedFixtureResolver:
     """Resolver avanzado de fixtures con tokenización y scoring inteligente"""
     
@@ -86,6 +170,16 @@ class AdvancedFixtureResolver:
             "Accept": "application/json"
         }
         self.cache = {}  # Cache para fixtures por fecha
+        self._prepared = {}  # Fecha -> PreparedFixtureDay
+        # Sesión compartida con rate limit por API key y caché HTTP persistente
+        self.client = ApiFootballClient(
+            headers=self.headers,
+            base_url=API_BASE,
+            rate_limiter=shared_rate_limiter(api_key),
+            cache=get_http_cache()
+        )
+        self.aliases = get_alias_store('fixtures')  # Alias persistentes compartidos
+        self.h2h_cache = get_h2h_cache()  # Fechas de enfrentamientos por par de equipos
     
     def _norm_name(self, s: str) -> str:
         """Normaliza nombre de equipo con alias y expansiones"""
@@ -95,8 +189,9 @@ class AdvancedFixtureResolver:
         s = re.sub(r"\s+", " ", s).strip()
         
         # Aplicar alias exacto
-        if s in ALIAS:
-            return ALIAS[s]
+        alias = self.aliases.get(s)
+        if alias is not None:
+            return alias['target']
         
         # Expansiones básicas
         s = s.replace(" man utd", " manchester united")
@@ -116,7 +211,10 @@ class AdvancedFixtureResolver:
     
     def _token_score(self, a: str, b: str) -> float:
         """Score por tokens con bonificaciones de prefijo/substring"""
-        ta, tb = set(self._tokenize(a)), set(self._tokenize(b))
+        return self._token_set_score(set(self._tokenize(a)), set(self._tokenize(b)))
+    
+    def _token_set_score(self, ta, tb) -> float:
+        """_token_score sobre conjuntos de tokens ya calculados"""
         if not ta or not tb:
             return 0.0
         
@@ -143,30 +241,82 @@ class AdvancedFixtureResolver:
         """Diferencia en minutos entre dos fechas"""
         return int(abs((dt1 - dt2).total_seconds()) // 60)
     
-    def _fixtures_by_date(self, date_cdmx: datetime):
-        """Obtiene fixtures por fecha con cache"""
+    def _fixtures_by_date(self, date_cdmx: datetime) -> "PreparedFixtureDay":
+        """
+        Obtiene los fixtures de la fecha (con cache) como índice preparado
+        Lanza FetchError si la API no responde: la fecha no se guarda en cache y
+        se vuelve a pedir en la próxima llamada
+        """
         date_str = date_cdmx.strftime("%Y-%m-%d")
         
         if date_str in self.cache:
             logger.info(f"Usando cache para fecha {date_str}")
-            return self.cache[date_str]
+            return self._prepared_day(date_str, self.cache[date_str])
         
-        url = f"{API_BASE}/fixtures"
         params = {"date": date_str, "timezone": TIMEZONE}
         
         try:
             logger.info(f"Obteniendo fixtures para fecha {date_str}")
-            r = requests.get(url, params=params, headers=self.headers, timeout=30)
-            r.raise_for_status()
-            data = r.json().get("response", [])
-            
-            self.cache[date_str] = data
-            logger.info(f"Obtenidos {len(data)} fixtures para {date_str}")
-            return data
+            r = self.client.get("/fixtures", params)
+            return self._prepared_day(date_str, self._store_fixtures(date_str, r))
             
+        except QuotaExceededError:
+            raise
         except Exception as e:
             logger.error(f"Error obteniendo fixtures: {e}")
-            return []
+            raise FetchError(f"No se pudieron obtener los fixtures de {date_str}: {e}") from e
+    
+    def _prepared_day(self, date_str: str, fixtures: list) -> "PreparedFixtureDay":
+        """Índice preparado de la fecha, construido una sola vez por lista de fixtures"""
+        prepared = self._prepared.get(date_str)
+        if prepared is None or prepared.fixtures is not fixtures:
+            prepared = PreparedFixtureDay(fixtures, self)
+            self._prepared[date_str] = prepared
+        return prepared
+    
+    def _store_fixtures(self, date_str: str, r) -> list:
+        """Valida la respuesta de /fixtures y la guarda en cache"""
+        r.raise_for_status()
+        data = r.json().get("response", [])
+        
+        self.cache[date_str] = data
+        logger.info(f"Obtenidos {len(data)} fixtures para {date_str}")
+        return data
+    
+    def prefetch_dates(self, dates) -> int:
+        """
+        Descarga en paralelo los fixtures de las fechas que aún no están en cache
+        (concurrencia y ritmo los controla el cliente). Retorna cuántas fechas pidió.
+        Una fecha que falla (FetchError) se registra y no se guarda: _fixtures_by_date
+        la vuelve a pedir. Con la cuota agotada lanza QuotaExceededError
+        """
+        pending = sorted({d.strftime("%Y-%m-%d") for d in dates if d is not None} - set(self.cache))
+        if not pending:
+            return 0
+        
+        logger.info(f"Descargando fixtures de {len(pending)} fechas en paralelo")
+        requests_params = [("/fixtures", {"date": date_str, "timezone": TIMEZONE}) for date_str in pending]
+        
+        with closing(self.client.get_many(requests_params)) as responses:
+            for pos, r in responses:
+                if isinstance(r, QuotaExceededError):
+                    raise r
+                try:
+                    if isinstance(r, Exception):
+                        raise r
+                    self._store_fixtures(pending[pos], r)
+                except Exception as e:
+                    logger.error(f"Error obteniendo fixtures de {pending[pos]}: {e}")
+        
+        return len(pending)
+    
+    @staticmethod
+    def _previous_year(fecha_hora_cdmx: datetime):
+        """La misma fecha un año antes (None si no existe, p. ej. 29 de febrero)"""
+        try:
+            return fecha_hora_cdmx.replace(year=fecha_hora_cdmx.year - 1)
+        except ValueError:
+            return None
     
     def _is_blocked_league(self, league_obj: dict) -> bool:
         """Verifica si la liga está en la lista negra"""
@@ -256,9 +406,10 @@ class AdvancedFixtureResolver:
         fixtures = self._fixtures_by_date(fecha_hora_cdmx)
         
         # Si no hay fixtures y try_previous_year es True, intentar con año anterior
-        if not fixtures and try_previous_year:
+        # (el 29 de febrero no tiene equivalente: se omite)
+        fecha_anterior = self._previous_year(fecha_hora_cdmx) if not fixtures and try_previous_year else None
+        if fecha_anterior is not None:
             logger.info(f"No se encontraron fixtures para {fecha_hora_cdmx.year}, intentando año anterior")
-            fecha_anterior = fecha_hora_cdmx.replace(year=fecha_hora_cdmx.year - 1)
             fixtures = self._fixtures_by_date(fecha_anterior)
             
             if fixtures:
@@ -269,79 +420,75 @@ class AdvancedFixtureResolver:
         if not fixtures:
             return {"status": "not_found", "reason": "no_fixtures_for_date"}
         
-        # Filtro de ventana temporal y ligas permitidas
-        candidates = []
-        for fx in fixtures:
-            try:
-                # Parsear fecha del fixture
-                fx_date_str = fx["fixture"]["date"]
-                if fx_date_str.endswith("Z"):
-                    fx_date_str = fx_date_str[:-1] + "+00:00"
-                
-                fx_dt_utc = datetime.fromisoformat(fx_date_str)
-                fx_dt_cdmx = fx_dt_utc.astimezone(tz.gettz(TIMEZONE))
-                
-                mins = self._minutes_diff(fx_dt_cdmx, fecha_hora_cdmx)
-                
-                # Verificar ventana temporal y liga
-                if mins <= window_minutes and fx.get("league"):
-                    if not self._allowed_league(fx["league"]):
-                        continue
-                    if self._is_blocked_league(fx["league"]):
-                        continue
-                    
-                    home = fx["teams"]["home"]["name"]
-                    away = fx["teams"]["away"]["name"]
-                    home_norm = self._norm_name(home)
-                    away_norm = self._norm_name(away)
-                    
-                    s_home = self._token_score(local_norm, home_norm)
-                    s_away = self._token_score(visita_norm, away_norm)
-                    
-                    # Score combinado con penalty por diferencia temporal
-                    score = 0.7 * s_home + 0.7 * s_away - 0.01 * mins
-                    
-                    # Bonificación si ambos lados muy altos
-                    if s_home >= 0.85 and s_away >= 0.85:
-                        score += 0.2
-                    
-                    # Bonificación por liga principal conocida
-                    if fx["league"]["id"] in LEAGUE_ALLOWLIST:
-                        score += 0.05
-                    
-                    candidates.append({
-                        "score": score,
-                        "mins_diff": mins,
-                        "fixture": fx,
-                        "home_norm": home_norm,
-                        "away_norm": away_norm,
-                        "s_home": s_home,
-                        "s_away": s_away
-                    })
-                    
-                    logger.debug(f"Candidato: {home} vs {away} (score: {score:.3f}, mins: {mins})")
-                    
-            except Exception as e:
-                logger.error(f"Error procesando fixture: {e}")
-                continue
-        
+        candidates = self._score_candidates(fixtures, fecha_hora_cdmx, local_norm, visita_norm, window_minutes)
         if not candidates:
             return {"status": "not_found", "reason": "no_candidates_in_window"}
         
-        # Ordenar por score
-        candidates.sort(key=lambda x: x["score"], reverse=True)
         best = candidates[0]
-        
         logger.info(f"Mejor candidato: score={best['score']:.3f}, mins_diff={best['mins_diff']}")
         
         # Verificación H2H opcional (deshabilitada por defecto para evitar muchas llamadas API)
-        if use_h2h_verification and len(candidates) > 1:
-            # Verificar si hay empate cerrado
-            tie = [c for c in candidates if abs(c["score"] - best["score"]) <= 0.05]
-            if len(tie) > 1:
+        if use_h2h_verification:
+            tie = self._tied_candidates(candidates)
+            if tie:
                 logger.info("Empate detectado, usando verificación H2H")
                 best = self._break_tie_with_h2h(tie, fecha_hora_cdmx)
         
+        return self._resolution(best, local_norm, visita_norm)
+    
+    def _score_candidates(self, fixtures: "PreparedFixtureDay", fecha_hora_cdmx: datetime,
+                          local_norm: str, visita_norm: str, window_minutes: int) -> list:
+        """Candidatos puntuados y ordenados de mayor a menor score"""
+        # Candidatos por índice invertido de tokens dentro de la ventana temporal; la
+        # elegibilidad de liga y los nombres normalizados ya vienen calculados en el índice
+        local_tokens = set(self._tokenize(local_norm))
+        visita_tokens = set(self._tokenize(visita_norm))
+        
+        candidates = []
+        for i, mins in fixtures.candidates(local_tokens, visita_tokens, fecha_hora_cdmx.timestamp(), window_minutes):
+            s_home = self._token_set_score(local_tokens, fixtures.home_tokens[i])
+            s_away = self._token_set_score(visita_tokens, fixtures.away_tokens[i])
+            
+            # Score combinado con penalty por diferencia temporal
+            score = 0.7 * s_home + 0.7 * s_away - 0.01 * mins
+            
+            # Bonificación si ambos lados muy altos
+            if s_home >= 0.85 and s_away >= 0.85:
+                score += 0.2
+            
+            # Bonificación por liga principal conocida
+            score += fixtures.league_bonus[i]
+            
+            fx = fixtures.fixtures[fixtures.positions[i]]
+            candidates.append({
+                "score": score,
+                "mins_diff": mins,
+                "fixture": fx,
+                "home_norm": fixtures.home_norm[i],
+                "away_norm": fixtures.away_norm[i],
+                "s_home": s_home,
+                "s_away": s_away
+            })
+            
+            logger.debug(f"Candidato: {fx['teams']['home']['name']} vs {fx['teams']['away']['name']} "
+                         f"(score: {score:.3f}, mins: {mins})")
+        
+        # Ordenar por score
+        candidates.sort(key=lambda x: x["score"], reverse=True)
+        return candidates
+    
+    @staticmethod
+    def _tied_candidates(candidates: list) -> list:
+        """Candidatos empatados con el mejor (±0.05); lista vacía si no hay empate"""
+        if len(candidates) < 2:
+            return []
+        best = candidates[0]
+        tie = [c for c in candidates if abs(c["score"] - best["score"]) <= 0.05]
+        return tie if len(tie) > 1 else []
+    
+    @staticmethod
+    def _resolution(best: dict, local_norm: str, visita_norm: str) -> dict:
+        """Resultado de resolve_fixture_ids para el candidato elegido"""
         fx = best["fixture"]
         result = {
             "status": "ok",
@@ -368,34 +515,22 @@ class AdvancedFixtureResolver:
         return result
     
     def _break_tie_with_h2h(self, candidates, fecha_hora_cdmx: datetime):
-        """Rompe empates usando head-to-head verification"""
-        target_date = fecha_hora_cdmx.date()
+        """Rompe empates usando head-to-head verification (caché H2H por par de equipos)"""
+        date_str = fecha_hora_cdmx.strftime("%Y-%m-%d")
         
         for c in candidates:
-            fx = c["fixture"]
-            home_id = fx["teams"]["home"]["id"]
-            away_id = fx["teams"]["away"]["id"]
-            
-            url = f"{API_BASE}/fixtures/headtohead"
-            params = {"h2h": f"{home_id}-{away_id}"}
-            
             try:
-                r = requests.get(url, params=params, headers=self.headers, timeout=30)
-                if r.status_code != 200:
-                    continue
-                    
-                for item in r.json().get("response", []):
-                    item_date_str = item["fixture"]["date"]
-                    if item_date_str.endswith("Z"):
-                        item_date_str = item_date_str[:-1] + "+00:00"
-                    
-                    dt_utc = datetime.fromisoformat(item_date_str)
-                    dt_cdmx = dt_utc.astimezone(tz.gettz(TIMEZONE))
-                    
-                    if dt_cdmx.date() == target_date:
-                        logger.info(f"H2H verification exitosa para {fx['teams']['home']['name']} vs {fx['teams']['away']['name']}")
-                        return c
+                confirmed = self._h2h_cached(c, date_str)
+                if confirmed is None:
+                    params = self._h2h_request_params(c, date_str)
+                    confirmed = self._h2h_record(c, date_str, self.client.get("/fixtures/headtohead", params))
+                if confirmed:
+                    fx = c["fixture"]
+                    logger.info(f"H2H verification exitosa para {fx['teams']['home']['name']} vs {fx['teams']['away']['name']}")
+                    return c
                         
+            except QuotaExceededError:
+                raise
             except Exception as e:
                 logger.error(f"Error en H2H verification: {e}")
                 continue
@@ -403,11 +538,85 @@ class AdvancedFixtureResolver:
         # Si no hubo coincidencia exacta por fecha, quedarse con el mejor score
         return candidates[0]
     
+    @staticmethod
+    def _h2h_pair(candidate: dict):
+        teams = candidate["fixture"]["teams"]
+        return teams["home"]["id"], teams["away"]["id"]
+    
+    def _h2h_cached(self, candidate: dict, date_str: str):
+        """True/False si la caché H2H cubre la fecha; None si hay que consultar la API"""
+        return self.h2h_cache.played_on(*self._h2h_pair(candidate), date_str)
+    
+    def _h2h_request_params(self, candidate: dict, date_str: str) -> dict:
+        """Parámetros de /fixtures/headtohead (solo lo posterior a lo ya guardado)"""
+        return self.h2h_cache.request_params(*self._h2h_pair(candidate), date_str)
+    
+    def _h2h_record(self, candidate: dict, date_str: str, r) -> bool:
+        """Guarda las fechas de la respuesta de /fixtures/headtohead y verifica la fecha"""
+        if r.status_code != 200:
+            return False
+        
+        payload = r.json()
+        dates = []
+        for item in payload.get("response", []):
+            item_date_str = item["fixture"]["date"]
+            if item_date_str.endswith("Z"):
+                item_date_str = item_date_str[:-1] + "+00:00"
+            
+            dt_utc = datetime.fromisoformat(item_date_str)
+            dates.append(dt_utc.astimezone(tz.gettz(TIMEZONE)).strftime("%Y-%m-%d"))
+        
+        # Una respuesta con 'errors' (p. ej. cuota agotada) no cubre ninguna fecha
+        if not payload.get("errors"):
+            self.h2h_cache.merge(*self._h2h_pair(candidate), dates)
+        return date_str in dates
+    
     def process_match_text(self, match_text: str) -> dict:
         """Procesa un texto de partido completo y retorna información de equipos"""
         # Parsear información del partido
-        parse_result = self.parse_match_text(match_text)
+        return self.process_parsed_match(self.parse_match_text(match_text), match_text)
+    
+    def process_match_texts(self, match_texts):
+        """
+        Procesa un lote de textos de partido agrupados por fecha
+        Cada fecha se descarga una sola vez (en paralelo, antes de resolver) y todas
+        sus filas se resuelven contra el mismo conjunto de fixtures.
+        Entrega (posición, resultado) fecha por fecha; si una fila lanza una excepción
+        se entrega la excepción en lugar del resultado (un FetchError se entrega a todas
+        las filas restantes de la fecha)
+        """
+        parsed = [self.parse_match_text(match_text) for match_text in match_texts]
+        
+        groups = {}
+        for pos, parse_result in enumerate(parsed):
+            date_key = parse_result["fecha_hora_cdmx"].strftime("%Y-%m-%d") if parse_result["success"] else ""
+            groups.setdefault(date_key, []).append(pos)
         
+        dates = [p["fecha_hora_cdmx"] for p in parsed if p["success"]]
+        try:
+            self.prefetch_dates(dates)
+            # Fechas sin fixtures: resolve_fixture_ids buscará el año anterior
+            self.prefetch_dates([self._previous_year(d) for d in dates if not self.cache.get(d.strftime("%Y-%m-%d"))])
+        except QuotaExceededError as e:
+            # Se entrega en la primera fila: quien consume el lote pausa y deja el resto pendiente
+            yield groups[min(groups)][0], e
+            return
+        
+        for date_key in sorted(groups):
+            positions = groups[date_key]
+            for n, pos in enumerate(positions):
+                try:
+                    yield pos, self.process_parsed_match(parsed[pos], match_texts[pos])
+                except FetchError as e:
+                    # La fecha no se pudo descargar: el resto de sus filas no vuelve a intentarlo
+                    for rest in positions[n:]:
+                        yield rest, e
+                    break
+                except Exception as e:
+                    yield pos, e
+    
+    def process_parsed_match(self, parse_result: dict, match_text: str) -> dict:
+        """Resuelve un partido ya parseado (ver parse_match_text)"""
         if not parse_result["success"]:
             return {
                 "success": False,
@@ -421,7 +630,11 @@ class AdvancedFixtureResolver:
             parse_result["local_es"],
             parse_result["visita_es"]
         )
-        
+        return self._match_result(parse_result, match_text, resolve_result)
+    
+    @staticmethod
+    def _match_result(parse_result: dict, match_text: str, resolve_result: dict) -> dict:
+        """Resultado de process_parsed_match a partir de la resolución del fixture"""
         if resolve_result["status"] != "ok":
             return {
                 "success": False,
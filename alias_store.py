@@ -0,0 +1,341 @@
+"""
+Almacén persistente de alias de equipos (SQLite)
+Un solo archivo para los alias del matcher de equipos y del resolver de fixtures,
+indexados por nombre normalizado. Se carga bajo demanda y guarda los matches
+confirmados para que las siguientes cargas se resuelvan con una búsqueda O(1)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Callable, Dict, Iterable, Optional
+
+from load_env import data_path, ensure_parent_dir
+from team_catalog import normalize_team_name
+
+# Ruta del archivo de alias (variable de entorno ALIAS_DB_PATH o dentro de DATA_DIR)
+ALIAS_DB_PATH = os.getenv('ALIAS_DB_PATH') or data_path('team_aliases.db')
+
+# Mapeo manual para casos problemáticos conocidos (matcher de equipos de app.py)
+TEAM_ALIAS_SEED = {
+    # Liga MX
+    "ÁGUILAS": "América",
+    "AGUILAS": "América",
+    "AMERICA": "América",
+    "América": "América",
+    "C. AZUL": "Cruz Azul",
+    "C AZUL": "Cruz Azul",
+    "PUMAS": "Pumas UNAM",
+    "TIJUANA": "Club Tijuana",
+    "MAZATLAN": "Mazatlán FC",
+    "MAZATLÁN": "Mazatlán FC",
+    "LEON": "León",
+    "LEÓN": "León",
+    "QUERETARO": "Querétaro",
+    "PUEBLA": "Puebla",
+    "TOLUCA": "Toluca",
+    "PACHUCA": "Pachuca",
+    "TIGRES": "Tigres UNAM",
+    "MONTERREY": "Monterrey",
+    "ATLAS": "Atlas",
+    "NECAXA": "Necaxa",
+    "JUAREZ": "FC Juárez",
+    "JUÁREZ": "FC Juárez",
+    "SAN LUIS": "Atlético San Luis",
+    "GUADALAJARA": "Guadalajara",
+
+    # Premier League
+    "Man City": "Manchester City",
+    "Man United": "Manchester United",
+    "Man Utd": "Manchester United",
+    "C. Palace": "Crystal Palace",
+    "Crystal Palace": "Crystal Palace",
+    "Brighton": "Brighton & Hove Albion",
+    "Wolves": "Wolverhampton Wanderers",
+    "Wolverhamp": "Wolverhampton Wanderers",
+    "Newcastle": "Newcastle United",
+    "West Ham": "West Ham United",
+    "Arsenal": "Arsenal",
+    "Liverpool": "Liverpool",
+    "Chelsea": "Chelsea",
+    "Tottenham": "Tottenham Hotspur",
+    "Nottingham": "Nottingham Forest",
+    "Aston Villa": "Aston Villa",
+    "Everton": "Everton",
+    "Brentford": "Brentford",
+    "Fulham": "Fulham",
+    "Bournemouth": "AFC Bournemouth",
+
+    # La Liga
+    "Real Madrid": "Real Madrid",
+    "Barcelona": "FC Barcelona",
+    "Atlético Madrid": "Atletico Madrid",
+    "Sevilla": "Sevilla",
+    "Valencia": "Valencia",
+    "Ath Bilbao": "Athletic Bilbao",
+    "Athletic": "Athletic Bilbao",
+    "Betis": "Real Betis",
+    "R. Sociedad": "Real Sociedad",
+    "Las Palmas": "UD Las Palmas",
+    "Celta": "Celta Vigo",
+    "Rayo Vallecano": "Rayo Vallecano",
+    "Villarreal": "Villarreal",
+    "Osasuna": "CA Osasuna",
+    "Espanyol": "Espanyol",
+    "Girona": "Girona",
+    "Alavés": "Deportivo Alaves",
+    "Getafe": "Getafe",
+
+    # MLS
+    "LA Galaxy": "LA Galaxy",
+    "LAFC": "Los Angeles FC",
+    "LOS ÁNGELES": "Los Angeles FC",
+    "Inter Miami": "Inter Miami CF",
+    "MIAMI": "Inter Miami CF",
+    "Austin": "Austin FC",
+    "NY City": "New York City FC",
+    "NYCFC": "New York City FC",
+    "NYC FC": "New York City FC",
+    "NY Red Bulls": "New York Red Bulls",
+    "NY RBULLS": "New York Red Bulls",
+    "NY R BULLS": "New York Red Bulls",
+    "FILADELFIA": "Philadelphia Union",
+    "Philadelphia": "Philadelphia Union",
+    "Charlotte": "Charlotte FC",
+    "Seattle": "Seattle Sounders FC",
+    "Portland": "Portland Timbers",
+    "Salt Lake": "Real Salt Lake",
+    "San Jose": "San Jose Earthquakes",
+    "SAN JOSÉ": "San Jose Earthquakes",
+    "Kansas City": "Sporting Kansas City",
+    "Columbus": "Columbus Crew",
+    "Colorado": "Colorado Rapids",
+    "Dallas": "FC Dallas",
+    "Houston": "Houston Dynamo FC",
+    "Chicago": "Chicago Fire FC",
+    "Cincinnati": "FC Cincinnati",
+    "Nashville": "Nashville SC",
+    "Minnesota": "Minnesota United FC",
+    "Orlando": "Orlando City SC",
+    "DC United": "D.C. United",
+    "Toronto": "Toronto FC",
+    "Montreal": "CF Montréal",
+    "Vancouver": "Vancouver Whitecaps FC",
+    "St. Louis": "St. Louis City SC",
+
+    # Serie A
+    "Inter": "Inter Milan",
+    "AC Milan": "AC Milan",
+    "Milan": "AC Milan",
+    "Juventus": "Juventus",
+    "Roma": "AS Roma",
+    "Lazio": "Lazio",
+    "Napoli": "Napoli",
+    "Atalanta": "Atalanta",
+    "Fiorentina": "Fiorentina",
+    "Bologna": "Bologna",
+    "Genoa": "Genoa",
+    "Lecce": "Lecce",
+    "Empoli": "Empoli",
+    "Cagliari": "Cagliari",
+    "Como": "Como",
+    "Verona": "Hellas Verona",
+    "Parma": "Parma",
+    "Udinese": "Udinese",
+
+    # Bundesliga
+    "B MUNICH": "Bayern Munich",
+    "B Munich": "Bayern Munich",
+    "Dortmund": "Borussia Dortmund",
+    "Leverkusen": "Bayer Leverkusen",
+    "Leipzig": "RB Leipzig",
+    "Stuttgart": "VfB Stuttgart",
+    "Frankfurt": "Eintracht Frankfurt",
+    "Friburgo": "SC Freiburg",
+    "Wolfsburgo": "VfL Wolfsburg",
+    "Union Berlin": "1. FC Union Berlin",
+    "W Bremen": "Werder Bremen",
+    "W. Bremen": "Werder Bremen",
+    "H. Kiel": "Holstein Kiel",
+    "St Pauli": "FC St. Pauli",
+    "Mainz": "1. FSV Mainz 05",
+
+    # Otros
+    "PSG": "Paris Saint Germain",
+    "PARÍS S.G.": "Paris Saint Germain",
+    "Marseille": "Olympique Marseille",
+    "Marsella": "Olympique Marseille",
+    "Ajax": "Ajax",
+    "PSV": "PSV Eindhoven",
+    "Feyenoord": "Feyenoord",
+    "AZ Alkmaar": "AZ Alkmaar",
+}
+
+# Diccionario de alias ES->EN/OFICIAL expandido (resolver de fixtures)
+FIXTURE_ALIAS_SEED = {
+    "man utd": "manchester united",
+    "man city": "manchester city",
+    "wolfsburgo": "wolfsburg",
+    "américa": "america",
+    "pumas": "pumas unam",
+    "unión berlin": "union berlin",
+    "lokomotiv": "lokomotiv moscow",
+    "zenit": "zenit st. petersburg",
+    "cruz azul": "cruz azul",
+    "guadalajara": "guadalajara",
+    "az": "az alkmaar",
+    "tijuana": "club tijuana",
+    "necaxa": "necaxa",
+    "pachuca": "pachuca",
+    "monterrey": "monterrey",
+    "toluca": "toluca",
+    "leon": "leon",
+    "león": "leon",
+    "atlas": "atlas",
+    "santos": "santos laguna",
+    "crystal palace": "crystal palace",
+    "brighton": "brighton",
+    "eagles": "crystal palace",  # águilas
+    "águilas": "america",
+    # Agregar más según necesidad
+}
+
+# Espacio de nombres -> (normalizador de claves, alias iniciales)
+NAMESPACES = {
+    'teams': (normalize_team_name, TEAM_ALIAS_SEED),
+    'fixtures': (None, FIXTURE_ALIAS_SEED),
+}
+
+# Orígenes que un match confirmado no puede sobrescribir
+PROTECTED_SOURCES = ('seed', 'manual')
+
+
+class AliasStore:
+    """Alias persistentes de un espacio de nombres: nombre normalizado -> equipo destino"""
+
+    def __init__(self, path: str = ALIAS_DB_PATH, namespace: str = 'teams',
+                 normalize: Optional[Callable[[str], str]] = None, seed: Optional[Dict[str, str]] = None):
+        default_normalize, default_seed = NAMESPACES.get(namespace, (None, {}))
+        self.path = path
+        self.namespace = namespace
+        self.normalize = normalize or default_normalize or (lambda name: name)
+        self.seed = default_seed if seed is None else seed
+        self._aliases: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        ensure_parent_dir(self.path)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS aliases (
+                namespace TEXT NOT NULL,
+                alias TEXT NOT NULL,
+                target TEXT NOT NULL,
+                team_id INTEGER,
+                confidence REAL NOT NULL DEFAULT 1.0,
+                source TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (namespace, alias)
+            )
+        """)
+        return conn
+
+    def _load(self) -> Dict[str, Dict]:
+        """Carga los alias del espacio de nombres (una sola vez por instancia)"""
+        with self._lock:
+            if self._aliases is None:
+                now = time.time()
+                with closing(self._connect()) as conn, conn:
+                    seed = {self.normalize(alias): target for alias, target in self.seed.items()}
+                    # La semilla manda sobre lo aprendido (no sobre lo manual) y sus cambios llegan a bases existentes
+                    conn.executemany(
+                        """
+                        INSERT INTO aliases VALUES (?, ?, ?, NULL, 1.0, 'seed', ?)
+                        ON CONFLICT(namespace, alias) DO UPDATE SET
+                            target = excluded.target, team_id = NULL, confidence = 1.0,
+                            source = 'seed', updated_at = excluded.updated_at
+                        WHERE aliases.source != 'manual'
+                          AND (aliases.source != 'seed' OR aliases.target != excluded.target)
+                        """,
+                        [(self.namespace, alias, target, now) for alias, target in seed.items()]
+                    )
+                    # Alias de semilla que ya no están en la semilla actual
+                    stale = [
+                        (self.namespace, alias) for (alias,) in conn.execute(
+                            "SELECT alias FROM aliases WHERE namespace = ? AND source = 'seed'", (self.namespace,)
+                        ) if alias not in seed
+                    ]
+                    conn.executemany("DELETE FROM aliases WHERE namespace = ? AND alias = ?", stale)
+                    rows = conn.execute(
+                        "SELECT alias, target, team_id, confidence, source FROM aliases WHERE namespace = ?",
+                        (self.namespace,)
+                    ).fetchall()
+
+                self._aliases = {
+                    alias: {'target': target, 'team_id': team_id, 'confidence': confidence, 'source': source}
+                    for alias, target, team_id, confidence, source in rows
+                }
+            return self._aliases
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Alias del nombre: {'target', 'team_id', 'confidence', 'source'} o None"""
+        if not name:
+            return None
+        return self._load().get(self.normalize(name))
+
+    def add_many(self, entries: Iterable[Dict], source: str = 'confirmed') -> int:
+        """
+        Guarda alias confirmados: dicts con 'name', 'target' y opcionalmente 'team_id'/'confidence'
+        No sobrescribe los alias manuales. Retorna cuántos alias se escribieron
+        """
+        aliases = self._load()
+        now = time.time()
+        rows = []
+        for entry in entries:
+            alias = self.normalize(entry['name'])
+            current = aliases.get(alias)
+            if not alias or (current is not None and current['source'] in PROTECTED_SOURCES):
+                continue
+
+            value = {
+                'target': entry['target'],
+                'team_id': entry.get('team_id'),
+                'confidence': entry.get('confidence', 1.0),
+                'source': source
+            }
+            if current == value:
+                continue
+            rows.append((self.namespace, alias, value['target'], value['team_id'], value['confidence'], source, now))
+            aliases[alias] = value
+
+        if rows:
+            with self._lock, closing(self._connect()) as conn, conn:
+                conn.executemany("INSERT OR REPLACE INTO aliases VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def add(self, name: str, target: str, team_id: Optional[int] = None,
+            confidence: float = 1.0, source: str = 'confirmed') -> bool:
+        """Guarda un alias; retorna False si ya existía o está protegido"""
+        return self.add_many([{'name': name, 'target': target, 'team_id': team_id, 'confidence': confidence}],
+                             source=source) > 0
+
+
+_stores: Dict[tuple, AliasStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_alias_store(namespace: str, path: str = None) -> AliasStore:
+    """Instancia compartida del almacén de alias para el espacio de nombres"""
+    key = (path or ALIAS_DB_PATH, namespace)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = AliasStore(path=key[0], namespace=namespace)
+        return _stores[key]
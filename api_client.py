@@ -0,0 +1,239 @@
+"""
+Cliente HTTP compartido para API Football
+- requests.Session con pool de conexiones (keep-alive)
+- Concurrencia acotada para descargas en paralelo
+- Rate limiter token bucket ligado a la cuota por minuto de la API
+- Timeouts de conexión y lectura en todas las llamadas
+- Cuota agotada (HTTP 429 o 'errors' de límite) -> QuotaExceededError
+- Sin respuesta útil (red, 5xx) -> FetchError: la fila queda pendiente para reintentar
+- GET idénticos simultáneos (p. ej. de dos trabajos con las mismas fechas) comparten
+  una sola solicitud
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import HttpCache, cache_key, cached_response, is_cacheable, response_ttl
+
+API_FOOTBALL_BASE_URL = "https://v3.football.api-sports.io"
+
+# Cuota de la API por minuto (depende del plan contratado)
+API_REQUESTS_PER_MINUTE = int(os.getenv('API_REQUESTS_PER_MINUTE', '30'))
+
+# Solicitudes simultáneas como máximo
+API_MAX_CONCURRENCY = int(os.getenv('API_MAX_CONCURRENCY', '4'))
+
+# Timeout (conexión, lectura) en segundos
+API_TIMEOUT = (5, 30)
+
+
+# Claves de 'errors' con las que API Football informa la cuota agotada (con HTTP 200)
+QUOTA_ERROR_KEYS = ('requests', 'rateLimit')
+
+
+class QuotaExceededError(Exception):
+    """La cuota de la API está agotada: conviene pausar en lugar de marcar filas como fallidas"""
+
+
+class FetchError(Exception):
+    """La API no respondió o respondió con error (red, 5xx): el resultado es desconocido, no 'no encontrado'"""
+
+
+def quota_error(response: requests.Response) -> Optional[str]:
+    """Mensaje de cuota agotada de la respuesta, o None si no lo es"""
+    if response.status_code == 429:
+        return f"HTTP 429: {response.text[:200]}"
+    if response.status_code != 200:
+        return None
+    try:
+        errors = response.json().get('errors')
+    except Exception:
+        return None
+    if isinstance(errors, dict):
+        for key in QUOTA_ERROR_KEYS:
+            if errors.get(key):
+                return str(errors[key])
+    return None
+
+
+class RateLimiter:
+    """
+    Token bucket: hasta 'capacity' solicitudes seguidas y luego 'rate' por segundo
+    Thread-safe; acquire() bloquea solo lo necesario para respetar la cuota
+    """
+
+    def __init__(self, requests_per_minute: int = API_REQUESTS_PER_MINUTE, capacity: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else requests_per_minute)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Toma un token si hay disponible, sin esperar"""
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> float:
+        """Espera hasta obtener un token; retorna los segundos esperados"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(self._clock())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            # Dormir fuera del lock para no bloquear a los demás hilos
+            self._sleep(wait)
+            waited += wait
+
+
+class ApiFootballClient:
+    """Cliente de API Football con sesión compartida, concurrencia acotada y rate limiting"""
+
+    def __init__(self, headers: Dict[str, str], base_url: str = API_FOOTBALL_BASE_URL,
+                 rate_limiter: Optional[RateLimiter] = None, max_concurrency: int = API_MAX_CONCURRENCY,
+                 timeout=API_TIMEOUT, cache: Optional[HttpCache] = None):
+        self.base_url = base_url.rstrip('/')
+        self.cache = cache  # caché HTTP persistente (opcional)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+        # Solicitudes en curso por clave: las idénticas esperan la respuesta de la primera
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> requests.Response:
+        """
+        GET a un endpoint (p. ej. '/teams') respetando la cuota
+        Con caché: una entrada vigente se responde sin llamar a la API; una caducada
+        se revalida con If-None-Match / If-Modified-Since. Si otro hilo ya está
+        pidiendo lo mismo, espera su respuesta en lugar de repetir la llamada.
+        Lanza QuotaExceededError si la cuota de la API está agotada
+        """
+        key = cache_key(endpoint, params, self.base_url)
+        with self._inflight_lock:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                inflight = self._inflight[key] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return inflight.result()
+
+        try:
+            response = self._get(endpoint, params, key)
+        except BaseException as e:
+            inflight.set_exception(e)
+            raise
+        else:
+            inflight.set_result(response)
+            return response
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _get(self, endpoint: str, params: Optional[Dict], key: str) -> requests.Response:
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        if self.cache is None:
+            self.rate_limiter.acquire()
+            return self._checked(self.session.get(url, params=params, timeout=self.timeout))
+
+        entry = self.cache.lookup(key)
+        if entry is not None and entry['fresh']:
+            return cached_response(entry['body'], entry['headers'], url)
+
+        headers = {}
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        self.rate_limiter.acquire()
+        response = self._checked(self.session.get(url, params=params, headers=headers, timeout=self.timeout))
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(key, response_ttl(endpoint, params, entry['body']))
+            return cached_response(entry['body'], entry['headers'], url)
+        if is_cacheable(response):
+            self.cache.store(key, response, response_ttl(endpoint, params, response.content))
+        return response
+
+    @staticmethod
+    def _checked(response: requests.Response) -> requests.Response:
+        """Lanza QuotaExceededError si la API reporta la cuota agotada"""
+        message = quota_error(response)
+        if message is not None:
+            raise QuotaExceededError(message)
+        return response
+
+    def get_many(self, requests_params: Iterable[Tuple[str, Dict]]) -> Iterator[Tuple[int, object]]:
+        """
+        Ejecuta varios GET en paralelo (como máximo max_concurrency a la vez)
+        Entrega (posición, respuesta) a medida que terminan; si una solicitud falla
+        se entrega la excepción en lugar de la respuesta. Con la cuota agotada las
+        solicitudes que faltan ya no se envían: reciben el mismo QuotaExceededError
+        """
+        requests_params = list(requests_params)
+        if not requests_params:
+            return
+        quota_errors = []
+
+        def fetch(endpoint_params):
+            if quota_errors:
+                return quota_errors[0]
+            try:
+                return self.get(*endpoint_params)
+            except QuotaExceededError as e:
+                quota_errors.append(e)
+                return e
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(requests_params))) as executor:
+            futures = {executor.submit(fetch, item): pos for pos, item in enumerate(requests_params)}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def close(self):
+        self.session.close()
+
+
+# Un limitador por API key: la cuota es de la cuenta, no de cada cliente
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def shared_rate_limiter(api_key: str) -> RateLimiter:
+    """Limitador compartido por todos los clientes de la misma API key"""
+    with _rate_limiters_lock:
+        if api_key not in _rate_limiters:
+            _rate_limiters[api_key] = RateLimiter()
+        return _rate_limiters[api_key]
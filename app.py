@@ -1,15 +1,21 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
-import requests
-import time
-import re
+import heapq
 from difflib import SequenceMatcher
 from typing import Dict, List, Optional
-import io
-import base64
 import os
+from collections.abc import Mapping
 from pathlib import Path
+from team_catalog import TeamCatalog, normalize_team_name
+from alias_store import AliasStore, get_alias_store
+from match_cache import get_match_cache
+from json_stream import JsonTeamStream, normalize_api_football_team
+from api_client import ApiFootballClient, shared_rate_limiter
+from http_cache import get_http_cache
+from progress import NullProgress, ProgressReporter, streamlit_progress
+from result_exporters import EXPORTERS, Tables, available_formats, default_format, export_tables
 
 # Configuración de la página
 st.set_page_config(
@@ -54,182 +60,26 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Equipos por lote en procesar_equipos (una actualización de progreso por lote)
+MATCH_BATCH_SIZE = 50
+
+# Candidatos que se conservan por equipo y margen mínimo entre el 1º y el 2º
+TOP_K_ALTERNATIVES = 3
+AMBIGUITY_MARGIN = 0.1
+
 class TeamAssociationSystem:
     """Sistema de asociación de equipos simplificado para Streamlit"""
     
-    def __init__(self):
-        self.manual_mappings = self._create_manual_mappings()
-    
-    def _create_manual_mappings(self) -> Dict[str, str]:
-        """Mapeo manual para casos problemáticos conocidos"""
-        return {
-            # Liga MX
-            "ÁGUILAS": "América",
-            "AGUILAS": "América", 
-            "AMERICA": "América",
-            "América": "América",
-            "C. AZUL": "Cruz Azul",
-            "C AZUL": "Cruz Azul",
-            "PUMAS": "Pumas UNAM",
-            "TIJUANA": "Club Tijuana",
-            "MAZATLAN": "Mazatlán FC",
-            "MAZATLÁN": "Mazatlán FC",
-            "LEON": "León",
-            "LEÓN": "León",
-            "QUERETARO": "Querétaro",
-            "PUEBLA": "Puebla",
-            "TOLUCA": "Toluca",
-            "PACHUCA": "Pachuca",
-            "TIGRES": "Tigres UNAM",
-            "MONTERREY": "Monterrey",
-            "ATLAS": "Atlas",
-            "NECAXA": "Necaxa",
-            "JUAREZ": "FC Juárez",
-            "JUÁREZ": "FC Juárez",
-            "SAN LUIS": "Atlético San Luis",
-            "GUADALAJARA": "Guadalajara",
-            
-            # Premier League
-            "Man City": "Manchester City",
-            "Man United": "Manchester United",
-            "Man Utd": "Manchester United",
-            "C. Palace": "Crystal Palace",
-            "Crystal Palace": "Crystal Palace",
-            "Brighton": "Brighton & Hove Albion",
-            "Wolves": "Wolverhampton Wanderers",
-            "Wolverhamp": "Wolverhampton Wanderers",
-            "Newcastle": "Newcastle United",
-            "West Ham": "West Ham United",
-            "Arsenal": "Arsenal",
-            "Liverpool": "Liverpool",
-            "Chelsea": "Chelsea",
-            "Tottenham": "Tottenham Hotspur",
-            "Nottingham": "Nottingham Forest",
-            "Aston Villa": "Aston Villa",
-            "Everton": "Everton",
-            "Brentford": "Brentford",
-            "Fulham": "Fulham",
-            "Bournemouth": "AFC Bournemouth",
-            
-            # La Liga
-            "Real Madrid": "Real Madrid",
-            "Barcelona": "FC Barcelona",
-            "Atlético Madrid": "Atletico Madrid",
-            "Sevilla": "Sevilla",
-            "Valencia": "Valencia",
-            "Ath Bilbao": "Athletic Bilbao",
-            "Athletic": "Athletic Bilbao",
-            "Betis": "Real Betis",
-            "R. Sociedad": "Real Sociedad",
-            "Las Palmas": "UD Las Palmas",
-            "Celta": "Celta Vigo",
-            "Rayo Vallecano": "Rayo Vallecano",
-            "Villarreal": "Villarreal",
-            "Osasuna": "CA Osasuna",
-            "Espanyol": "Espanyol",
-            "Girona": "Girona",
-            "Alavés": "Deportivo Alaves",
-            "Getafe": "Getafe",
-            
-            # MLS
-            "LA Galaxy": "LA Galaxy",
-            "LAFC": "Los Angeles FC",
-            "LOS ÁNGELES": "Los Angeles FC",
-            "Inter Miami": "Inter Miami CF",
-            "MIAMI": "Inter Miami CF",
-            "Austin": "Austin FC",
-            "NY City": "New York City FC",
-            "NYCFC": "New York City FC",
-            "NYC FC": "New York City FC",
-            "NY Red Bulls": "New York Red Bulls",
-            "NY RBULLS": "New York Red Bulls",
-            "NY R BULLS": "New York Red Bulls",
-            "FILADELFIA": "Philadelphia Union",
-            "Philadelphia": "Philadelphia Union",
-            "Charlotte": "Charlotte FC",
-            "Seattle": "Seattle Sounders FC",
-            "Portland": "Portland Timbers",
-            "Salt Lake": "Real Salt Lake",
-            "San Jose": "San Jose Earthquakes",
-            "SAN JOSÉ": "San Jose Earthquakes",
-            "Kansas City": "Sporting Kansas City",
-            "Columbus": "Columbus Crew",
-            "Colorado": "Colorado Rapids",
-            "Dallas": "FC Dallas",
-            "Houston": "Houston Dynamo FC",
-            "Chicago": "Chicago Fire FC",
-            "Cincinnati": "FC Cincinnati",
-            "Nashville": "Nashville SC",
-            "Minnesota": "Minnesota United FC",
-            "Orlando": "Orlando City SC",
-            "DC United": "D.C. United",
-            "Toronto": "Toronto FC",
-            "Montreal": "CF Montréal",
-            "Vancouver": "Vancouver Whitecaps FC",
-            "St. Louis": "St. Louis City SC",
-            
-            # Serie A
-            "Inter": "Inter Milan",
-            "AC Milan": "AC Milan",
-            "Milan": "AC Milan",
-            "Juventus": "Juventus",
-            "Roma": "AS Roma",
-            "Lazio": "Lazio",
-            "Napoli": "Napoli",
-            "Atalanta": "Atalanta",
-            "Fiorentina": "Fiorentina",
-            "Bologna": "Bologna",
-            "Genoa": "Genoa",
-            "Lecce": "Lecce",
-            "Empoli": "Empoli",
-            "Cagliari": "Cagliari",
-            "Como": "Como",
-            "Verona": "Hellas Verona",
-            "Parma": "Parma",
-            "Udinese": "Udinese",
-            
-            # Bundesliga
-            "B MUNICH": "Bayern Munich",
-            "B Munich": "Bayern Munich",
-            "Dortmund": "Borussia Dortmund",
-            "Leverkusen": "Bayer Leverkusen",
-            "Leipzig": "RB Leipzig",
-            "Stuttgart": "VfB Stuttgart",
-            "Frankfurt": "Eintracht Frankfurt",
-            "Friburgo": "SC Freiburg",
-            "Wolfsburgo": "VfL Wolfsburg",
-            "Union Berlin": "1. FC Union Berlin",
-            "W Bremen": "Werder Bremen",
-            "W. Bremen": "Werder Bremen",
-            "H. Kiel": "Holstein Kiel",
-            "St Pauli": "FC St. Pauli",
-            "Mainz": "1. FSV Mainz 05",
-            
-            # Otros
-            "PSG": "Paris Saint Germain",
-            "PARÍS S.G.": "Paris Saint Germain",
-            "Marseille": "Olympique Marseille",
-            "Marsella": "Olympique Marseille",
-            "Ajax": "Ajax",
-            "PSV": "PSV Eindhoven",
-            "Feyenoord": "Feyenoord",
-            "AZ Alkmaar": "AZ Alkmaar",
-        }
+    def __init__(self, use_ngram_index: bool = True, alias_store: AliasStore = None):
+        # Alias persistentes (mapeo manual + matches confirmados), se cargan bajo demanda
+        self.alias_store = alias_store if alias_store is not None else get_alias_store('teams')
+        # Con use_ngram_index=False se compara contra todo el catálogo (verificación)
+        self.use_ngram_index = use_ngram_index
+        self._catalog = None  # Último catálogo construido a partir de una lista
     
     def normalize_name(self, name: str) -> str:
         """Normaliza el nombre del equipo"""
-        if not name:
-            return ""
-        
-        normalized = name.lower().strip()
-        normalized = re.sub(r'[^\w\s]', '', normalized)
-        normalized = re.sub(r'\s+', ' ', normalized)
-        
-        common_words = ['fc', 'cf', 'club', 'de', 'del', 'la', 'el', 'los', 'las']
-        words = normalized.split()
-        filtered_words = [w for w in words if w not in common_words]
-        
-        return ' '.join(filtered_words) if filtered_words else normalized
+        return normalize_team_name(name)
     
     def calculate_similarity(self, team1: str, team2: str) -> float:
         """Calcula similaridad entre dos nombres"""
@@ -237,107 +87,311 @@ class TeamAssociationSystem:
         norm2 = self.normalize_name(team2)
         return SequenceMatcher(None, norm1, norm2).ratio()
     
-    def find_best_match(self, team_name: str, api_teams: List[Dict], context: List[Dict] = None) -> Optional[Dict]:
-        """Encuentra la mejor coincidencia usando información contextual"""
+    def get_catalog(self, api_teams) -> TeamCatalog:
+        """Devuelve el catálogo indexado para api_teams, construyéndolo una sola vez"""
+        if isinstance(api_teams, TeamCatalog):
+            return api_teams
+        
+        if self._catalog is None or not self._catalog.matches_source(api_teams):
+            self._catalog = TeamCatalog(api_teams)
+        return self._catalog
+    
+    def find_best_match(self, team_name: str, api_teams: List[Dict], context: List[Dict] = None,
+                        top_k: int = 1) -> Optional[Dict]:
+        """
+        Encuentra la mejor coincidencia usando información contextual
+        Con top_k > 1 el resultado incluye 'alternatives' y 'margin' (ver best_candidate)
+        """
+        
+        batch = self.match_many([team_name], api_teams, {team_name: context or []}, top_k=top_k)
+        return self.best_candidate(batch['candidates'][team_name], with_alternatives=top_k > 1)
+    
+    def best_candidate(self, candidates: List[Dict], with_alternatives: bool = False) -> Optional[Dict]:
+        """
+        Retorna el mejor candidato si supera el umbral mínimo
+        Con with_alternatives agrega el resto de candidatos y el margen (>= 0) entre el 1º
+        y el 2º (None si no hay segundo candidato, p. ej. coincidencia exacta o manual)
+        """
+        if not candidates or candidates[0]['confidence'] < 0.6:
+            return None
+        
+        if not with_alternatives:
+            return candidates[0]
+        
+        best = dict(candidates[0])
+        best['alternatives'] = candidates[1:]
+        best['margin'] = max(0.0, best['confidence'] - candidates[1]['confidence']) if len(candidates) > 1 else None
+        return best
+    
+    def match_many(self, team_names: List[str], catalog, contexts: Dict[str, List[Dict]] = None, top_k: int = 5) -> Dict:
+        """
+        Compara un lote de equipos contra el catálogo en una sola llamada
+        
+        Retorna:
+        - 'candidates': {equipo: [hasta top_k candidatos ordenados por confianza]}
+        - 'indices' / 'scores': matrices (equipos x top_k) con el índice en el catálogo
+          y la confianza de cada candidato, entre 0 y 1 (-1 / NaN donde no hay candidato)
+        
+        El mapeo manual o la coincidencia exacta es el único candidato (no es ambiguo);
+        el resto de los equipos recibe hasta top_k candidatos por similaridad.
+        """
+        catalog = self.get_catalog(catalog)
+        contexts = contexts or {}
         
-        # 1. Revisar mapeo manual primero
-        if team_name in self.manual_mappings:
-            mapped_name = self.manual_mappings[team_name]
-            for api_team in api_teams:
-                if self.normalize_name(mapped_name) == self.normalize_name(api_team.get('name', '')):
-                    return {
-                        'api_team': api_team,
-                        'confidence': 1.0,
-                        'method': 'manual_mapping'
-                    }
+        indices = np.full((len(team_names), top_k), -1, dtype=np.int64)
+        scores = np.full((len(team_names), top_k), np.nan)
+        candidates = {}
         
-        # 2. Búsqueda mejorada con contexto
-        candidates = []
+        # 1. Mapeo manual y coincidencia exacta (búsquedas O(1))
+        fuzzy_rows = []
+        direct_matches = {}
+        for row, team_name in enumerate(team_names):
+            direct = self._direct_match(team_name, catalog)
+            if direct is not None:
+                direct_matches[row] = direct
+            else:
+                fuzzy_rows.append(row)
+        
+        # 2. Preselección de todos los equipos de una vez (producto disperso de n-gramas)
+        norm_names = [catalog.normalize(team_names[row]) for row in fuzzy_rows]
+        if not fuzzy_rows:
+            shortlists = []
+        elif self.use_ngram_index:
+            shortlists = catalog.candidate_indices_many(norm_names)
+        else:
+            shortlists = [np.arange(len(catalog))] * len(fuzzy_rows)
         
-        for api_team in api_teams:
-            api_name = api_team.get('name', '')
+        # 3. Puntuar la preselección y completar con los equipos que la cota superior no descarta
+        ranked_by_row = {}
+        for row, norm_team, shortlist in zip(fuzzy_rows, norm_names, shortlists):
+            team_name = team_names[row]
+            context = contexts.get(team_name) or []
+            context_summary = self.summarize_context(context, catalog) if context else None
+            boosts = self._context_boosts(catalog, context_summary)
+            
+            ranked = self._score_indices(norm_team, shortlist, catalog, context_summary, boosts)
+            
+            if self.use_ngram_index:
+                kth = self._top_candidates(ranked, top_k)
+                threshold = max(kth[-1][0] if len(kth) >= top_k else 0.5, 0.5)
+                bounds, containable = catalog.similarity_upper_bounds(norm_team)
+                reachable = bounds + np.where(containable, 0.2, 0.0) + boosts >= threshold
+                reachable[shortlist] = False
+                ranked += self._score_indices(norm_team, np.flatnonzero(reachable), catalog, context_summary, boosts)
             
-            # Coincidencia exacta normalizada
-            if self.normalize_name(team_name) == self.normalize_name(api_name):
-                return {
-                    'api_team': api_team,
-                    'confidence': 1.0,
-                    'method': 'exact_match'
+            ranked_by_row[row] = self._top_candidates(ranked, top_k)
+        
+        for row, team_name in enumerate(team_names):
+            ranked = [(direct_matches[row][0], direct_matches[row][1])] if row in direct_matches else []
+            
+            for similarity, idx, context_boost, ratio in ranked_by_row.get(row, []):
+                ranked.append((idx, {
+                    'api_team': catalog.team_dict(idx),
+                    # Los bonos de contenido y contexto pueden pasar de 1; el orden usa el valor sin acotar
+                    'confidence': min(similarity, 1.0),
+                    'name_similarity': ratio,
+                    'context_boost': context_boost,
+                    'method': 'contextual_similarity' if context_boost > 0 else 'similarity'
+                }))
+            
+            for k, (idx, candidate) in enumerate(ranked):
+                indices[row, k] = idx
+                scores[row, k] = candidate['confidence']
+            candidates[team_name] = [candidate for _, candidate in ranked]
+        
+        return {'team_names': list(team_names), 'indices': indices, 'scores': scores, 'candidates': candidates}
+    
+    def _top_candidates(self, ranked: List[tuple], k: int) -> List[tuple]:
+        """Los k mejores (confianza, índice, boost, ratio) con un heap acotado, sin ordenar toda la lista"""
+        # A igualdad de confianza gana el primero en el catálogo
+        return heapq.nsmallest(k, ranked, key=lambda c: (-c[0], c[1]))
+    
+    def _direct_match(self, team_name: str, catalog: TeamCatalog) -> Optional[tuple]:
+        """Mapeo manual o coincidencia exacta normalizada: (índice, resultado) o None"""
+        
+        # Revisar alias persistentes primero (mapeo manual y matches confirmados)
+        alias = self.alias_store.get(team_name)
+        # Un alias que apunta al mismo nombre normalizado lo resuelve el match exacto
+        if alias is not None and catalog.normalize(alias['target']) != catalog.normalize(team_name):
+            mapped_idx = self._alias_index(alias, catalog)
+            if mapped_idx is not None:
+                return mapped_idx, {
+                    'api_team': catalog.team_dict(mapped_idx),
+                    'confidence': min(max(alias['confidence'], 0.0), 1.0),
+                    'method': 'manual_mapping' if alias['source'] == 'seed' else 'alias_store'
                 }
+        
+        exact_idx = catalog.index_of(catalog.normalize(team_name))
+        if exact_idx is not None:
+            return exact_idx, {
+                'api_team': catalog.team_dict(exact_idx),
+                'confidence': 1.0,
+                'method': 'exact_match'
+            }
+        
+        return None
+    
+    def _alias_index(self, alias: Dict, catalog: TeamCatalog) -> Optional[int]:
+        """Índice del equipo destino de un alias: por ID si el nombre coincide, si no por nombre"""
+        target_norm = catalog.normalize(alias['target'])
+        if alias['team_id'] is not None:
+            idx = catalog.index_of_id(alias['team_id'])
+            if idx is not None and catalog.normalized[idx] == target_norm:
+                return idx
+        return catalog.index_of(target_norm)
+    
+    def cache_key(self, team_name: str, catalog: TeamCatalog, context: List[Dict] = None) -> tuple:
+        """
+        Clave del resultado en la caché entre ejecuciones: (nombre normalizado, firma)
+        La firma cubre lo que cambia el resultado además del catálogo: el contexto (solo
+        a través del conteo de países de los oponentes) y el alias guardado para el nombre,
+        así un alias nuevo o corregido no queda oculto por un resultado viejo
+        """
+        signature = ''
+        if context:
+            summary = self.summarize_context(context, catalog)
+            signature = json.dumps([summary['total_matches'], summary['total_opponents'],
+                                    sorted(summary['countries'].items())], ensure_ascii=False)
+        alias = self.alias_store.get(team_name)
+        if alias is not None:
+            signature += '|alias=' + json.dumps([alias['target'], alias['team_id'], alias['confidence']],
+                                                ensure_ascii=False)
+        return catalog.normalize(team_name), signature
+    
+    def remember_confirmed(self, results: Dict) -> int:
+        """
+        Guarda como alias los matches por similaridad confiables y no ambiguos
+        Se decide por la similaridad de los nombres (SequenceMatcher), no por la confianza:
+        los bonos de contenido y de contexto no bastan para fijar un alias permanente
+        """
+        entries = []
+        for team_name, result in results.items():
+            if not result or result['method'] not in ('similarity', 'contextual_similarity'):
+                continue
+            if result.get('name_similarity', 0.0) < 0.9:
+                continue
+            if result.get('margin') is not None and result['margin'] < AMBIGUITY_MARGIN:
+                continue
+            entries.append({
+                'name': team_name,
+                'target': result['api_team']['name'],
+                'team_id': result['api_team'].get('id'),
+                'confidence': result['confidence']
+            })
+        return self.alias_store.add_many(entries)
+    
+    def _context_boosts(self, catalog: TeamCatalog, context_summary: Optional[Dict]) -> np.ndarray:
+        """Vector con el boost de contexto de cada equipo del catálogo (calculado por país)"""
+        if context_summary is None:
+            return np.zeros(len(catalog))
+        
+        codes = catalog.country_codes
+        by_country = np.array([
+            self.context_boost_from_summary({'country': country}, context_summary)
+            for country in catalog.country_values
+        ])
+        return by_country[codes]
+    
+    def _score_indices(self, norm_team: str, team_indices, catalog: TeamCatalog,
+                       context_summary: Optional[Dict], boosts: np.ndarray) -> List[tuple]:
+        """Similaridad de norm_team contra los equipos indicados: [(confianza, índice, boost, ratio)]"""
+        scored = []
+        
+        for idx in team_indices.tolist():
+            norm_api = catalog.normalized[idx]
             
             # Calcular similaridad base
-            similarity = self.calculate_similarity(team_name, api_name)
+            ratio = SequenceMatcher(None, norm_team, norm_api).ratio()
+            similarity = ratio
             
             # Coincidencia de contenido
-            norm_team = self.normalize_name(team_name)
-            norm_api = self.normalize_name(api_name)
-            
             if norm_team in norm_api or norm_api in norm_team:
                 similarity += 0.2
             
             # Boost por contexto si está disponible
             context_boost = 0
-            if context and len(context) > 0:
-                context_boost = self.calculate_context_boost(team_name, api_team, context, api_teams)
+            if context_summary is not None:
+                context_boost = float(boosts[idx])
                 similarity += context_boost
             
             if similarity >= 0.5:  # Umbral más bajo para considerar candidatos
-                candidates.append({
-                    'api_team': api_team,
-                    'confidence': similarity,
-                    'context_boost': context_boost,
-                    'method': 'contextual_similarity' if context_boost > 0 else 'similarity'
-                })
+                scored.append((similarity, idx, context_boost, ratio))
+        
+        return scored
+    
+    def resolve_opponent_country(self, opponent: str, catalog: TeamCatalog) -> Optional[str]:
+        """País del primer equipo del catálogo que coincide con el oponente (memorizado por catálogo)"""
+        norm_opponent = catalog.normalize(opponent)
+        if norm_opponent in catalog.opponent_countries:
+            return catalog.opponent_countries[norm_opponent]
         
-        # Ordenar candidatos por confianza
-        candidates.sort(key=lambda x: x['confidence'], reverse=True)
+        # Solo pueden superar 0.8 los equipos cuya cota superior lo supera
+        bounds, _ = catalog.similarity_upper_bounds(norm_opponent)
         
-        # Retornar el mejor candidato si supera el umbral mínimo
-        if candidates and candidates[0]['confidence'] >= 0.6:
-            return candidates[0]
+        # La primera coincidencia exacta acota el recorrido
+        exact_idx = catalog.index_of(norm_opponent)
         
-        return None
-    
-    def calculate_context_boost(self, team_name: str, api_team: Dict, context: List[Dict], all_api_teams: List[Dict]) -> float:
-        """Calcula boost de confianza basado en contexto de partidos"""
+        opponent_country = None
+        for idx in np.flatnonzero(bounds > 0.8).tolist():
+            if exact_idx is not None and idx > exact_idx:
+                break
+            norm_opp = catalog.normalized[idx]
+            if (norm_opponent == norm_opp or
+                SequenceMatcher(None, norm_opponent, norm_opp).ratio() > 0.8):
+                opponent_country = catalog.teams[idx].get('country', '')
+                break
         
-        boost = 0
-        opponent_matches = 0
+        catalog.opponent_countries[norm_opponent] = opponent_country
+        return opponent_country
+    
+    def summarize_context(self, context: List[Dict], catalog: TeamCatalog) -> Dict:
+        """Resume el contexto en conteo de países de los oponentes, una sola vez por equipo"""
+        countries = {}
         total_opponents = 0
         
         for match_info in context:
             opponent = match_info.get('opponent', '')
             if not opponent:
                 continue
-                
+            
             total_opponents += 1
             
             # Buscar si el oponente también está en la misma liga/competición
-            opponent_country = None
-            for api_opp in all_api_teams:
-                if (self.normalize_name(opponent) == self.normalize_name(api_opp.get('name', '')) or
-                    self.calculate_similarity(opponent, api_opp.get('name', '')) > 0.8):
-                    opponent_country = api_opp.get('country', '')
-                    break
-            
-            # Si encontramos el país del oponente y coincide con nuestro equipo candidato
-            if opponent_country and opponent_country == api_team.get('country', ''):
-                opponent_matches += 1
+            opponent_country = self.resolve_opponent_country(opponent, catalog)
+            if opponent_country:
+                countries[opponent_country] = countries.get(opponent_country, 0) + 1
+        
+        return {
+            'countries': countries,
+            'total_opponents': total_opponents,
+            'total_matches': len(context)
+        }
+    
+    def context_boost_from_summary(self, api_team: Dict, summary: Dict) -> float:
+        """Boost de confianza de un candidato a partir del resumen de contexto"""
+        
+        boost = 0
         
         # Calcular boost basado en coincidencias de país con oponentes
-        if total_opponents > 0:
-            country_match_ratio = opponent_matches / total_opponents
+        if summary['total_opponents'] > 0:
+            opponent_matches = summary['countries'].get(api_team.get('country', ''), 0)
+            country_match_ratio = opponent_matches / summary['total_opponents']
             boost += country_match_ratio * 0.3  # Máximo boost de 0.3
         
         # Boost adicional si hay muchos partidos (más datos = más confianza)
-        if len(context) >= 3:
+        if summary['total_matches'] >= 3:
             boost += 0.1
-        elif len(context) >= 5:
+        elif summary['total_matches'] >= 5:
             boost += 0.15
         
         return min(boost, 0.4)  # Limitar boost máximo
+    
+    def calculate_context_boost(self, team_name: str, api_team: Dict, context: List[Dict], all_api_teams: List[Dict]) -> float:
+        """Calcula boost de confianza basado en contexto de partidos"""
+        catalog = self.get_catalog(all_api_teams)
+        return self.context_boost_from_summary(api_team, self.summarize_context(context, catalog))
 
-def normalizar_json_api_football(raw_data) -> List[Dict]:
+def normalizar_json_api_football(raw_data, progress: ProgressReporter = None) -> TeamCatalog:
     """
     Normaliza diferentes estructuras de JSON de API Football
     
@@ -347,98 +401,49 @@ def normalizar_json_api_football(raw_data) -> List[Dict]:
     3. Con response directo: {"response": [{"id": 1, "name": "Team"}, ...]}
     4. Objeto con teams: {"teams": [...]}
     5. Objeto indexado por ID: {"1553": {"id": 1553, "name": "Team"}, "8047": {...}}
+    
+    raw_data puede ser un archivo (se lee en streaming, equipo por equipo),
+    un string/bytes JSON o los datos ya parseados.
+    Los mensajes (formato detectado, estadísticas, errores) se entregan a progress;
+    sin progress la función no tiene efectos en la interfaz.
+    Retorna un TeamCatalog columnar (vacío si no hay equipos válidos)
     """
+    progress = progress or NullProgress()
     
     try:
-        # Caso 1: Si es un string, parsearlo
-        if isinstance(raw_data, str):
-            raw_data = json.loads(raw_data)
-        
-        teams_data = []
-        
-        # Caso 2: Si tiene clave "response" (formato API Football estándar)
-        if isinstance(raw_data, dict) and "response" in raw_data:
-            teams_data = raw_data["response"]
-            
-        # Caso 3: Si tiene clave "teams" 
-        elif isinstance(raw_data, dict) and "teams" in raw_data:
-            teams_data = raw_data["teams"]
-            
-        # Caso 4: Si es directamente un array
-        elif isinstance(raw_data, list):
-            teams_data = raw_data
-            
-        # Caso 5: Objeto indexado por ID (tu formato)
-        elif isinstance(raw_data, dict):
-            # Verificar si parece ser un objeto indexado por IDs
-            # Las claves deberían ser números (como strings) y los valores objetos con "id"
-            sample_keys = list(raw_data.keys())[:5]  # Tomar muestra de claves
-            
-            if sample_keys and all(key.isdigit() for key in sample_keys):
-                # Es un objeto indexado por IDs
-                st.info("🔍 Detectado formato: Objeto indexado por IDs de equipos")
-                teams_data = list(raw_data.values())
-            else:
-                # Caso 6: Si es un diccionario con datos directos
-                if "id" in raw_data:
-                    teams_data = [raw_data]
-                else:
-                    # Intentar encontrar la lista más grande en el JSON
-                    for key, value in raw_data.items():
-                        if isinstance(value, list) and len(value) > len(teams_data):
-                            teams_data = value
+        stream = JsonTeamStream(raw_data)
         
-        # Normalizar cada equipo
-        normalized_teams = []
+        # Normalizar cada equipo a medida que se lee, directo al catálogo columnar
+        normalized_teams = TeamCatalog(
+            team for team in map(normalize_api_football_team, stream) if team is not None
+        )
         
-        for item in teams_data:
-            # Si el item tiene una estructura {"team": {...}}
-            if isinstance(item, dict) and "team" in item:
-                team_data = item["team"]
-            # Si el item es directamente los datos del equipo
-            elif isinstance(item, dict):
-                team_data = item
-            else:
-                continue
-            
-            # Crear estructura normalizada
-            normalized_team = {
-                "id": team_data.get("id"),
-                "name": team_data.get("name", ""),
-                "code": team_data.get("code", ""),
-                "country": team_data.get("country", ""),
-                "founded": team_data.get("founded"),
-                "logo": team_data.get("logo", ""),
-                "national": team_data.get("national", False)
-            }
-            
-            # Solo agregar si tiene al menos ID y nombre
-            if normalized_team["id"] and normalized_team["name"]:
-                normalized_teams.append(normalized_team)
+        if stream.layout == 'indexed':
+            progress.message('info', "🔍 Detectado formato: Objeto indexado por IDs de equipos")
         
-        # Mostrar información de debug
+        # Información de debug
         if normalized_teams:
-            st.success(f"✅ Estructura detectada y normalizada correctamente")
-            st.info(f"📊 {len(normalized_teams)} equipos extraídos del JSON")
+            progress.message('success', f"✅ Estructura detectada y normalizada correctamente")
+            progress.message('info', f"📊 {len(normalized_teams)} equipos extraídos del JSON")
             
-            # Mostrar estadísticas
-            countries = set(team.get("country", "") for team in normalized_teams)
+            # Estadísticas
+            countries = normalized_teams.country_values
             national_teams = sum(1 for team in normalized_teams if team.get("national", False))
             club_teams = len(normalized_teams) - national_teams
             
-            st.write(f"🌍 **Países representados:** {len(countries)}")
-            st.write(f"🏴 **Selecciones nacionales:** {national_teams}")
-            st.write(f"⚽ **Equipos de clubes:** {club_teams}")
+            progress.message('write', f"🌍 **Países representados:** {len(countries)}")
+            progress.message('write', f"🏴 **Selecciones nacionales:** {national_teams}")
+            progress.message('write', f"⚽ **Equipos de clubes:** {club_teams}")
         
         return normalized_teams
         
     except Exception as e:
-        st.error(f"Error normalizando JSON: {str(e)}")
-        st.write("**Información de debug:**")
-        st.write(f"Tipo de datos: {type(raw_data)}")
+        progress.message('error', f"Error normalizando JSON: {str(e)}")
+        progress.message('write', "**Información de debug:**")
+        progress.message('write', f"Tipo de datos: {type(raw_data)}")
         if isinstance(raw_data, dict):
-            st.write(f"Claves principales: {list(raw_data.keys())[:10]}")
-        return []
+            progress.message('write', f"Claves principales: {list(raw_data.keys())[:10]}")
+        return TeamCatalog([])
 
 def crear_datos_equipos_ejemplo():
     """Crea datos de ejemplo para demostración"""
@@ -470,27 +475,41 @@ def crear_datos_equipos_ejemplo():
         {"id": 1327, "name": "Los Angeles FC", "code": "LAF", "country": "USA"},
     ]
 
-def obtener_equipos_desde_api(api_key: str, league_ids: List[int]) -> List[Dict]:
-    """Obtiene equipos desde API Football"""
+def obtener_equipos_desde_api(api_key: str, league_ids: List[int], client: ApiFootballClient = None,
+                              progress: ProgressReporter = None) -> TeamCatalog:
+    """
+    Obtiene equipos desde API Football
+    Las ligas se descargan en paralelo con una sesión compartida; el ritmo lo fija
+    el rate limiter de la API key en lugar de pausas fijas
+    """
+    progress = progress or NullProgress()
     
-    headers = {
-        'X-RapidAPI-Host': 'v3.football.api-sports.io',
-        'X-RapidAPI-Key': api_key
-    }
+    if client is None:
+        client = ApiFootballClient(
+            headers={
+                'X-RapidAPI-Host': 'v3.football.api-sports.io',
+                'X-RapidAPI-Key': api_key
+            },
+            rate_limiter=shared_rate_limiter(api_key),
+            cache=get_http_cache()
+        )
     
-    all_teams = []
+    teams_by_league = {}
     
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    total = len(league_ids)
+    progress.update(0, total, f"Obteniendo equipos de {total} ligas...")
     
-    for i, league_id in enumerate(league_ids):
-        status_text.text(f"Obteniendo equipos de liga {league_id}...")
-        
-        url = "https://v3.football.api-sports.io/teams"
-        params = {'league': league_id, 'season': 2024}
+    requests_params = [('/teams', {'league': league_id, 'season': 2024}) for league_id in league_ids]
+    
+    # Las respuestas llegan en orden de finalización; el avance se informa desde este hilo
+    for done, (pos, response) in enumerate(client.get_many(requests_params), 1):
+        league_id = league_ids[pos]
+        league_teams = []
+        status = ""
         
         try:
-            response = requests.get(url, headers=headers, params=params)
+            if isinstance(response, Exception):
+                raise response
             
             if response.status_code == 200:
                 data = response.json()
@@ -499,7 +518,7 @@ def obtener_equipos_desde_api(api_key: str, league_ids: List[int]) -> List[Dict]
                 for item in teams:
                     team = item.get('team', {})
                     if team:
-                        all_teams.append({
+                        league_teams.append({
                             'id': team.get('id'),
                             'name': team.get('name'),
                             'code': team.get('code'),
@@ -507,18 +526,22 @@ def obtener_equipos_desde_api(api_key: str, league_ids: List[int]) -> List[Dict]
                             'logo': team.get('logo')
                         })
                 
-                status_text.text(f"✅ Liga {league_id}: {len(teams)} equipos obtenidos")
+                status = f"✅ Liga {league_id}: {len(teams)} equipos obtenidos"
             else:
-                status_text.text(f"❌ Error en liga {league_id}: {response.status_code}")
+                status = f"❌ Error en liga {league_id}: {response.status_code}"
                 
         except Exception as e:
-            status_text.text(f"❌ Error en liga {league_id}: {str(e)}")
+            status = f"❌ Error en liga {league_id}: {str(e)}"
         
-        progress_bar.progress((i + 1) / len(league_ids))
-        time.sleep(0.5)  # Pausa para respetar límites de API
+        teams_by_league[pos] = league_teams
+        progress.update(done, total, status)
     
-    status_text.text(f"✅ Total: {len(all_teams)} equipos obtenidos")
-    return all_teams
+    # Mantener el orden de las ligas seleccionadas
+    all_teams = [team for pos in range(len(league_ids)) for team in teams_by_league.get(pos, [])]
+    
+    progress.update(total, total, f"✅ Total: {len(all_teams)} equipos obtenidos")
+    progress.close()
+    return TeamCatalog(all_teams)
 
 def extraer_equipos_del_excel(df: pd.DataFrame) -> List[str]:
     """Extrae equipos únicos del DataFrame"""
@@ -534,93 +557,143 @@ def extraer_equipos_del_excel(df: pd.DataFrame) -> List[str]:
     
     return sorted(list(all_teams))
 
+def _columna_texto(df: pd.DataFrame, column: str) -> pd.Series:
+    """Columna como texto sin espacios ('' si no existe; los vacíos quedan como 'nan', igual que str())"""
+    if column not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    return df[column].astype(object).map(str).str.strip()
+
 def extraer_contexto_partidos(df: pd.DataFrame) -> Dict[str, List[Dict]]:
-    """Extrae información contextual de los partidos para cada equipo"""
-    
-    team_context = {}
+    """
+    Extrae información contextual de los partidos para cada equipo
+    Operaciones por columna: cada partido se despliega en dos filas (local y
+    visitante) y el contexto de cada equipo se arma con un solo groupby.
+    Equipos en orden de primera aparición y partidos en el orden del archivo
+    """
+    local = _columna_texto(df, 'Local')
+    visitante = _columna_texto(df, 'Visitante')
+    match_text = _columna_texto(df, 'Match text')
+    fecha = _columna_texto(df, 'Fecha')
     
-    for _, row in df.iterrows():
-        local = str(row.get('Local', '')).strip()
-        visitante = str(row.get('Visitante', '')).strip()
-        match_text = str(row.get('Match text', '')).strip()
-        fecha = str(row.get('Fecha', '')).strip()
-        
-        # Crear contexto del partido
-        match_info = {
-            'opponent': visitante if local else local,
-            'match_text': match_text,
-            'fecha': fecha,
-            'is_home': True if local else False
-        }
-        
-        # Agregar contexto para el equipo local
-        if local and local != '':
-            if local not in team_context:
-                team_context[local] = []
-            match_info_local = match_info.copy()
-            match_info_local['opponent'] = visitante
-            match_info_local['is_home'] = True
-            team_context[local].append(match_info_local)
-        
-        # Agregar contexto para el equipo visitante
-        if visitante and visitante != '':
-            if visitante not in team_context:
-                team_context[visitante] = []
-            match_info_visitante = match_info.copy()
-            match_info_visitante['opponent'] = local
-            match_info_visitante['is_home'] = False
-            team_context[visitante].append(match_info_visitante)
+    # Formato largo: una fila por (partido, lado), en el orden del archivo y el local antes que el visitante
+    local, visitante = local.to_numpy(object), visitante.to_numpy(object)
+    long_df = pd.DataFrame({
+        'team': np.column_stack([local, visitante]).ravel(),
+        'opponent': np.column_stack([visitante, local]).ravel(),
+        'match_text': np.repeat(match_text.to_numpy(object), 2),
+        'fecha': np.repeat(fecha.to_numpy(object), 2),
+        'is_home': np.tile([True, False], len(df)),
+    })
+    long_df = long_df[long_df['team'] != ''].reset_index(drop=True)
+    if long_df.empty:
+        return {}
     
-    return team_context
+    records = [
+        {'opponent': opponent, 'match_text': text, 'fecha': date, 'is_home': is_home}
+        for opponent, text, date, is_home in zip(long_df['opponent'].tolist(), long_df['match_text'].tolist(),
+                                                 long_df['fecha'].tolist(), long_df['is_home'].tolist())
+    ]
+    positions = long_df.groupby('team', sort=False).indices
+    return {team: [records[pos] for pos in positions[team]] for team in pd.unique(long_df['team'])}
 
-def procesar_equipos(teams_list: List[str], api_teams: List[Dict], team_context: Dict[str, List[Dict]] = None) -> Dict:
-    """Procesa la lista de equipos y encuentra coincidencias"""
+def procesar_equipos(teams_list: List[str], api_teams: List[Dict], team_context: Dict[str, List[Dict]] = None,
+                     progress: ProgressReporter = None, alias_store: Optional[AliasStore] = None) -> Dict:
+    """
+    Procesa la lista de equipos y encuentra coincidencias
+    El avance (un evento por lote) y los avisos se entregan a progress; sin progress
+    la función no tiene efectos en la interfaz. alias_store: almacén de alias a usar
+    (por defecto el compartido)
+    """
+    progress = progress or NullProgress()
     
     # Validar que api_teams tenga la estructura correcta
     if not api_teams:
-        st.error("❌ No hay datos de equipos para procesar")
+        progress.message('error', "❌ No hay datos de equipos para procesar")
         return {}
     
     # Verificar estructura del primer equipo
-    if api_teams and isinstance(api_teams[0], dict):
+    if api_teams and isinstance(api_teams[0], Mapping):
         sample_team = api_teams[0]
         required_keys = ['id', 'name']
         missing_keys = [key for key in required_keys if key not in sample_team]
         
         if missing_keys:
-            st.error(f"❌ Estructura de JSON incorrecta. Faltan claves: {missing_keys}")
-            st.write("**Estructura esperada:**")
-            st.json({"id": 123, "name": "Nombre del equipo", "code": "COD", "country": "País"})
-            st.write("**Estructura encontrada:**")
-            st.json(sample_team)
+            progress.message('error', f"❌ Estructura de JSON incorrecta. Faltan claves: {missing_keys}")
+            progress.message('write', "**Estructura esperada:**")
+            progress.message('json', {"id": 123, "name": "Nombre del equipo", "code": "COD", "country": "País"})
+            progress.message('write', "**Estructura encontrada:**")
+            progress.message('json', sample_team)
             return {}
     
-    association_system = TeamAssociationSystem()
+    association_system = TeamAssociationSystem(alias_store=alias_store)
+    catalog = association_system.get_catalog(api_teams)
     results = {}
     
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    # Resultados de ejecuciones anteriores con el mismo catálogo (sobrevive a las sesiones)
+    match_cache = get_match_cache()
+    cache_keys = {
+        team: association_system.cache_key(team, catalog, team_context.get(team) if team_context else None)
+        for team in teams_list
+    }
+    try:
+        cached = match_cache.get_many(catalog.version, cache_keys.values())
+    except Exception as e:
+        progress.message('warning', f"⚠️ No se pudo leer la caché de resultados: {str(e)}")
+        cached = {}
+    
+    for team in teams_list:
+        if cache_keys[team] in cached:
+            results[team] = cached[cache_keys[team]]
+    pending = [team for team in teams_list if team not in results]
+    if results:
+        progress.message('info', f"♻️ {len(results)} equipos recuperados de la caché, {len(pending)} por procesar")
     
     try:
-        for i, team in enumerate(teams_list):
-            status_text.text(f"Procesando: {team}")
+        for start in range(0, len(pending), MATCH_BATCH_SIZE):
+            batch = pending[start:start + MATCH_BATCH_SIZE]
             
             try:
-                context = team_context.get(team, []) if team_context else []
-                match = association_system.find_best_match(team, api_teams, context)
-                results[team] = match
-            except Exception as e:
-                st.warning(f"⚠️ Error procesando equipo '{team}': {str(e)}")
-                results[team] = None
+                batch_matches = association_system.match_many(batch, catalog, team_context, top_k=TOP_K_ALTERNATIVES)
+                for team in batch:
+                    results[team] = association_system.best_candidate(
+                        batch_matches['candidates'][team], with_alternatives=True
+                    )
+            except Exception:
+                # Si falla el lote, procesar equipo por equipo para aislar el error
+                for team in batch:
+                    try:
+                        context = team_context.get(team, []) if team_context else []
+                        results[team] = association_system.find_best_match(
+                            team, catalog, context, top_k=TOP_K_ALTERNATIVES
+                        )
+                    except Exception as e:
+                        progress.message('warning', f"⚠️ Error procesando equipo '{team}': {str(e)}")
+                        results[team] = None
             
-            progress_bar.progress((i + 1) / len(teams_list))
+            progress.update(start + len(batch), len(pending),
+                            f"Procesando: {batch[0]} ... ({start + len(batch)}/{len(pending)})")
         
-        status_text.text("✅ Procesamiento completado")
-        return results
+        try:
+            match_cache.put_many(catalog.version, {
+                cache_keys[team]: results[team] for team in pending if team in results
+            })
+        except Exception as e:
+            progress.message('warning', f"⚠️ No se pudo guardar la caché de resultados: {str(e)}")
+        
+        # Guardar los matches confirmados para resolverlos por alias en próximas cargas
+        try:
+            association_system.remember_confirmed(results)
+        except Exception as e:
+            progress.message('warning', f"⚠️ No se pudieron guardar los alias confirmados: {str(e)}")
+        
+        progress.update(len(pending), len(pending), "✅ Procesamiento completado")
+        progress.close()
+        return {team: results[team] for team in teams_list if team in results}
         
     except Exception as e:
-        status_text.text(f"❌ Error en procesamiento: {str(e)}")
-        st.error(f"Error general en procesamiento: {str(e)}")
+        progress.update(len(results), len(teams_list), f"❌ Error en procesamiento: {str(e)}")
+        progress.message('error', f"Error general en procesamiento: {str(e)}")
+        progress.close()
         return results
 
 def generar_reporte(results: Dict) -> Dict:
@@ -629,43 +702,52 @@ def generar_reporte(results: Dict) -> Dict:
     successful = []
     low_confidence = []
     no_matches = []
+    ambiguous = []
     
     for team_name, result in results.items():
         if result is None:
             no_matches.append(team_name)
-        elif result['confidence'] >= 0.9:
-            match_info = {
-                'original': team_name,
-                'matched': result['api_team']['name'],
-                'id': result['api_team']['id'],
-                'confidence': result['confidence'],
-                'method': result['method'],
-                'country': result['api_team'].get('country', 'N/A')
-            }
-            if 'context_boost' in result:
-                match_info['context_boost'] = result['context_boost']
+            continue
+        
+        match_info = {
+            'original': team_name,
+            'matched': result['api_team']['name'],
+            'id': result['api_team']['id'],
+            'confidence': result['confidence'],
+            'method': result['method'],
+            'country': result['api_team'].get('country', 'N/A')
+        }
+        if 'context_boost' in result:
+            match_info['context_boost'] = result['context_boost']
+        
+        # Margen entre el 1º y el 2º candidato (si el matcher devolvió alternativas)
+        if 'margin' in result:
+            match_info['margin'] = result['margin']
+            match_info['ambiguous'] = result['margin'] is not None and result['margin'] < AMBIGUITY_MARGIN
+            match_info['alternatives'] = "; ".join(
+                f"{alt['api_team']['name']} (ID: {alt['api_team']['id']}, {alt['confidence']:.2f})"
+                for alt in result.get('alternatives', [])
+            )
+            if match_info['ambiguous']:
+                ambiguous.append(match_info)
+        
+        if result['confidence'] >= 0.9:
             successful.append(match_info)
         else:
-            match_info = {
-                'original': team_name,
-                'matched': result['api_team']['name'],
-                'id': result['api_team']['id'],
-                'confidence': result['confidence'],
-                'method': result['method'],
-                'country': result['api_team'].get('country', 'N/A')
-            }
-            if 'context_boost' in result:
-                match_info['context_boost'] = result['context_boost']
             low_confidence.append(match_info)
     
     return {
         'successful_matches': successful,
         'low_confidence_matches': low_confidence,
-        'no_matches': no_matches
+        'no_matches': no_matches,
+        'ambiguous_matches': ambiguous
     }
 
-def crear_excel_con_ids(df_original: pd.DataFrame, results: Dict) -> bytes:
-    """Crea archivo Excel con IDs de API Football"""
+def tablas_con_ids(df_original: pd.DataFrame, results: Dict) -> Tables:
+    """
+    Tablas de salida: Datos_con_IDs (datos originales + IDs de API Football) y
+    Mapeo_Equipos. Las filas se generan a medida que el exportador las consume
+    """
     
     # Crear mapeo de nombres a IDs
     team_mapping = {}
@@ -675,47 +757,45 @@ def crear_excel_con_ids(df_original: pd.DataFrame, results: Dict) -> bytes:
         else:
             team_mapping[team_name] = None
     
-    # Agregar columnas de IDs
-    df_result = df_original.copy()
-    df_result['Local_API_ID'] = df_result['Local'].map(team_mapping)
-    df_result['Visitante_API_ID'] = df_result['Visitante'].map(team_mapping)
-    
-    if 'Local_1' in df_result.columns:
-        df_result['Local_1_API_ID'] = df_result['Local_1'].map(team_mapping)
-    if 'Visitante_1' in df_result.columns:
-        df_result['Visitante_1_API_ID'] = df_result['Visitante_1'].map(team_mapping)
-    
-    # Crear DataFrame de mapeo
-    mapping_data = []
-    for team_name, result in results.items():
-        if result:
-            mapping_data.append({
-                'Equipo_Original': team_name,
-                'API_Football_ID': result['api_team']['id'],
-                'API_Football_Name': result['api_team']['name'],
-                'Confidence': result['confidence'],
-                'Method': result['method'],
-                'Country': result['api_team'].get('country', 'N/A')
-            })
-        else:
-            mapping_data.append({
-                'Equipo_Original': team_name,
-                'API_Football_ID': None,
-                'API_Football_Name': 'NO ENCONTRADO',
-                'Confidence': 0,
-                'Method': 'none',
-                'Country': 'N/A'
-            })
+    # Columnas de IDs (si ya existen se reemplazan en su lugar)
+    id_columns = {
+        'Local_API_ID': df_original['Local'].map(team_mapping),
+        'Visitante_API_ID': df_original['Visitante'].map(team_mapping),
+    }
+    for column in ['Local_1', 'Visitante_1']:
+        if column in df_original.columns:
+            id_columns[f'{column}_API_ID'] = df_original[column].map(team_mapping)
+    data_columns = list(df_original.columns) + [c for c in id_columns if c not in df_original.columns]
     
-    mapping_df = pd.DataFrame(mapping_data)
+    def data_rows():
+        positions = [data_columns.index(column) for column in id_columns]
+        for row, *ids in zip(df_original.itertuples(index=False, name=None), *id_columns.values()):
+            values = list(row) + [None] * (len(data_columns) - len(row))
+            for position, value in zip(positions, ids):
+                values[position] = value
+            yield values
     
-    # Crear archivo Excel en memoria
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df_result.to_excel(writer, sheet_name='Datos_con_IDs', index=False)
-        mapping_df.to_excel(writer, sheet_name='Mapeo_Equipos', index=False)
+    def mapping_rows():
+        for team_name, result in results.items():
+            if result:
+                yield [team_name, result['api_team']['id'], result['api_team']['name'], result['confidence'],
+                       result['method'], result['api_team'].get('country', 'N/A')]
+            else:
+                yield [team_name, None, 'NO ENCONTRADO', 0, 'none', 'N/A']
     
-    return output.getvalue()
+    mapping_columns = ['Equipo_Original', 'API_Football_ID', 'API_Football_Name', 'Confidence', 'Method', 'Country']
+    return {
+        'Datos_con_IDs': (data_columns, data_rows()),
+        'Mapeo_Equipos': (mapping_columns, mapping_rows()),
+    }
+
+def exportar_con_ids(df_original: pd.DataFrame, results: Dict, fmt: str = 'xlsx') -> bytes:
+    """Datos con IDs de API Football en el formato dado ('xlsx', 'csv', 'parquet' o 'arrow')"""
+    return export_tables(tablas_con_ids(df_original, results), fmt)
+
+def crear_excel_con_ids(df_original: pd.DataFrame, results: Dict) -> bytes:
+    """Crea archivo Excel con IDs de API Football (escrito fila por fila, ver excel_stream.py)"""
+    return exportar_con_ids(df_original, results, 'xlsx')
 
 # INTERFAZ PRINCIPAL
 def main():
@@ -779,7 +859,7 @@ def main():
             if st.sidebar.button("🔄 Cargar equipos desde API"):
                 if selected_leagues:
                     with st.spinner("Obteniendo equipos desde API Football..."):
-                        api_teams = obtener_equipos_desde_api(api_key, selected_leagues)
+                        api_teams = obtener_equipos_desde_api(api_key, selected_leagues, progress=streamlit_progress())
                         st.sidebar.success(f"✅ {len(api_teams)} equipos cargados")
                         st.session_state['api_teams'] = api_teams
                 else:
@@ -797,13 +877,11 @@ def main():
         
         if uploaded_json:
             try:
-                raw_data = json.load(uploaded_json)
-                
                 # Mostrar información de debug sobre la estructura
                 st.sidebar.write("🔍 **Analizando estructura del JSON...**")
                 
                 # Detectar y normalizar diferentes estructuras de JSON
-                api_teams = normalizar_json_api_football(raw_data)
+                api_teams = normalizar_json_api_football(uploaded_json, progress=streamlit_progress())
                 
                 if api_teams:
                     st.session_state['api_teams'] = api_teams
@@ -923,7 +1001,7 @@ def main():
                 try:
                     with st.spinner("Procesando equipos con información contextual..."):
                         # Procesar equipos con contexto
-                        results = procesar_equipos(teams_list, api_teams, team_context)
+                        results = procesar_equipos(teams_list, api_teams, team_context, progress=streamlit_progress())
                         
                         if not results:
                             st.error("❌ No se pudieron procesar los equipos. Revisa la estructura de tus datos.")
@@ -984,6 +1062,15 @@ def main():
                             </div>
                             """, unsafe_allow_html=True)
                         
+                        # Coincidencias ambiguas (margen pequeño entre los dos mejores candidatos)
+                        if report['ambiguous_matches']:
+                            st.subheader("🔀 Coincidencias Ambiguas (Revisar Alternativas)")
+                            ambiguous_df = pd.DataFrame(report['ambiguous_matches'])
+                            st.dataframe(
+                                ambiguous_df[['original', 'matched', 'id', 'confidence', 'margin', 'alternatives']],
+                                use_container_width=True
+                            )
+                        
                         # Sin coincidencias
                         if report['no_matches']:
                             st.subheader("❌ Equipos Sin Coincidencias")
@@ -997,13 +1084,20 @@ def main():
                         st.header("💾 Descargar Resultados")
                         
                         try:
-                            excel_data = crear_excel_con_ids(df, results)
+                            # Excel es el formato sugerido para archivos chicos; en lotes grandes, Parquet/CSV
+                            formats = available_formats()
+                            fmt = st.selectbox(
+                                "📦 Formato de descarga", formats, index=formats.index(default_format(len(df))),
+                                format_func=lambda name: EXPORTERS[name].label,
+                                help="Parquet y Arrow conservan los IDs como enteros y se leen mucho más rápido que Excel"
+                            )
+                            exporter = EXPORTERS[fmt]
                             
                             st.download_button(
-                                label="📥 Descargar Excel con IDs",
-                                data=excel_data,
-                                file_name="equipos_con_api_ids.xlsx",
-                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                                label=f"📥 Descargar datos con IDs ({exporter.label})",
+                                data=exportar_con_ids(df, results, fmt),
+                                file_name=f"equipos_con_api_ids.{exporter.extension}",
+                                mime=exporter.mime
                             )
                             
                             # Descargar resultados JSON
@@ -1041,7 +1135,7 @@ def main():
                         st.write("**Cantidad de equipos:**", len(api_teams) if api_teams else 0)
                         if api_teams and len(api_teams) > 0:
                             st.write("**Estructura del primer equipo:**")
-                            st.json(api_teams[0])
+                            st.json(dict(api_teams[0]))
         
         except Exception as e:
             st.error(f"❌ Error al procesar el archivo: {str(e)}")
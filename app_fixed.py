@@ -5,14 +5,17 @@ para obtener IDs de equipos de manera precisa - VERSIÓN CORREGIDA
 
 import streamlit as st
 import pandas as pd
-import json
 import time
 from typing import Dict, List
-import io
 import logging
 import sys
 import os
 from fixture_matcher_improved import FixtureMatcher
+from progress import ProgressReporter, streamlit_progress
+from checkpoint import CheckpointJournal, journal_path
+from job_queue import JOB_POLL_SECONDS, get_worker_pool, job_status_message
+from result_exporters import EXPORTERS, available_formats, default_format
+from resolver_pipeline import export_results, pending_message, resolve_dataframe, results_json
 from load_env import load_env_file
 
 # Cargar variables de entorno al inicio
@@ -72,177 +75,209 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def process_csv_with_fixtures(df: pd.DataFrame, api_key: str) -> Dict:
+def process_csv_with_fixtures(df: pd.DataFrame, api_key: str, progress: ProgressReporter = None,
+                              journal: CheckpointJournal = None) -> Dict:
     """
     Procesa el CSV usando fixtures de API Football
+    El ritmo de las llamadas lo controla el rate limiter compartido del cliente.
+    Cada fila terminada se registra en un checkpoint del archivo: si la sesión se
+    cae o la cuota se agota, volver a procesarlo solo resuelve las filas pendientes
     """
     logger.info(f"Iniciando procesamiento de {len(df)} filas")
     logger.info(f"API Key configurada: {api_key[:10]}...{api_key[-5:]}")
     
     matcher = FixtureMatcher(api_key)
-    results = []
+    progress = progress or streamlit_progress()
+    if journal is None:
+        journal = CheckpointJournal(journal_path('fixtures', df['Match text'].astype(str)))
     
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    processing_results = resolve_dataframe(df, matcher, progress, journal=journal)
     
-    total_rows = len(df)
-    successful_matches = 0
-    failed_matches = 0
-    
-    logger.info(f"Columnas disponibles en DataFrame: {list(df.columns)}")
-
-    for i, row in df.iterrows():
-        try:
-            match_text = str(row.get('Match text', '')).strip()
-            logger.info(f"Procesando fila {i+1}: {match_text}")
-            
-            if not match_text or match_text == 'nan':
-                logger.warning(f"Fila {i+1}: Sin texto de partido válido")
-                results.append({
-                    'row_index': i,
-                    'success': False,
-                    'error': 'Sin texto de partido',
-                    'original_data': row.to_dict()
-                })
-                failed_matches += 1
-                continue
-            
-            status_text.text(f"Procesando fila {i+1}/{total_rows}: {match_text}")
-            
-            # Procesar con FixtureMatcher
-            logger.info(f"Enviando a FixtureMatcher: {match_text}")
-            result = matcher.process_match_text(match_text)
-            logger.info(f"Resultado de FixtureMatcher: success={result.get('success', False)}")
-            
-            result['row_index'] = i
-            result['original_data'] = row.to_dict()
-            
-            if result['success']:
-                successful_matches += 1
-                team_ids = result.get('team_ids', {})
-                logger.info(f"Éxito - Local: {team_ids.get('home', {}).get('name')} (ID: {team_ids.get('home', {}).get('id')}), Visitante: {team_ids.get('away', {}).get('name')} (ID: {team_ids.get('away', {}).get('id')})")
-            else:
-                failed_matches += 1
-                logger.error(f"Error en fila {i+1}: {result.get('error', 'Error desconocido')}")
-            
-            results.append(result)
-            
-        except Exception as e:
-            logger.error(f"Excepción en fila {i+1}: {str(e)}")
-            results.append({
-                'row_index': i,
-                'success': False,
-                'error': f'Error procesando fila: {str(e)}',
-                'original_data': row.to_dict()
-            })
-            failed_matches += 1
-        
-        progress_bar.progress((i + 1) / total_rows)
-        
-        # Pausa para respetar límites de API
-        if i < total_rows - 1:  # No pausar en la última iteración
-            logger.info(f"Pausando 0.5s antes de la siguiente llamada API")
-            time.sleep(0.5)
-    
-    status_text.text(f"Completado: {successful_matches} exitosos, {failed_matches} fallidos")
-    logger.info(f"PROCESAMIENTO COMPLETADO - Exitosos: {successful_matches}, Fallidos: {failed_matches}")
-    
-    return {
-        'results': results,
-        'summary': {
-            'total': total_rows,
-            'successful': successful_matches,
-            'failed': failed_matches,
-            'success_rate': (successful_matches / total_rows * 100) if total_rows > 0 else 0
-        }
-    }
+    summary = processing_results['summary']
+    progress.update(summary['total'], summary['total'],
+                    f"Completado: {summary['successful']} exitosos, {summary['failed']} fallidos")
+    if pending_message(summary):
+        progress.message('warning', pending_message(summary))
+    progress.close()
+    return processing_results
 
 def create_excel_with_fixture_ids(df_original: pd.DataFrame, processing_results: Dict) -> bytes:
     """
     Crea archivo Excel con IDs obtenidos de fixtures
+    Los IDs salen de la tabla de resultados unida a df_original por número de fila;
+    las filas se escriben una por una (xlsxwriter, archivo temporal)
     """
-    results = processing_results['results']
-    
-    # Crear DataFrame con resultados
-    enhanced_data = []
-    mapping_data = []
+    return export_results(processing_results, 'fixtures', df_original)
+
+def show_fixture_results(processing_results: Dict, api_key: str):
+    """
+    Métricas, tablas y descargas de los resultados de un trabajo terminado
+    """
+    df = processing_results['original_data']
     
-    for result in results:
-        row_data = result['original_data'].copy()
-        
-        if result['success']:
+    # Mostrar resultados
+    st.header("📈 Resultados del Procesamiento")
+
+    # Métricas
+    summary = processing_results['summary']
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("📊 Total", summary['total'])
+
+    with col2:
+        st.metric("✅ Exitosos", summary['successful'], 
+                f"{summary['success_rate']:.1f}%")
+
+    with col3:
+        st.metric("❌ Fallidos", summary['failed'])
+
+    with col4:
+        st.metric("🎯 Precisión", f"{summary['success_rate']:.1f}%")
+
+    # Mostrar detalles de resultados exitosos
+    successful_results = [r for r in processing_results['results'] if r['success']]
+    if successful_results:
+        st.subheader("✅ Fixtures Encontrados")
+
+        # FixtureMatcher compartido del pool (no uno nuevo por cada rerun) para verificar equipos juveniles
+        temp_matcher = get_worker_pool().resolver('fixtures', api_key)
+
+        success_data = []
+        youth_count = 0
+        main_count = 0
+
+        for result in successful_results[:10]:  # Mostrar solo los primeros 10
             team_ids = result['team_ids']
-            
-            # Agregar IDs a los datos originales
-            row_data['Local_API_ID'] = team_ids['home']['id']
-            row_data['Local_API_Name'] = team_ids['home']['name']
-            row_data['Visitante_API_ID'] = team_ids['away']['id']
-            row_data['Visitante_API_Name'] = team_ids['away']['name']
-            row_data['Match_Status'] = 'FOUND'
-            row_data['Match_Method'] = 'FIXTURE_BASED'
-            
-            # Datos para hoja de mapeo
-            mapping_data.append({
-                'Fila': result['row_index'] + 1,
-                'Local_Original': team_ids['home']['original_name'],
-                'Local_API_Name': team_ids['home']['name'],
-                'Local_API_ID': team_ids['home']['id'],
-                'Visitante_Original': team_ids['away']['original_name'],
-                'Visitante_API_Name': team_ids['away']['name'],
-                'Visitante_API_ID': team_ids['away']['id'],
-                'Fecha_Fixture': result['match_info']['date'],
-                'Status': 'SUCCESS'
+
+            # Verificar si son equipos juveniles
+            is_home_youth = temp_matcher.is_youth_or_reserve_team(team_ids['home']['name'])
+            is_away_youth = temp_matcher.is_youth_or_reserve_team(team_ids['away']['name'])
+
+            if is_home_youth or is_away_youth:
+                youth_count += 1
+                team_type = "🐥 Juvenil"
+            else:
+                main_count += 1
+                team_type = "⭐ Principal"
+
+            success_data.append({
+                'Partido Original': result['original_text'],
+                'Local': f"{team_ids['home']['name']} (ID: {team_ids['home']['id']})",
+                'Visitante': f"{team_ids['away']['name']} (ID: {team_ids['away']['id']})",
+                'Tipo': team_type,
+                'Fecha': result['match_info']['date']
             })
-        else:
-            # Sin coincidencia
-            row_data['Local_API_ID'] = None
-            row_data['Local_API_Name'] = 'NOT_FOUND'
-            row_data['Visitante_API_ID'] = None
-            row_data['Visitante_API_Name'] = 'NOT_FOUND'
-            row_data['Match_Status'] = 'NOT_FOUND'
-            row_data['Match_Method'] = 'FIXTURE_BASED'
-            row_data['Error'] = result.get('error', 'Unknown error')
-            
-            # Datos para hoja de mapeo
-            mapping_data.append({
-                'Fila': result['row_index'] + 1,
-                'Local_Original': result['original_data'].get('Local', 'N/A'),
-                'Local_API_Name': 'NOT_FOUND',
-                'Local_API_ID': None,
-                'Visitante_Original': result['original_data'].get('Visitante', 'N/A'),
-                'Visitante_API_Name': 'NOT_FOUND',
-                'Visitante_API_ID': None,
-                'Fecha_Fixture': 'N/A',
-                'Status': 'FAILED',
-                'Error': result.get('error', '')
+
+        st.dataframe(pd.DataFrame(success_data), use_container_width=True)
+
+        # Mostrar estadísticas de equipos
+        total_successful = len(successful_results)
+        total_youth = sum(1 for r in successful_results 
+                        if temp_matcher.is_youth_or_reserve_team(r['team_ids']['home']['name']) or 
+                           temp_matcher.is_youth_or_reserve_team(r['team_ids']['away']['name']))
+        total_main = total_successful - total_youth
+
+        col_stats1, col_stats2 = st.columns(2)
+        with col_stats1:
+            st.metric("⭐ Equipos Principales", total_main, f"{(total_main/total_successful*100):.1f}%")
+        with col_stats2:
+            st.metric("🐥 Equipos Juveniles", total_youth, f"{(total_youth/total_successful*100):.1f}%")
+
+        if len(successful_results) > 10:
+            st.write(f"... y {len(successful_results) - 10} resultados más")
+
+    # Mostrar errores si los hay
+    failed_results = [r for r in processing_results['results'] if not r['success']]
+    if failed_results:
+        st.subheader("❌ Partidos No Encontrados")
+
+        error_data = []
+        for result in failed_results[:10]:
+            error_data.append({
+                'Partido Original': result.get('original_text', 'N/A'),
+                'Error': result.get('error', 'Unknown error')
             })
-        
-        enhanced_data.append(row_data)
-    
-    # Crear DataFrames
-    enhanced_df = pd.DataFrame(enhanced_data)
-    mapping_df = pd.DataFrame(mapping_data)
-    
-    # Crear archivo Excel
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        enhanced_df.to_excel(writer, sheet_name='Datos_con_IDs', index=False)
-        mapping_df.to_excel(writer, sheet_name='Mapeo_Fixtures', index=False)
-        
-        # Hoja de resumen
-        summary_data = {
-            'Métrica': ['Total de partidos', 'Fixtures encontrados', 'Fixtures no encontrados', 'Tasa de éxito'],
-            'Valor': [
-                processing_results['summary']['total'],
-                processing_results['summary']['successful'],
-                processing_results['summary']['failed'],
-                f"{processing_results['summary']['success_rate']:.1f}%"
-            ]
-        }
-        summary_df = pd.DataFrame(summary_data)
-        summary_df.to_excel(writer, sheet_name='Resumen', index=False)
+
+        st.dataframe(pd.DataFrame(error_data), use_container_width=True)
+
+    # Crear y descargar archivo Excel
+    st.header("💾 Descargar Resultados")
+
+    try:
+        # Excel es el formato sugerido para archivos chicos; en lotes grandes, Parquet/CSV
+        formats = available_formats()
+        fmt = st.selectbox(
+            "📦 Formato de descarga", formats, index=formats.index(default_format(len(df))),
+            format_func=lambda name: EXPORTERS[name].label,
+            help="Parquet y Arrow conservan los IDs como enteros y se leen mucho más rápido que Excel"
+        )
+        exporter = EXPORTERS[fmt]
+        export_data = export_results(processing_results, 'fixtures', df, fmt)
+
+        st.download_button(
+            label=f"📥 Descargar resultados ({exporter.label})",
+            data=export_data,
+            file_name=f"equipos_fixture_based.{exporter.extension}",
+            mime=exporter.mime
+        )
+
+        # Descargar resultados JSON
+        st.download_button(
+            label="📥 Descargar Resultados JSON",
+            data=results_json(processing_results),
+            file_name="resultados_fixture_based.json",
+            mime="application/json"
+        )
+
+        st.markdown("""
+        <div class="success-box">
+        <h4>🎉 ¡Procesamiento Completado con Matching Mejorado!</h4>
+        <p>El archivo Excel incluye tres hojas:</p>
+        <ul>
+            <li><strong>Datos_con_IDs:</strong> Datos originales + IDs de API Football</li>
+            <li><strong>Mapeo_Fixtures:</strong> Mapeo detallado de cada fixture</li>
+            <li><strong>Resumen:</strong> Estadísticas del procesamiento</li>
+        </ul>
+        <p><strong>✨ Mejoras en esta versión:</strong></p>
+        <ul>
+            <li>⭐ Prioriza equipos principales sobre juveniles (U23, reservas)</li>
+            <li>🎯 Scoring inteligente para mejor precisión</li>
+            <li>🔍 Identificación automática de equipos juveniles</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+
+    except Exception as e:
+        logger.error(f"Error creando archivo Excel: {str(e)}")
+        st.error(f"❌ Error creando archivo Excel: {str(e)}")
+
+def show_job(job_id: str, api_key: str):
+    """
+    Estado de un trabajo en segundo plano; mientras corre se vuelve a consultar cada
+    JOB_POLL_SECONDS y al terminar muestra sus resultados
+    """
+    pool = get_worker_pool()
+    status = pool.queue.status(job_id)
+    # Un trabajo de la otra app tiene otra forma de resultados
+    if status is None or status['method'] != 'fixtures':
+        st.error(f"❌ No existe el trabajo {job_id}")
+        return
+    pool.resume(job_id, api_key)
     
-    return output.getvalue()
+    st.header(f"🧾 Trabajo {job_id}")
+    if status['status'] in ('queued', 'running'):
+        st.info(job_status_message(status))
+        st.progress(status['processed'] / status['total'] if status['total'] else 0.0)
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
+    else:
+        if status['status'] == 'failed':
+            st.error(f"❌ Error durante el procesamiento: {status['error']} "
+                     f"(se muestran los resultados de los lotes terminados)")
+        elif pending_message(status):
+            st.warning(pending_message(status))
+        show_fixture_results(pool.queue.results(job_id), api_key)
 
 def main():
     # Título principal
@@ -337,194 +372,18 @@ def main():
                 for i, text in enumerate(match_texts):
                     st.write(f"{i+1}. {text}")
             
-            # Inicializar estado de sesión
-            if 'show_confirmation' not in st.session_state:
-                st.session_state.show_confirmation = False
-            if 'processing_confirmed' not in st.session_state:
-                st.session_state.processing_confirmed = False
+            # Advertencia sobre tiempo y costos
+            st.warning(f"⚠️ **Advertencia**: Se realizarán hasta {len(df)} llamadas a la API. "
+                      f"Esto puede tomar varios minutos y consumir créditos de API.")
             
-            # Botón para procesar
+            # El procesamiento corre en segundo plano (job_queue.py): la página solo consulta el estado
             if st.button("🚀 Procesar con API Football", type="primary"):
-                logger.info("=== INICIANDO PROCESAMIENTO ===")
+                logger.info("=== ENCOLANDO PROCESAMIENTO ===")
                 logger.info(f"Total de filas a procesar: {len(df)}")
-                logger.info(f"API Key configurada: {api_key is not None}")
-                st.session_state.show_confirmation = True
-                logger.info("Mostrando pantalla de confirmación")
-            
-            # Mostrar confirmación si el botón fue presionado
-            if st.session_state.show_confirmation:
-                st.info(f"📊 **Iniciando procesamiento fixture-based**\n- Total de filas: **{len(df)}**\n- API Key configurada: ✅")
-                
-                # Advertencia sobre tiempo y costos
-                st.warning(f"⚠️ **Advertencia**: Se realizarán hasta {len(df)} llamadas a la API. "
-                          f"Esto puede tomar varios minutos y consumir créditos de API.")
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    if st.button("✅ Confirmar procesamiento", type="primary"):
-                        st.session_state.processing_confirmed = True
-                        logger.info("Usuario confirmó procesamiento")
-                        st.rerun()
-                
-                with col2:
-                    if st.button("❌ Cancelar"):
-                        st.session_state.show_confirmation = False
-                        st.session_state.processing_confirmed = False
-                        logger.info("Usuario canceló procesamiento")
-                        st.rerun()
-            
-            # Ejecutar procesamiento si fue confirmado
-            if st.session_state.get('processing_confirmed', False):
-                try:
-                    logger.info("INICIANDO PROCESAMIENTO CONFIRMADO")
-                    with st.spinner("Procesando fixtures con API Football..."):
-                        # Procesar con FixtureMatcher
-                        processing_results = process_csv_with_fixtures(df, api_key)
-                        
-                        # Resetear estados después del procesamiento
-                        st.session_state.show_confirmation = False
-                        st.session_state.processing_confirmed = False
-                        
-                        # Mostrar resultados
-                        st.header("📈 Resultados del Procesamiento")
-                        
-                        # Métricas
-                        summary = processing_results['summary']
-                        col1, col2, col3, col4 = st.columns(4)
-                        
-                        with col1:
-                            st.metric("📊 Total", summary['total'])
-                        
-                        with col2:
-                            st.metric("✅ Exitosos", summary['successful'], 
-                                    f"{summary['success_rate']:.1f}%")
-                        
-                        with col3:
-                            st.metric("❌ Fallidos", summary['failed'])
-                        
-                        with col4:
-                            st.metric("🎯 Precisión", f"{summary['success_rate']:.1f}%")
-                        
-                        # Mostrar detalles de resultados exitosos
-                        successful_results = [r for r in processing_results['results'] if r['success']]
-                        if successful_results:
-                            st.subheader("✅ Fixtures Encontrados")
-                            
-                            # Crear FixtureMatcher para verificar equipos juveniles
-                            temp_matcher = FixtureMatcher(api_key)
-                            
-                            success_data = []
-                            youth_count = 0
-                            main_count = 0
-                            
-                            for result in successful_results[:10]:  # Mostrar solo los primeros 10
-                                team_ids = result['team_ids']
-                                
-                                # Verificar si son equipos juveniles
-                                is_home_youth = temp_matcher.is_youth_or_reserve_team(team_ids['home']['name'])
-                                is_away_youth = temp_matcher.is_youth_or_reserve_team(team_ids['away']['name'])
-                                
-                                if is_home_youth or is_away_youth:
-                                    youth_count += 1
-                                    team_type = "🐥 Juvenil"
-                                else:
-                                    main_count += 1
-                                    team_type = "⭐ Principal"
-                                
-                                success_data.append({
-                                    'Partido Original': result['original_text'],
-                                    'Local': f"{team_ids['home']['name']} (ID: {team_ids['home']['id']})",
-                                    'Visitante': f"{team_ids['away']['name']} (ID: {team_ids['away']['id']})",
-                                    'Tipo': team_type,
-                                    'Fecha': result['match_info']['date']
-                                })
-                            
-                            st.dataframe(pd.DataFrame(success_data), use_container_width=True)
-                            
-                            # Mostrar estadísticas de equipos
-                            total_successful = len(successful_results)
-                            total_youth = sum(1 for r in successful_results 
-                                            if temp_matcher.is_youth_or_reserve_team(r['team_ids']['home']['name']) or 
-                                               temp_matcher.is_youth_or_reserve_team(r['team_ids']['away']['name']))
-                            total_main = total_successful - total_youth
-                            
-                            col_stats1, col_stats2 = st.columns(2)
-                            with col_stats1:
-                                st.metric("⭐ Equipos Principales", total_main, f"{(total_main/total_successful*100):.1f}%")
-                            with col_stats2:
-                                st.metric("🐥 Equipos Juveniles", total_youth, f"{(total_youth/total_successful*100):.1f}%")
-                            
-                            if len(successful_results) > 10:
-                                st.write(f"... y {len(successful_results) - 10} resultados más")
-                        
-                        # Mostrar errores si los hay
-                        failed_results = [r for r in processing_results['results'] if not r['success']]
-                        if failed_results:
-                            st.subheader("❌ Partidos No Encontrados")
-                            
-                            error_data = []
-                            for result in failed_results[:10]:
-                                error_data.append({
-                                    'Partido Original': result.get('original_text', 'N/A'),
-                                    'Error': result.get('error', 'Unknown error')
-                                })
-                            
-                            st.dataframe(pd.DataFrame(error_data), use_container_width=True)
-                        
-                        # Crear y descargar archivo Excel
-                        st.header("💾 Descargar Resultados")
-                        
-                        try:
-                            excel_data = create_excel_with_fixture_ids(df, processing_results)
-                            
-                            st.download_button(
-                                label="📥 Descargar Excel con IDs de Fixtures",
-                                data=excel_data,
-                                file_name="equipos_fixture_based.xlsx",
-                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                            )
-                            
-                            # Descargar resultados JSON
-                            results_json = json.dumps(processing_results, indent=2, ensure_ascii=False, default=str)
-                            st.download_button(
-                                label="📥 Descargar Resultados JSON",
-                                data=results_json,
-                                file_name="resultados_fixture_based.json",
-                                mime="application/json"
-                            )
-                            
-                            st.markdown("""
-                            <div class="success-box">
-                            <h4>🎉 ¡Procesamiento Completado con Matching Mejorado!</h4>
-                            <p>El archivo Excel incluye tres hojas:</p>
-                            <ul>
-                                <li><strong>Datos_con_IDs:</strong> Datos originales + IDs de API Football</li>
-                                <li><strong>Mapeo_Fixtures:</strong> Mapeo detallado de cada fixture</li>
-                                <li><strong>Resumen:</strong> Estadísticas del procesamiento</li>
-                            </ul>
-                            <p><strong>✨ Mejoras en esta versión:</strong></p>
-                            <ul>
-                                <li>⭐ Prioriza equipos principales sobre juveniles (U23, reservas)</li>
-                                <li>🎯 Scoring inteligente para mejor precisión</li>
-                                <li>🔍 Identificación automática de equipos juveniles</li>
-                            </ul>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            
-                        except Exception as e:
-                            logger.error(f"Error creando archivo Excel: {str(e)}")
-                            st.error(f"❌ Error creando archivo Excel: {str(e)}")
-                
-                except Exception as e:
-                    logger.error(f"Error durante el procesamiento: {str(e)}")
-                    st.error(f"❌ Error durante el procesamiento: {str(e)}")
-                    with st.expander("🔍 Detalles del error"):
-                        st.code(str(e))
-                    # Resetear estados en caso de error
-                    st.session_state.show_confirmation = False
-                    st.session_state.processing_confirmed = False
-        
+                st.session_state.job_id = get_worker_pool().submit(df, 'fixtures', api_key)
+                logger.info(f"Trabajo encolado: {st.session_state.job_id}")
+                st.rerun()
+
         except Exception as e:
             st.error(f"❌ Error procesando el archivo: {str(e)}")
     
@@ -559,6 +418,15 @@ def main():
         - Hora opcional
         - Nombres de equipos separados por "vs"
         """)
+    
+    # Trabajo en segundo plano: el enviado desde esta sesión o uno consultado por su ID
+    shared_job_id = st.sidebar.text_input(
+        "🔎 Consultar trabajo por ID",
+        help="Cualquier sesión puede seguir un trabajo y descargar sus resultados con su ID"
+    ).strip()
+    job_id = shared_job_id or st.session_state.get('job_id')
+    if job_id:
+        show_job(job_id, api_key)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
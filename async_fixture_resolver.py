@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Variante asyncio de AdvancedFixtureResolver
+- Misma normalización, índice por fecha y scoring que el resolver síncrono
+- Todas las solicitudes pasan por el cliente con pool de conexiones, un semáforo
+  compartido por el resolver y el rate limiter compartido por API key
+- La verificación H2H de un empate usa la caché H2H y consulta a la vez a los
+  candidatos que no están cubiertos; cancela el resto en cuanto uno se confirma
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+
+from advanced_fixture_resolver import AdvancedFixtureResolver, PreparedFixtureDay, TIMEZONE
+from api_client import FetchError, QuotaExceededError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFixtureResolver(AdvancedFixtureResolver):
+    """
+    Resolver de fixtures con E/S concurrente en asyncio
+    Las solicitudes HTTP se ejecutan en hilos sobre la sesión compartida del cliente
+    (requests no es asíncrono); el semáforo limita cuántas hay en curso a la vez.
+    """
+
+    def __init__(self, api_key: str, max_concurrency: int = None):
+        super().__init__(api_key)
+        self.max_concurrency = max_concurrency or self.client.max_concurrency
+        self._semaphore = None
+        self._loop = None
+        self._inflight = {}  # Fecha -> tarea de descarga en curso
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Semáforo compartido por todas las solicitudes del resolver en el loop actual"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+            self._inflight = {}
+        return self._semaphore
+
+    async def _get(self, endpoint: str, params: dict):
+        """GET por el cliente compartido; una tarea cancelada en espera no llega a la API"""
+        async with self._get_semaphore():
+            return await asyncio.to_thread(self.client.get, endpoint, params)
+
+    async def fixtures_by_date(self, date_cdmx: datetime) -> PreparedFixtureDay:
+        """Versión asíncrona de _fixtures_by_date; fechas pedidas a la vez se descargan una vez"""
+        date_str = date_cdmx.strftime("%Y-%m-%d")
+        self._get_semaphore()
+
+        if date_str not in self.cache:
+            task = self._inflight.get(date_str)
+            if task is None:
+                task = asyncio.ensure_future(self._fetch_date(date_str))
+                self._inflight[date_str] = task
+            try:
+                await asyncio.shield(task)
+            except QuotaExceededError:
+                raise
+            except Exception as e:
+                logger.error(f"Error obteniendo fixtures: {e}")
+                raise FetchError(f"No se pudieron obtener los fixtures de {date_str}: {e}") from e
+            finally:
+                if task.done():
+                    self._inflight.pop(date_str, None)
+
+        return self._prepared_day(date_str, self.cache[date_str])
+
+    async def _fetch_date(self, date_str: str) -> list:
+        logger.info(f"Obteniendo fixtures para fecha {date_str}")
+        r = await self._get("/fixtures", {"date": date_str, "timezone": TIMEZONE})
+        return self._store_fixtures(date_str, r)
+
+    async def prefetch_dates_async(self, dates) -> int:
+        """
+        Descarga a la vez los fixtures de las fechas que aún no están en cache
+        Una fecha que falla (FetchError) no se guarda y se vuelve a pedir al resolverla
+        """
+        pending = sorted({d.strftime("%Y-%m-%d") for d in dates if d is not None} - set(self.cache))
+        if pending:
+            logger.info(f"Descargando fixtures de {len(pending)} fechas en paralelo")
+            outcomes = await asyncio.gather(*(self.fixtures_by_date(datetime.strptime(d, "%Y-%m-%d"))
+                                              for d in pending), return_exceptions=True)
+            for outcome in outcomes:
+                if isinstance(outcome, BaseException) and not isinstance(outcome, FetchError):
+                    raise outcome
+        return len(pending)
+
+    async def resolve_fixture_ids_async(self, fecha_hora_cdmx: datetime, local_es: str, visita_es: str,
+                                        window_minutes: int = 90, use_h2h_verification: bool = False,
+                                        try_previous_year: bool = True) -> dict:
+        """Mismo resultado que resolve_fixture_ids"""
+        logger.info(f"Resolviendo: {local_es} vs {visita_es} en {fecha_hora_cdmx}")
+
+        local_norm = self._norm_name(local_es)
+        visita_norm = self._norm_name(visita_es)
+
+        fixtures = await self.fixtures_by_date(fecha_hora_cdmx)
+
+        # Si no hay fixtures, intentar con el año anterior
+        # (el 29 de febrero no tiene equivalente: se omite)
+        fecha_anterior = self._previous_year(fecha_hora_cdmx) if not fixtures and try_previous_year else None
+        if fecha_anterior is not None:
+            fixtures = await self.fixtures_by_date(fecha_anterior)
+            if fixtures:
+                fecha_hora_cdmx = fecha_anterior
+
+        if not fixtures:
+            return {"status": "not_found", "reason": "no_fixtures_for_date"}
+
+        candidates = self._score_candidates(fixtures, fecha_hora_cdmx, local_norm, visita_norm, window_minutes)
+        if not candidates:
+            return {"status": "not_found", "reason": "no_candidates_in_window"}
+
+        best = candidates[0]
+        if use_h2h_verification:
+            tie = self._tied_candidates(candidates)
+            if tie:
+                logger.info("Empate detectado, usando verificación H2H")
+                best = await self._break_tie_with_h2h_async(tie, fecha_hora_cdmx)
+
+        return self._resolution(best, local_norm, visita_norm)
+
+    async def _h2h_check(self, candidate: dict, pos: int, date_str: str, confirmed_positions: set) -> bool:
+        """
+        H2H de un candidato; se omite si otro anterior ya quedó confirmado
+        La caché H2H (SQLite) se consulta y actualiza en un hilo, fuera del event loop
+        """
+        try:
+            confirmed = await asyncio.to_thread(self._h2h_cached, candidate, date_str)
+            if confirmed is None:
+                async with self._get_semaphore():
+                    if any(other < pos for other in confirmed_positions):
+                        return False
+                    confirmed = await asyncio.to_thread(self._h2h_fetch, candidate, date_str)
+                    # Se registra antes de liberar el cupo para que el siguiente en espera lo vea
+                    if confirmed:
+                        confirmed_positions.add(pos)
+            elif confirmed:
+                confirmed_positions.add(pos)
+            return confirmed
+        except QuotaExceededError:
+            raise
+        except Exception as e:
+            logger.error(f"Error en H2H verification: {e}")
+            return False
+
+    def _h2h_fetch(self, candidate: dict, date_str: str) -> bool:
+        """Consulta /fixtures/headtohead y guarda la respuesta en la caché H2H (bloqueante)"""
+        params = self._h2h_request_params(candidate, date_str)
+        return self._h2h_record(candidate, date_str, self.client.get("/fixtures/headtohead", params))
+
+    async def _break_tie_with_h2h_async(self, candidates, fecha_hora_cdmx: datetime):
+        """
+        Consulta el H2H de todos los candidatos a la vez. Gana el primer candidato
+        confirmado en orden de score (igual que la versión síncrona): al confirmarse
+        uno se cancelan los que van detrás y solo se espera a los que van delante
+        """
+        date_str = fecha_hora_cdmx.strftime("%Y-%m-%d")
+        confirmed_positions = set()
+        tasks = {asyncio.ensure_future(self._h2h_check(c, pos, date_str, confirmed_positions)): pos
+                 for pos, c in enumerate(candidates)}
+        confirmed = {}
+        pending = set(tasks)
+        winner = None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    confirmed[tasks[task]] = task.result()
+
+                first = min((pos for pos, ok in confirmed.items() if ok), default=None)
+                if first is None:
+                    continue
+                for task in [t for t in pending if tasks[t] > first]:
+                    task.cancel()
+                    pending.discard(task)
+                if all(pos in confirmed for pos in range(first)):
+                    winner = candidates[first]
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if winner is not None:
+            fx = winner["fixture"]
+            logger.info(f"H2H verification exitosa para {fx['teams']['home']['name']} vs {fx['teams']['away']['name']}")
+            return winner
+
+        # Si no hubo coincidencia exacta por fecha, quedarse con el mejor score
+        return candidates[0]
+
+    async def process_parsed_match_async(self, parse_result: dict, match_text: str) -> dict:
+        """Versión asíncrona de process_parsed_match"""
+        if not parse_result["success"]:
+            return {
+                "success": False,
+                "error": parse_result["error"],
+                "original_text": match_text
+            }
+
+        resolve_result = await self.resolve_fixture_ids_async(
+            parse_result["fecha_hora_cdmx"],
+            parse_result["local_es"],
+            parse_result["visita_es"]
+        )
+        return self._match_result(parse_result, match_text, resolve_result)
+
+    async def process_match_text_async(self, match_text: str) -> dict:
+        return await self.process_parsed_match_async(self.parse_match_text(match_text), match_text)
+
+    async def process_match_texts_async(self, match_texts) -> list:
+        """
+        Resuelve todas las filas a la vez; cada fecha se descarga una sola vez.
+        Retorna los resultados en el orden de entrada (la excepción de una fila
+        ocupa su lugar en lugar del resultado)
+        """
+        return await asyncio.gather(*(self.process_match_text_async(t) for t in match_texts),
+                                    return_exceptions=True)
+
+    def resolve_many(self, match_texts) -> list:
+        """Punto de entrada síncrono: process_match_texts_async en un loop nuevo"""
+        return asyncio.run(self.process_match_texts_async(list(match_texts)))
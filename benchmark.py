@@ -0,0 +1,438 @@
+"""
+Benchmarks de los matchers, resolvers y exportadores con datos sintéticos
+
+    python -m benchmark -o benchmark.json
+    python -m benchmark --quick -o nuevo.json --compare benchmark.json --max-regression 1.5
+
+Genera catálogos de equipos (1k–100k) y días de /fixtures (100–3000 partidos) con
+una semilla fija y mide:
+- TeamAssociationSystem.find_best_match contra cada catálogo (más la construcción del índice)
+- AdvancedFixtureResolver.resolve_fixture_ids y FixtureMatcher.find_matching_fixture
+  contra cada día, servido por fake_api_football (primera llamada con HTTP y llamadas
+  siguientes desde la cache en memoria)
+- crear_excel_con_ids y export_results en cada formato disponible
+
+El resultado es un JSON con el commit, el entorno y los tiempos de cada caso
+(mínimo, mediana y media de 'repeat' repeticiones, y mediana por llamada), para
+comparar contra la ejecución de otro commit con --compare.
+Los almacenes (alias, H2H) se crean en un directorio temporal: no se usa ni se
+modifica ninguna base de datos local y no se llama a la API real
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+from dateutil import tz
+
+from advanced_fixture_resolver import LEAGUE_ALLOWLIST
+from alias_store import AliasStore
+from api_client import ApiFootballClient, RateLimiter
+from fake_api_football import TIMEZONE, FakeApiFootball, make_fixture
+from h2h_cache import H2HCache
+
+logger = logging.getLogger(__name__)
+
+# Tamaños por defecto y reducidos (--quick)
+DEFAULT_TEAMS = (1000, 10000, 100000)
+DEFAULT_FIXTURES = (100, 1000, 3000)
+DEFAULT_ROWS = (1000, 10000)
+QUICK_TEAMS = (1000,)
+QUICK_FIXTURES = (100,)
+QUICK_ROWS = (1000,)
+
+# Consultas por caso y repeticiones de cada medición
+DEFAULT_QUERIES = 200
+DEFAULT_REPEAT = 3
+
+# Fecha de los días sintéticos (hora de CDMX)
+BENCHMARK_DAY = datetime(2024, 3, 16, tzinfo=tz.gettz(TIMEZONE))
+
+_SYLLABLES = [
+    'bar', 'ce', 'lo', 'na', 'mon', 'te', 'rrey', 'gua', 'da', 'la', 'ja', 'ra', 'san', 'to', 'ri',
+    'ver', 'po', 'ol', 'man', 'ches', 'ter', 'li', 'on', 'mi', 'pa', 'chu', 'ca', 'que', 'ré', 'ta',
+    'ro', 'sé', 'ñor', 'vi', 'lle', 'al', 'me', 'ría', 'bo', 'tí', 'gra', 'nas', 'cor', 'du', 'ba',
+]
+_PREFIXES = ['Club', 'Deportivo', 'Atlético', 'Real', 'FC', 'Sporting', 'Unión', 'Racing', 'Inter']
+_SUFFIXES = ['United', 'City', 'FC', 'SC', 'Rovers', 'Wanderers', 'U23', 'II', 'Reserves']
+_COUNTRIES = ['Mexico', 'Spain', 'England', 'Argentina', 'Brazil', 'Italy', 'Germany', 'France',
+              'USA', 'Colombia', 'Chile', 'Portugal', 'Netherlands', 'Uruguay', 'Peru']
+
+
+def _city(rng: random.Random) -> str:
+    return ''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+
+def _team_name(rng: random.Random) -> str:
+    pattern = rng.random()
+    if pattern < 0.35:
+        return f"{rng.choice(_PREFIXES)} {_city(rng)}"
+    if pattern < 0.7:
+        return f"{_city(rng)} {rng.choice(_SUFFIXES)}"
+    if pattern < 0.85:
+        return f"{_city(rng)} {_city(rng)}"
+    return _city(rng)
+
+
+def synthetic_catalog(size: int, seed: int = 0) -> List[Dict]:
+    """Catálogo de 'size' equipos con la forma de /teams de API Football y nombres únicos"""
+    rng = random.Random(seed)
+    names = set()
+    teams = []
+    while len(teams) < size:
+        name = _team_name(rng)
+        if name in names:
+            continue
+        names.add(name)
+        team_id = 1000 + len(teams)
+        teams.append({
+            'id': team_id, 'name': name, 'code': name[:3].upper(), 'country': rng.choice(_COUNTRIES),
+            'founded': rng.randint(1880, 2010), 'national': False,
+            'logo': f"https://media.api-sports.io/football/teams/{team_id}.png",
+        })
+    return teams
+
+
+def synthetic_fixture_day(size: int, seed: int = 0, day: datetime = BENCHMARK_DAY) -> List[Dict]:
+    """
+    'size' fixtures de un mismo día (10:00 a 23:45, hora de CDMX) entre equipos distintos
+    ~80% en ligas de LEAGUE_ALLOWLIST y el resto en ligas que el resolver avanzado descarta
+    """
+    rng = random.Random(seed)
+    teams = synthetic_catalog(2 * size, seed)
+    rng.shuffle(teams)
+    leagues = sorted(LEAGUE_ALLOWLIST)
+    fixtures = []
+    for n in range(size):
+        home, away = teams[2 * n], teams[2 * n + 1]
+        kickoff = day.replace(hour=10) + timedelta(minutes=15 * rng.randint(0, 55))
+        league_id = rng.choice(leagues) if rng.random() < 0.8 else 1000 + rng.randint(0, 49)
+        fixtures.append(make_fixture(500000 + n, kickoff, (home['id'], home['name']), (away['id'], away['name']),
+                                     league_id, f"Liga {league_id}"))
+    return fixtures
+
+
+def _variant(name: str, rng: random.Random) -> str:
+    """Nombre como aparece en un archivo: igual, en minúsculas, sin prefijo/sufijo o (10%) con una errata"""
+    kind = rng.random()
+    if kind < 0.4:
+        return name
+    if kind < 0.7:
+        return name.lower()
+    words = name.split()
+    if kind < 0.9:
+        return max(words, key=len)
+    if len(name) > 4:
+        pos = rng.randint(1, len(name) - 3)
+        return name[:pos] + name[pos + 1] + name[pos] + name[pos + 2:]
+    return name
+
+
+def _measure(run: Callable[[], int], repeat: int, calls: int, counter: str = 'hits') -> Dict:
+    """
+    Tiempos de 'repeat' ejecuciones de run(); lo que run() retorna (consultas acertadas
+    o bytes escritos) se guarda como 'counter' para verificar que el caso hizo su trabajo
+    """
+    times = []
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = run()
+        times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+    return {
+        'calls': calls,
+        counter: count,
+        'seconds': {'min': min(times), 'median': median, 'mean': statistics.mean(times)},
+        'per_call_ms': median / calls * 1000 if calls else None,
+    }
+
+
+def _case(name: str, params: Dict, measurement: Dict) -> Dict:
+    key = f"{name}[{','.join(f'{k}={v}' for k, v in params.items())}]"
+    logger.info(f"{key}: mediana {measurement['seconds']['median']:.3f}s")
+    return dict({'name': name, 'key': key, 'params': params}, **measurement)
+
+
+def bench_find_best_match(sizes: Sequence[int], queries: int, repeat: int, seed: int, store_dir: str) -> List[Dict]:
+    from app import TeamAssociationSystem
+
+    cases = []
+    for size in sizes:
+        api_teams = synthetic_catalog(size, seed)
+        rng = random.Random(seed)
+        expected = {_variant(team['name'], rng): team['id'] for team in rng.sample(api_teams, min(queries, size))}
+        names = list(expected)
+        system = TeamAssociationSystem(alias_store=AliasStore(os.path.join(store_dir, f"aliases-{size}.db"), 'teams'))
+
+        def build():
+            system._catalog = None
+            system.find_best_match(names[0], api_teams)
+            return 1
+
+        def match():
+            found = (system.find_best_match(name, api_teams) for name in names)
+            return sum(match is not None and match['api_team']['id'] == expected[name]
+                       for match, name in zip(found, names))
+
+        cases.append(_case('team_catalog_build', {'teams': size}, _measure(build, repeat, 1)))
+        cases.append(_case('find_best_match', {'teams': size}, _measure(match, repeat, len(names))))
+    return cases
+
+
+def _fixture_queries(fixtures: List[Dict], queries: int, seed: int) -> List[Dict]:
+    rng = random.Random(seed)
+    cdmx = tz.gettz(TIMEZONE)
+    sample = []
+    for fx in rng.sample(fixtures, min(queries, len(fixtures))):
+        sample.append({
+            'kickoff': datetime.fromisoformat(fx['fixture']['date']).astimezone(cdmx),
+            'home': _variant(fx['teams']['home']['name'], rng),
+            'away': _variant(fx['teams']['away']['name'], rng),
+            'fixture_id': fx['fixture']['id'],
+        })
+    return sample
+
+
+def _client(headers: Dict, base_url: str) -> ApiFootballClient:
+    """Cliente contra el servidor local: sin caché HTTP en disco y sin límite efectivo"""
+    return ApiFootballClient(headers, base_url=base_url, rate_limiter=RateLimiter(requests_per_minute=600000))
+
+
+def bench_fixture_resolvers(sizes: Sequence[int], queries: int, repeat: int, seed: int,
+                            store_dir: str) -> List[Dict]:
+    from advanced_fixture_resolver import AdvancedFixtureResolver
+    from fixture_matcher_improved import FixtureMatcher
+
+    cases = []
+    for size in sizes:
+        fixtures = synthetic_fixture_day(size, seed)
+        sample = _fixture_queries(fixtures, queries, seed)
+        with FakeApiFootball(fixtures) as api:
+            def advanced():
+                resolver = AdvancedFixtureResolver("benchmark-key")
+                resolver.client = _client(resolver.headers, api.base_url)
+                resolver.aliases = AliasStore(os.path.join(store_dir, f"fixture-aliases-{size}.db"), 'fixtures')
+                resolver.h2h_cache = H2HCache(os.path.join(store_dir, f"h2h-{size}.db"))
+                return resolver
+
+            def matcher():
+                resolver = FixtureMatcher("benchmark-key")
+                resolver.client = _client(resolver.headers, api.base_url)
+                return resolver
+
+            resolver = advanced()
+
+            def resolve_cold():
+                resolver.cache.clear()
+                resolver._prepared.clear()
+                query = sample[0]
+                resolver.resolve_fixture_ids(query['kickoff'], query['home'], query['away'], try_previous_year=False)
+                return 1
+
+            def resolve():
+                return sum(
+                    resolver.resolve_fixture_ids(q['kickoff'], q['home'], q['away'],
+                                                 try_previous_year=False).get('fixture_id') == q['fixture_id']
+                    for q in sample
+                )
+
+            cases.append(_case('resolve_fixture_ids_first_call', {'fixtures': size},
+                               _measure(resolve_cold, repeat, 1)))
+            cases.append(_case('resolve_fixture_ids', {'fixtures': size}, _measure(resolve, repeat, len(sample))))
+
+            fixture_matcher = matcher()
+            match_infos = [{'date': q['kickoff'].strftime("%Y-%m-%d"), 'time': q['kickoff'].strftime("%H:%M"),
+                            'team1': q['home'], 'team2': q['away'], 'original_text': ''} for q in sample]
+
+            def find_cold():
+                fixture_matcher.cache.clear()
+                fixture_matcher.find_matching_fixture(match_infos[0])
+                return 1
+
+            def find():
+                found = (fixture_matcher.find_matching_fixture(info) for info in match_infos)
+                return sum((fx or {}).get('fixture', {}).get('id') == q['fixture_id'] for fx, q in zip(found, sample))
+
+            cases.append(_case('find_matching_fixture_first_call', {'fixtures': size},
+                               _measure(find_cold, repeat, 1)))
+            cases.append(_case('find_matching_fixture', {'fixtures': size}, _measure(find, repeat, len(sample))))
+    return cases
+
+
+def synthetic_results(rows: int, seed: int = 0):
+    """(DataFrame de entrada, processing_results del resolver avanzado) con ~80% de aciertos"""
+    rng = random.Random(seed)
+    teams = synthetic_catalog(max(20, rows // 10), seed)
+    records, results = [], []
+    for i in range(rows):
+        home, away = rng.sample(teams, 2)
+        records.append({'Fecha': '03/16/2024 20:00', 'Local': home['name'], 'Visitante': away['name'],
+                        'Match text': f"Fecha: 16/3 20:00, Partido: {home['name']} vs {away['name']}"})
+        if rng.random() < 0.2:
+            results.append({'row_index': i, 'success': False, 'error': 'Sin fixture'})
+            continue
+        results.append({
+            'row_index': i, 'success': True,
+            'team_ids': {
+                'home': {'id': home['id'], 'name': home['name'], 'original_name': home['name']},
+                'away': {'id': away['id'], 'name': away['name'], 'original_name': away['name']},
+            },
+            'fixture': {'id': 500000 + i, 'league_id': 262, 'league_name': 'Liga MX', 'season': 2024},
+            'match_info': {'date': '2024-03-16T20:00:00-06:00'},
+            'debug_info': {'score': rng.random(), 's_home': rng.random(), 's_away': rng.random()},
+        })
+    successful = sum(r['success'] for r in results)
+    summary = {'total': rows, 'successful': successful, 'failed': rows - successful, 'pending': 0,
+               'paused': False, 'success_rate': successful / rows * 100 if rows else 0}
+    return pd.DataFrame(records), {'results': results, 'summary': summary}
+
+
+def bench_exporters(sizes: Sequence[int], repeat: int, seed: int) -> List[Dict]:
+    from app import crear_excel_con_ids
+    from resolver_pipeline import export_results
+    from result_exporters import available_formats
+
+    cases = []
+    for rows in sizes:
+        df, processing_results = synthetic_results(rows, seed)
+        team_results = {}
+        for result in processing_results['results']:
+            for side in ('home', 'away') if result['success'] else ():
+                team = result['team_ids'][side]
+                team_results[team['original_name']] = {
+                    'api_team': {'id': team['id'], 'name': team['name'], 'country': 'Mexico'},
+                    'confidence': 0.9, 'method': 'exact_match',
+                }
+
+        cases.append(_case('crear_excel_con_ids', {'rows': rows},
+                           _measure(lambda: len(crear_excel_con_ids(df, team_results)), repeat, rows, 'bytes')))
+        for fmt in available_formats():
+            measurement = _measure(lambda: len(export_results(processing_results, 'advanced', df, fmt)), repeat, rows,
+                                   'bytes')
+            cases.append(_case('export_results', {'format': fmt, 'rows': rows}, measurement))
+    return cases
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(teams: Sequence[int] = DEFAULT_TEAMS, fixtures: Sequence[int] = DEFAULT_FIXTURES,
+                   rows: Sequence[int] = DEFAULT_ROWS, queries: int = DEFAULT_QUERIES,
+                   repeat: int = DEFAULT_REPEAT, seed: int = 0, only: Optional[Sequence[str]] = None) -> Dict:
+    """
+    Corre los grupos de benchmarks ('matching', 'fixtures', 'export'; only=None = todos)
+    Retorna {'meta': {...}, 'results': [caso, ...]}
+    """
+    groups = set(only or ('matching', 'fixtures', 'export'))
+    results = []
+    with tempfile.TemporaryDirectory() as store_dir:
+        if 'matching' in groups:
+            results += bench_find_best_match(teams, queries, repeat, seed, store_dir)
+        if 'fixtures' in groups:
+            results += bench_fixture_resolvers(fixtures, queries, repeat, seed, store_dir)
+        if 'export' in groups:
+            results += bench_exporters(rows, repeat, seed)
+
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+            'queries': queries,
+        },
+        'results': results,
+    }
+
+
+def compare_results(base: Dict, current: Dict) -> List[Dict]:
+    """Casos presentes en ambas ejecuciones con la razón de medianas (actual / base; > 1 es más lento)"""
+    base_cases = {case['key']: case for case in base['results']}
+    comparison = []
+    for case in current['results']:
+        previous = base_cases.get(case['key'])
+        if previous is None or not previous['seconds']['median']:
+            continue
+        comparison.append({
+            'key': case['key'],
+            'base': previous['seconds']['median'],
+            'current': case['seconds']['median'],
+            'ratio': case['seconds']['median'] / previous['seconds']['median'],
+        })
+    return comparison
+
+
+def _sizes(value: str) -> List[int]:
+    return [int(size) for size in value.split(',') if size]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='benchmark', description="Benchmarks con catálogos y fixtures sintéticos")
+    parser.add_argument('-o', '--output', default='benchmark.json', help="Archivo JSON de resultados")
+    parser.add_argument('--quick', action='store_true', help="Tamaños reducidos y una sola repetición")
+    parser.add_argument('--teams', type=_sizes, default=None, help="Tamaños de catálogo, p. ej. 1000,10000")
+    parser.add_argument('--fixtures', type=_sizes, default=None, help="Fixtures por día, p. ej. 100,3000")
+    parser.add_argument('--rows', type=_sizes, default=None, help="Filas de las exportaciones, p. ej. 1000")
+    parser.add_argument('--only', action='append', choices=['matching', 'fixtures', 'export'],
+                        help="Solo este grupo (se puede repetir)")
+    parser.add_argument('--queries', type=int, default=DEFAULT_QUERIES, help="Consultas por caso")
+    parser.add_argument('--repeat', type=int, default=None, help=f"Repeticiones (por defecto: {DEFAULT_REPEAT})")
+    parser.add_argument('--seed', type=int, default=0, help="Semilla de los datos sintéticos")
+    parser.add_argument('--compare', default=None, help="JSON de otra ejecución para comparar")
+    parser.add_argument('--max-regression', type=float, default=None,
+                        help="Con --compare: termina con código 1 si algún caso es más lento que base x este factor")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    # Solo el avance del benchmark: los avisos de los matchers por cada partido no encontrado se omiten
+    logging.basicConfig(level=logging.ERROR, format='%(message)s')
+    logger.setLevel(logging.INFO)
+
+    report = run_benchmarks(
+        teams=args.teams or (QUICK_TEAMS if args.quick else DEFAULT_TEAMS),
+        fixtures=args.fixtures or (QUICK_FIXTURES if args.quick else DEFAULT_FIXTURES),
+        rows=args.rows or (QUICK_ROWS if args.quick else DEFAULT_ROWS),
+        queries=args.queries,
+        repeat=args.repeat or (1 if args.quick else DEFAULT_REPEAT),
+        seed=args.seed,
+        only=args.only,
+    )
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"{len(report['results'])} casos escritos en {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            comparison = compare_results(json.load(f), report)
+        for row in comparison:
+            print(f"{row['ratio']:6.2f}x  {row['key']}  ({row['base']:.3f}s -> {row['current']:.3f}s)")
+        if args.max_regression and any(row['ratio'] > args.max_regression for row in comparison):
+            print(f"Error: hay casos más lentos que {args.max_regression}x la ejecución base", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Diario de avance (checkpoint) para procesar CSV largos en varias ejecuciones
+Archivo JSONL append-only (uno por método y archivo de entrada): una línea por
+fila terminada, con clave = hash del texto del partido. Al volver a procesar el
+mismo archivo las filas ya terminadas se toman del diario y solo se resuelven las
+pendientes, así una sesión caída o la cuota agotada no obligan a repetir llamadas
+a la API. Solo los éxitos se reutilizan siempre; una fila fallida (p. ej. fixture
+aún no publicado) se reutiliza mientras su entrada tenga menos de
+CHECKPOINT_FAILURE_TTL segundos y después se vuelve a resolver.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from load_env import data_path, ensure_parent_dir
+
+# Carpeta de los diarios (uno por método y archivo de entrada)
+CHECKPOINT_DIR = os.getenv('CHECKPOINT_DIR') or data_path('checkpoints')
+
+# Vigencia (segundos) de las filas fallidas del diario
+CHECKPOINT_FAILURE_TTL = float(os.getenv('CHECKPOINT_FAILURE_TTL', str(6 * 3600)))
+
+
+def row_key(match_text: str) -> str:
+    """Hash de una fila: el mismo texto da el mismo resultado dentro de un diario"""
+    return hashlib.sha1(match_text.strip().encode('utf-8')).hexdigest()
+
+
+def journal_path(method: str, match_texts: Iterable[str], directory: Optional[str] = None) -> str:
+    """Ruta del diario de un archivo: depende del método y de todos sus textos de partido"""
+    digest = hashlib.sha1(method.encode('utf-8'))
+    for match_text in match_texts:
+        digest.update(b'\x1e' + str(match_text).encode('utf-8'))
+    return os.path.join(directory or CHECKPOINT_DIR, f"{method}-{digest.hexdigest()[:16]}.jsonl")
+
+
+def file_journal_path(method: str, input_path: str, directory: Optional[str] = None) -> str:
+    """Ruta del diario de un CSV leído por bloques: depende del contenido del archivo"""
+    digest = hashlib.sha1(method.encode('utf-8'))
+    with open(input_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return os.path.join(directory or CHECKPOINT_DIR, f"{method}-{digest.hexdigest()[:16]}.jsonl")
+
+
+class CheckpointJournal:
+    """Resultados de filas terminadas en un JSONL append-only"""
+
+    def __init__(self, path: str, failure_ttl: float = CHECKPOINT_FAILURE_TTL):
+        self.path = path
+        self.failure_ttl = failure_ttl
+        self._lock = threading.Lock()
+        self._results: Dict[str, Dict] = {}
+        self._written: Dict[str, float] = {}
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Última línea cortada por una caída a mitad de escritura
+                        continue
+                    self._results[entry['key']] = entry['result']
+                    # Entradas sin 'ts' (diarios anteriores): fallidas ya vencidas
+                    self._written[entry['key']] = entry.get('ts', 0.0)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._results
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Copia del resultado guardado (o None si no hay o es un fallo vencido)"""
+        result = self._results.get(key)
+        if result is None:
+            return None
+        if not result.get('success') and time.time() - self._written[key] >= self.failure_ttl:
+            return None
+        return dict(result)
+
+    def append(self, key: str, result: Dict):
+        """Registra una fila terminada; se escribe y sincroniza de inmediato"""
+        written = time.time()
+        line = json.dumps({'key': key, 'result': result, 'ts': written}, ensure_ascii=False, default=str)
+        with self._lock:
+            ensure_parent_dir(self.path)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._results[key] = json.loads(line)['result']
+            self._written[key] = written
+
+    def clear(self):
+        """Descarta el diario (la próxima ejecución empieza desde cero)"""
+        with self._lock:
+            self._results.clear()
+            self._written.clear()
+            if os.path.exists(self.path):
+                os.remove(self.path)
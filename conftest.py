@@ -0,0 +1,32 @@
+"""
+Configuración de pytest: los archivos de datos de cada prueba van a una carpeta temporal
+para que las suites no creen ni reutilicen bases en la raíz del repositorio
+"""
+import os
+
+import pytest
+
+import alias_store
+import checkpoint
+import h2h_cache
+import http_cache
+import job_queue
+import match_cache
+
+
+@pytest.fixture(autouse=True)
+def data_files_in_tmp(tmp_path, monkeypatch):
+    """Rutas de alias, cachés, trabajos y checkpoints bajo tmp_path; singletons reiniciados"""
+    monkeypatch.setattr(alias_store, 'ALIAS_DB_PATH', os.path.join(tmp_path, 'team_aliases.db'))
+    monkeypatch.setattr(alias_store, '_stores', {})
+    monkeypatch.setattr(http_cache, 'HTTP_CACHE_PATH', os.path.join(tmp_path, 'api_cache.db'))
+    monkeypatch.setattr(http_cache, '_cache', None)
+    monkeypatch.setattr(h2h_cache, 'H2H_CACHE_PATH', os.path.join(tmp_path, 'h2h_cache.db'))
+    monkeypatch.setattr(h2h_cache, '_cache', None)
+    monkeypatch.setattr(match_cache, 'MATCH_CACHE_PATH', os.path.join(tmp_path, 'match_cache.db'))
+    monkeypatch.setattr(match_cache, '_cache', None)
+    monkeypatch.setattr(job_queue, 'JOBS_DB_PATH', os.path.join(tmp_path, 'jobs.db'))
+    monkeypatch.setattr(job_queue, '_pool', None)
+    monkeypatch.setattr(checkpoint, 'CHECKPOINT_DIR', os.path.join(tmp_path, 'checkpoints'))
+    monkeypatch.setattr(job_queue, 'CHECKPOINT_DIR', os.path.join(tmp_path, 'checkpoints'))
+    yield tmp_path
@@ -0,0 +1,95 @@
+"""
+Libros de Excel escritos fila por fila (xlsxwriter en modo constant_memory)
+Cada hoja se vuelca a disco a medida que se agregan filas, así que la memoria no
+crece con el número de filas; varias hojas pueden llenarse intercaladas. Para
+descargas en Streamlit el libro se arma en un archivo temporal y solo el .xlsx
+final (comprimido) se lee a memoria.
+"""
+
+import os
+import tempfile
+from datetime import date, datetime
+from typing import Any, Callable, List
+
+import numpy as np
+import pandas as pd
+
+# Opciones de xlsxwriter: sin convertir textos en fórmulas ni hipervínculos
+WORKBOOK_OPTIONS = {
+    'constant_memory': True,
+    'strings_to_formulas': False,
+    'strings_to_urls': False,
+    'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+}
+
+
+def excel_value(value: Any) -> Any:
+    """Valor apto para xlsxwriter: NaN/None vacíos, escalares de numpy a Python y lo demás como texto"""
+    if value is None:
+        return None
+    if isinstance(value, (str, bool, int, float, datetime, date)):
+        return None if isinstance(value, float) and np.isnan(value) else value
+    if isinstance(value, np.generic):
+        return excel_value(value.item())
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+class StreamingSheet:
+    """Hoja con encabezado; append() escribe la siguiente fila"""
+
+    def __init__(self, worksheet, columns: List[str]):
+        self._worksheet = worksheet
+        self._row = 0
+        self.append(columns)
+
+    def append(self, values):
+        worksheet, row = self._worksheet, self._row
+        for col, value in enumerate(values):
+            value = excel_value(value)
+            # Métodos por tipo: evitan el despacho genérico de write() en cada celda
+            if value is None:
+                continue
+            if isinstance(value, str):
+                worksheet.write_string(row, col, value)
+            elif isinstance(value, bool):
+                worksheet.write_boolean(row, col, value)
+            elif isinstance(value, (int, float)):
+                worksheet.write_number(row, col, value)
+            else:
+                worksheet.write(row, col, value)
+        self._row += 1
+
+
+class StreamingWorkbook:
+    """Libro .xlsx en 'path' con hojas que se llenan fila por fila"""
+
+    def __init__(self, path: str):
+        import xlsxwriter
+
+        self.path = path
+        self._workbook = xlsxwriter.Workbook(path, WORKBOOK_OPTIONS)
+
+    def add_sheet(self, name: str, columns: List[str]) -> StreamingSheet:
+        return StreamingSheet(self._workbook.add_worksheet(name), columns)
+
+    def close(self):
+        self._workbook.close()
+
+
+def workbook_bytes(fill: Callable[[StreamingWorkbook], None]) -> bytes:
+    """Arma un libro en un archivo temporal con fill(workbook) y retorna su contenido"""
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        workbook = StreamingWorkbook(path)
+        fill(workbook)
+        workbook.close()
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(path)
@@ -0,0 +1,132 @@
+"""
+Servidor HTTP local que imita API Football para pruebas y benchmarks sin cuota
+Sirve /fixtures?date=, /fixtures/headtohead?h2h= (con from/to) y /teams?league= a partir de
+una lista de fixtures en memoria (p. ej. generada desde tashist.csv).
+Con quota=N responde como API Football con la cuota diaria agotada a partir de la
+solicitud N+1; con unavailable=True responde HTTP 503 (API caída)
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+from dateutil import tz
+
+TIMEZONE = "America/Mexico_City"
+
+
+def fixtures_from_csv(path: str = "tashist.csv", league_id: int = 262) -> List[Dict]:
+    """Un fixture por fila del CSV (columnas Fecha, Local, Visitante) con IDs estables por nombre"""
+    df = pd.read_csv(path)
+    cdmx = tz.gettz(TIMEZONE)
+    team_ids: Dict[str, int] = {}
+    fixtures = []
+
+    for pos, row in df.iterrows():
+        kickoff = datetime.strptime(str(row['Fecha']), "%m/%d/%Y %H:%M").replace(tzinfo=cdmx)
+        home = str(row['Local']).strip()
+        away = str(row['Visitante']).strip()
+        fixtures.append(make_fixture(
+            100000 + pos, kickoff,
+            (team_ids.setdefault(home, 1000 + len(team_ids)), home),
+            (team_ids.setdefault(away, 1000 + len(team_ids)), away),
+            league_id
+        ))
+    return fixtures
+
+
+def make_fixture(fixture_id: int, kickoff: datetime, home: tuple, away: tuple, league_id: int = 262,
+                 league_name: str = "Liga MX", season: int = 2024) -> Dict:
+    """Fixture con la forma de la respuesta de API Football"""
+    return {
+        "fixture": {"id": fixture_id, "date": kickoff.isoformat(), "timezone": TIMEZONE},
+        "league": {"id": league_id, "name": league_name, "season": season},
+        "teams": {
+            "home": {"id": home[0], "name": home[1]},
+            "away": {"id": away[0], "name": away[1]},
+        },
+    }
+
+
+class FakeApiFootball:
+    """Servidor en un hilo: with FakeApiFootball(fixtures) as api: api.base_url"""
+
+    def __init__(self, fixtures: List[Dict], latency: float = 0.0, teams: Optional[Dict[int, List[Dict]]] = None,
+                 quota: Optional[int] = None):
+        self.fixtures_by_date: Dict[str, List[Dict]] = {}
+        self.fixtures_by_pair: Dict[frozenset, List[Dict]] = {}
+        for fx in fixtures:
+            self.fixtures_by_date.setdefault(self._local_date(fx), []).append(fx)
+            pair = frozenset([fx["teams"]["home"]["id"], fx["teams"]["away"]["id"]])
+            self.fixtures_by_pair.setdefault(pair, []).append(fx)
+        self.teams = teams or {}
+        self.latency = latency
+        self.quota = quota
+        self.unavailable = False
+        self.hits: List[str] = []
+        self._lock = threading.Lock()
+        self._server = None
+
+    @staticmethod
+    def _local_date(fx: Dict) -> str:
+        local_date = datetime.fromisoformat(fx["fixture"]["date"]).astimezone(tz.gettz(TIMEZONE))
+        return local_date.strftime("%Y-%m-%d")
+
+    def _respond(self, path: str, params: Dict[str, str]) -> Dict:
+        if path == "/fixtures" and "date" in params:
+            return {"errors": [], "response": self.fixtures_by_date.get(params["date"], [])}
+        if path == "/fixtures/headtohead":
+            home, away = (int(team_id) for team_id in params["h2h"].split("-"))
+            fixtures = self.fixtures_by_pair.get(frozenset([home, away]), [])
+            if "from" in params and "to" in params:
+                fixtures = [fx for fx in fixtures if params["from"] <= self._local_date(fx) <= params["to"]]
+            return {"errors": [], "response": fixtures}
+        if path == "/teams":
+            return {"errors": [], "response": [{"team": t} for t in self.teams.get(int(params["league"]), [])]}
+        return {"errors": {"endpoint": "unknown"}, "response": []}
+
+    def __enter__(self) -> 'FakeApiFootball':
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                with api._lock:
+                    api.hits.append(self.path)
+                    exhausted = api.quota is not None and len(api.hits) > api.quota
+                if api.latency:
+                    time.sleep(api.latency)
+                status = 200
+                if exhausted:
+                    payload = {"errors": {"requests": "You have reached the request limit for the day"}, "response": []}
+                elif api.unavailable:
+                    status, payload = 503, {"message": "Service Unavailable"}
+                else:
+                    payload = api._respond(url.path, params)
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
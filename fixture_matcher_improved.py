@@ -3,16 +3,20 @@ Sistema de matching basado en fixtures de API Football - VERSIÓN MEJORADA
 Prioriza equipos principales sobre equipos juveniles/reservas
 """
 
-import requests
 import re
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import time
 import logging
 
+from api_client import ApiFootballClient, FetchError, QuotaExceededError, shared_rate_limiter
+from http_cache import get_http_cache
+
 # Configurar logging para este módulo
 logger = logging.getLogger(__name__)
 
+RAPIDAPI_BASE = "https://api-football-v1.p.rapidapi.com/v3"
+
 class FixtureMatcher:
     """Sistema para encontrar equipos usando fixtures específicos de API Football"""
     
@@ -23,6 +27,14 @@ class FixtureMatcher:
             "x-rapidapi-host": "api-football-v1.p.rapidapi.com"
         }
         self.cache = {}  # Cache para evitar llamadas repetidas
+        # Sesión compartida con rate limit por API key y caché HTTP persistente
+        self.client = ApiFootballClient(
+            headers=self.headers,
+            base_url=RAPIDAPI_BASE,
+            rate_limiter=shared_rate_limiter(api_key),
+            timeout=(5, 10),
+            cache=get_http_cache()
+        )
     
     def parse_match_text(self, match_text: str) -> Optional[Dict]:
         """
@@ -76,17 +88,17 @@ class FixtureMatcher:
     def search_fixtures_by_date(self, date: str) -> List[Dict]:
         """
         Busca todos los fixtures en una fecha específica
+        Lanza FetchError si la API no responde o responde con error (no se guarda en cache)
         """
         cache_key = f"fixtures_{date}"
         if cache_key in self.cache:
             return self.cache[cache_key]
         
-        url = "https://api-football-v1.p.rapidapi.com/v3/fixtures"
         querystring = {"date": date}
         
         try:
             logger.info(f"Buscando fixtures para fecha: {date}")
-            response = requests.get(url, headers=self.headers, params=querystring, timeout=10)
+            response = self.client.get("/fixtures", querystring)
             logger.info(f"Respuesta API: status={response.status_code}")
             
             if response.status_code == 200:
@@ -97,11 +109,13 @@ class FixtureMatcher:
                 return fixtures
             else:
                 logger.error(f"Error API: {response.status_code} - {response.text}")
-                return []
+                raise FetchError(f"HTTP {response.status_code} al buscar fixtures de {date}")
                 
+        except (QuotaExceededError, FetchError):
+            raise
         except Exception as e:
             logger.error(f"Error buscando fixtures por fecha {date}: {e}")
-            return []
+            raise FetchError(f"No se pudieron obtener los fixtures de {date}: {e}") from e
     
     def is_youth_or_reserve_team(self, team_name: str) -> bool:
         """
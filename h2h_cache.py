@@ -0,0 +1,137 @@
+"""
+Caché persistente de enfrentamientos directos (H2H) entre equipos (SQLite)
+Clave: el par de IDs de equipo sin orden (local/visitante da igual)
+Valor: lista ordenada de fechas (CDMX) en que se enfrentaron y la fecha hasta la
+que la lista está completa. Una fecha ya cubierta se responde sin llamar a la
+API; si no, solo se piden los partidos posteriores a la última fecha cubierta.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from bisect import bisect_left, insort
+from contextlib import closing
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from dateutil import tz
+
+from load_env import data_path, ensure_parent_dir
+
+# Ruta del archivo de caché
+H2H_CACHE_PATH = os.getenv('H2H_CACHE_PATH') or data_path('h2h_cache.db')
+
+TIMEZONE = "America/Mexico_City"
+
+
+def pair_key(team_a: int, team_b: int) -> Tuple[int, int]:
+    """Clave del par sin orden: (menor, mayor)"""
+    team_a, team_b = int(team_a), int(team_b)
+    return (team_a, team_b) if team_a <= team_b else (team_b, team_a)
+
+
+def _today() -> str:
+    return datetime.now(tz.gettz(TIMEZONE)).strftime("%Y-%m-%d")
+
+
+class H2HCache:
+    """Fechas de enfrentamientos por par de equipos con actualización incremental"""
+
+    def __init__(self, path: str = H2H_CACHE_PATH, today: Callable[[], str] = _today):
+        self.path = path
+        self._today = today
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        ensure_parent_dir(self.path)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS h2h_dates (
+                    team_a INTEGER NOT NULL,
+                    team_b INTEGER NOT NULL,
+                    dates TEXT NOT NULL,
+                    covered_until TEXT NOT NULL,
+                    PRIMARY KEY (team_a, team_b)
+                )
+            """)
+            self._initialized = True
+        return conn
+
+    def get(self, team_a: int, team_b: int) -> Optional[Dict]:
+        """Entrada del par: {'dates': [...ordenadas], 'covered_until': 'YYYY-MM-DD'} o None"""
+        with self._lock, closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT dates, covered_until FROM h2h_dates WHERE team_a = ? AND team_b = ?",
+                pair_key(team_a, team_b)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'dates': json.loads(row[0]), 'covered_until': row[1]}
+
+    def played_on(self, team_a: int, team_b: int, date_str: str) -> Optional[bool]:
+        """
+        True si el par jugó en la fecha, False si la lista cubre la fecha y no
+        jugó, None si hace falta consultar la API
+        """
+        entry = self.get(team_a, team_b)
+        if entry is None:
+            return None
+        dates = entry['dates']
+        pos = bisect_left(dates, date_str)
+        if pos < len(dates) and dates[pos] == date_str:
+            return True
+        if date_str <= entry['covered_until']:
+            return False
+        return None
+
+    def request_params(self, team_a: int, team_b: int, date_str: str) -> Dict[str, str]:
+        """Parámetros de /fixtures/headtohead: completo la primera vez, incremental después"""
+        team_a, team_b = pair_key(team_a, team_b)
+        params = {"h2h": f"{team_a}-{team_b}"}
+        entry = self.get(team_a, team_b)
+        if entry is not None:
+            params["from"] = entry['covered_until']
+            params["to"] = max(date_str, self._today())
+        return params
+
+    def merge(self, team_a: int, team_b: int, dates: Iterable[str]):
+        """Agrega fechas nuevas al par; la lista queda completa hasta hoy"""
+        key = pair_key(team_a, team_b)
+        today = self._today()
+        with self._lock, closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT dates FROM h2h_dates WHERE team_a = ? AND team_b = ?", key
+            ).fetchone()
+            merged = json.loads(row[0]) if row else []
+            for date_str in dates:
+                pos = bisect_left(merged, date_str)
+                if pos == len(merged) or merged[pos] != date_str:
+                    insort(merged, date_str)
+            conn.execute(
+                "INSERT OR REPLACE INTO h2h_dates VALUES (?, ?, ?, ?)",
+                key + (json.dumps(merged), today)
+            )
+
+    def __len__(self) -> int:
+        with self._lock, closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM h2h_dates").fetchone()[0]
+
+    def clear(self):
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM h2h_dates")
+
+
+_cache: Optional[H2HCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_h2h_cache() -> H2HCache:
+    """Instancia compartida por todos los resolvers del proceso"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = H2HCache(H2H_CACHE_PATH)
+        return _cache
@@ -0,0 +1,237 @@
+"""
+Caché persistente de respuestas de API Football (SQLite)
+Compartida por todos los clientes (AdvancedFixtureResolver, FixtureMatcher y la
+carga de ligas de app.py) y entre sesiones de Streamlit, para no gastar cuota
+repitiendo las mismas consultas.
+
+- Clave: URL base + endpoint + parámetros ordenados (otra API u otro proxy no
+  comparten entradas)
+- TTL por endpoint: fixtures de fechas pasadas no caducan, las de hoy duran
+  poco y las listas de equipos se renuevan a diario; una respuesta vacía (p. ej.
+  fixtures aún no publicados) dura como máximo TTL_EMPTY_RESPONSE
+- Respuestas con error (HTTP distinto de 200 o 'errors') no se guardan
+- Revalidación condicional con ETag / Last-Modified cuando una entrada caduca
+- Límite de tamaño total con expulsión LRU
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import date, datetime, timezone
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from load_env import data_path, ensure_parent_dir
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+
+# Ruta del archivo de caché y tamaño máximo de las respuestas guardadas
+HTTP_CACHE_PATH = os.getenv('HTTP_CACHE_PATH') or data_path('api_cache.db')
+HTTP_CACHE_MAX_BYTES = int(os.getenv('HTTP_CACHE_MAX_BYTES', str(200 * 1024 * 1024)))
+
+# TTL en segundos (None = no caduca)
+TTL_PAST_FIXTURES = None
+TTL_TODAY_FIXTURES = 10 * 60
+TTL_FUTURE_FIXTURES = 6 * 3600
+TTL_TEAMS = 24 * 3600
+TTL_HEAD_TO_HEAD = 24 * 3600
+TTL_DEFAULT = 3600
+TTL_EMPTY_RESPONSE = 3600
+
+
+def cache_key(endpoint: str, params: Optional[Dict] = None, base_url: str = '') -> str:
+    """Clave estable: 'https://host/fixtures?date=2025-04-04&timezone=...'"""
+    endpoint = base_url.rstrip('/') + '/' + endpoint.strip('/')
+    if not params:
+        return endpoint
+    return f"{endpoint}?{urlencode(sorted((str(k), str(v)) for k, v in params.items()))}"
+
+
+def _today(params: Dict) -> date:
+    """Fecha actual en la zona horaria de la consulta (UTC si no se indica)"""
+    tz_name = params.get('timezone')
+    if tz_name and ZoneInfo is not None:
+        try:
+            return datetime.now(ZoneInfo(tz_name)).date()
+        except Exception:
+            pass
+    return datetime.now(timezone.utc).date()
+
+
+def ttl_for(endpoint: str, params: Optional[Dict] = None) -> Optional[float]:
+    """Tiempo de vida de una respuesta según el endpoint y sus parámetros"""
+    endpoint = '/' + endpoint.strip('/')
+    params = params or {}
+
+    if endpoint == '/fixtures' and 'date' in params:
+        try:
+            fixture_date = datetime.strptime(str(params['date']), "%Y-%m-%d").date()
+        except ValueError:
+            return TTL_DEFAULT
+        today = _today(params)
+        if fixture_date < today:
+            return TTL_PAST_FIXTURES
+        if fixture_date == today:
+            return TTL_TODAY_FIXTURES
+        return TTL_FUTURE_FIXTURES
+    if endpoint == '/fixtures/headtohead':
+        return TTL_HEAD_TO_HEAD
+    if endpoint == '/teams':
+        return TTL_TEAMS
+    return TTL_DEFAULT
+
+
+def response_ttl(endpoint: str, params: Optional[Dict], body: bytes) -> Optional[float]:
+    """ttl_for acotado a TTL_EMPTY_RESPONSE si la respuesta no trae resultados"""
+    ttl = ttl_for(endpoint, params)
+    try:
+        empty = not json.loads(body).get('response')
+    except Exception:
+        empty = True
+    if empty and (ttl is None or ttl > TTL_EMPTY_RESPONSE):
+        return TTL_EMPTY_RESPONSE
+    return ttl
+
+
+def is_cacheable(response: requests.Response) -> bool:
+    """Solo respuestas 200 sin 'errors' (API Football reporta la cuota agotada con 200)"""
+    if response.status_code != 200:
+        return False
+    try:
+        errors = response.json().get('errors')
+    except Exception:
+        return False
+    return not errors
+
+
+def cached_response(body: bytes, headers: Dict, url: str, status_code: int = 200) -> requests.Response:
+    """Respuesta reconstruida desde la caché (misma interfaz que requests)"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.headers = CaseInsensitiveDict(headers)
+    response.url = url
+    response.encoding = 'utf-8'
+    response.from_cache = True
+    return response
+
+
+class HttpCache:
+    """Respuestas HTTP en SQLite con TTL, validadores condicionales y límite de tamaño"""
+
+    def __init__(self, path: str = HTTP_CACHE_PATH, max_bytes: int = HTTP_CACHE_MAX_BYTES,
+                 clock=time.time):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        ensure_parent_dir(self.path)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    headers TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    expires_at REAL,
+                    last_used REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)")
+            self._initialized = True
+        return conn
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Entrada guardada (vigente o no): {'body', 'headers', 'etag', 'last_modified', 'fresh'}"""
+        now = self._clock()
+        with self._lock, closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT body, headers, etag, last_modified, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+
+        body, headers, etag, last_modified, expires_at = row
+        return {
+            'body': bytes(body),
+            'headers': json.loads(headers),
+            'etag': etag,
+            'last_modified': last_modified,
+            'fresh': expires_at is None or expires_at > now
+        }
+
+    def store(self, key: str, response: requests.Response, ttl: Optional[float]):
+        """Guarda una respuesta y aplica el límite de tamaño"""
+        now = self._clock()
+        body = response.content
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() in ('content-type', 'etag', 'last-modified', 'date')}
+        expires_at = None if ttl is None else now + ttl
+
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, body, json.dumps(headers), response.headers.get('ETag'),
+                 response.headers.get('Last-Modified'), now, expires_at, now, len(body))
+            )
+            self._evict(conn)
+
+    def refresh(self, key: str, ttl: Optional[float]):
+        """Renueva la vigencia tras un 304 Not Modified"""
+        now = self._clock()
+        expires_at = None if ttl is None else now + ttl
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("UPDATE responses SET expires_at = ?, last_used = ? WHERE key = ?",
+                         (expires_at, now, key))
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Expulsa las entradas menos usadas hasta quedar bajo max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        to_delete = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            to_delete.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", to_delete)
+
+    def total_bytes(self) -> int:
+        with self._lock, closing(self._connect()) as conn:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def clear(self):
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM responses")
+
+
+_cache: Optional[HttpCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """Instancia compartida por todos los clientes del proceso"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache(HTTP_CACHE_PATH)
+        return _cache
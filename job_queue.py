@@ -0,0 +1,414 @@
+"""
+Cola de trabajos de resolución en segundo plano (SQLite) con un pool de workers locales
+Un trabajo es un CSV enviado con submit(): se parte en lotes de filas que los
+workers toman de la cola uno a uno, así la interfaz no se bloquea y solo consulta
+el estado por su ID (cualquier sesión que conozca el ID ve el mismo trabajo).
+Los workers son hilos del mismo proceso y comparten un resolver por método y API
+key: las fechas ya descargadas por un trabajo (y las solicitudes en curso, ver
+ApiFootballClient) sirven a los demás, y el checkpoint por contenido del archivo
+hace que volver a enviar el mismo CSV sea casi gratis.
+Un lote que falla vuelve a la cola hasta JOB_MAX_ATTEMPTS veces; si sigue fallando el
+trabajo termina como 'failed' pero conserva los resultados de los demás lotes.
+La API key solo se guarda en memoria, nunca en la base de datos.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from checkpoint import CHECKPOINT_DIR, CheckpointJournal, journal_path
+from load_env import data_path, ensure_parent_dir
+from resolver_pipeline import resolve_dataframe, result_table, summarize
+
+logger = logging.getLogger(__name__)
+
+# Ruta de la base de datos de trabajos, filas por lote y número de workers
+JOBS_DB_PATH = os.getenv('JOBS_DB_PATH') or data_path('jobs.db')
+JOB_BATCH_SIZE = int(os.getenv('JOB_BATCH_SIZE', '100'))
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+
+# Intentos por lote antes de darlo por fallido
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+
+# Estados finales de un trabajo
+JOB_FINISHED = ('done', 'paused', 'failed')
+
+# Segundos entre consultas de estado de la interfaz
+JOB_POLL_SECONDS = 1.0
+
+
+class JobQueue:
+    """Trabajos y sus lotes de filas; los workers reclaman lotes pendientes de forma atómica"""
+
+    def __init__(self, path: str = JOBS_DB_PATH, max_attempts: int = JOB_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        ensure_parent_dir(self.path)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    method TEXT NOT NULL,
+                    total INTEGER NOT NULL,
+                    journal TEXT,
+                    paused INTEGER NOT NULL DEFAULT 0,
+                    created REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_batches (
+                    job_id TEXT NOT NULL,
+                    batch_no INTEGER NOT NULL,
+                    row_offset INTEGER NOT NULL,
+                    rows TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    claim TEXT,
+                    results TEXT,
+                    summary TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (job_id, batch_no)
+                )
+            """)
+            # Bases creadas antes de los reintentos por lote
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(job_batches)")}
+            if 'attempts' not in columns:
+                conn.execute("ALTER TABLE job_batches ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_job_batches_status ON job_batches (status)")
+            self._initialized = True
+        return conn
+
+    def submit(self, df: pd.DataFrame, method: str, batch_size: int = JOB_BATCH_SIZE,
+               journal: Optional[str] = None) -> str:
+        """Encola el DataFrame (columna 'Match text') en lotes de batch_size filas; retorna el ID del trabajo"""
+        job_id = uuid.uuid4().hex[:12]
+        df = df.reset_index(drop=True)
+        batches = [
+            (job_id, batch_no, start,
+             json.dumps(df.iloc[start:start + batch_size].to_dict('records'), ensure_ascii=False, default=str),
+             'queued')
+            for batch_no, start in enumerate(range(0, len(df), batch_size))
+        ]
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("INSERT INTO jobs (id, method, total, journal, created) VALUES (?, ?, ?, ?, ?)",
+                         (job_id, method, len(df), journal, time.time()))
+            conn.executemany("INSERT INTO job_batches (job_id, batch_no, row_offset, rows, status) "
+                             "VALUES (?, ?, ?, ?, ?)", batches)
+        logger.info(f"Trabajo {job_id} encolado: {len(df)} filas en {len(batches)} lotes ({method})")
+        return job_id
+
+    def claim(self, job_ids: List[str]) -> Optional[Dict]:
+        """
+        Toma el siguiente lote pendiente (trabajos más antiguos primero) de los job_ids dados
+        Retorna {'job_id', 'batch_no', 'row_offset', 'rows', 'method', 'journal', 'paused'} o None
+        """
+        if not job_ids:
+            return None
+        token = uuid.uuid4().hex
+        placeholders = ','.join('?' * len(job_ids))
+        with self._lock, closing(self._connect()) as conn, conn:
+            # Un solo UPDATE: dos workers (o procesos) nunca toman el mismo lote
+            claimed = conn.execute(
+                f"UPDATE job_batches SET status = 'running', claim = ? WHERE rowid = ("
+                f"SELECT b.rowid FROM job_batches b JOIN jobs j ON j.id = b.job_id "
+                f"WHERE b.status = 'queued' AND b.job_id IN ({placeholders}) "
+                f"ORDER BY j.created, b.batch_no LIMIT 1)",
+                [token] + list(job_ids)
+            ).rowcount
+            if not claimed:
+                return None
+            row = conn.execute(
+                "SELECT b.job_id, b.batch_no, b.row_offset, b.rows, j.method, j.journal, j.paused "
+                "FROM job_batches b JOIN jobs j ON j.id = b.job_id WHERE b.claim = ?",
+                (token,)
+            ).fetchone()
+        job_id, batch_no, row_offset, rows, method, journal, paused = row
+        return {'job_id': job_id, 'batch_no': batch_no, 'row_offset': row_offset, 'rows': json.loads(rows),
+                'method': method, 'journal': journal, 'paused': bool(paused)}
+
+    def complete(self, job_id: str, batch_no: int, processed: Dict):
+        """Guarda los resultados de un lote; si se pausó por cuota, el resto del trabajo no llama a la API"""
+        summary = processed['summary']
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE job_batches SET status = 'done', results = ?, summary = ? WHERE job_id = ? AND batch_no = ?",
+                (json.dumps(processed['results'], ensure_ascii=False, default=str), json.dumps(summary),
+                 job_id, batch_no)
+            )
+            if summary['paused']:
+                conn.execute("UPDATE jobs SET paused = 1 WHERE id = ?", (job_id,))
+
+    def fail(self, job_id: str, batch_no: int, error: str) -> bool:
+        """
+        Registra el error de un lote: vuelve a la cola si le quedan intentos, si no queda
+        'failed'. Retorna si se volvió a encolar
+        """
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE job_batches SET attempts = attempts + 1, error = ?, claim = NULL, "
+                "status = CASE WHEN attempts + 1 < ? THEN 'queued' ELSE 'failed' END "
+                "WHERE job_id = ? AND batch_no = ?",
+                (error, self.max_attempts, job_id, batch_no)
+            )
+            status, = conn.execute("SELECT status FROM job_batches WHERE job_id = ? AND batch_no = ?",
+                                   (job_id, batch_no)).fetchone()
+        return status == 'queued'
+
+    def requeue_running(self) -> int:
+        """Devuelve a la cola los lotes que quedaron a medias (p. ej. el proceso se reinició)"""
+        with self._lock, closing(self._connect()) as conn, conn:
+            return conn.execute("UPDATE job_batches SET status = 'queued', claim = NULL "
+                                "WHERE status = 'running'").rowcount
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """
+        Estado de un trabajo (None si no existe): 'queued', 'running', 'done',
+        'paused' (cuota agotada, quedan filas pendientes) o 'failed' (algún lote agotó sus
+        intentos; solo cuando ya no queda ningún lote en cola o en curso)
+        """
+        with self._lock, closing(self._connect()) as conn:
+            job = conn.execute("SELECT method, total, paused, created FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+            batches = conn.execute(
+                "SELECT status, summary, error, CASE WHEN status = 'failed' THEN rows END "
+                "FROM job_batches WHERE job_id = ?", (job_id,)
+            ).fetchall()
+
+        method, total, paused, created = job
+        counts = {'total': 0, 'successful': 0, 'failed': 0, 'pending': 0}
+        statuses = [status for status, _, _, _ in batches]
+        for status, summary, _, rows in batches:
+            if summary:
+                for key in counts:
+                    counts[key] += json.loads(summary)[key]
+            elif rows:
+                # Filas de un lote fallido: cuentan como fallidas
+                counts['total'] += len(json.loads(rows))
+                counts['failed'] += len(json.loads(rows))
+        errors = [error for status, _, error, _ in batches if status == 'failed']
+
+        if any(status in ('queued', 'running') for status in statuses):
+            state = 'queued' if all(status == 'queued' for status in statuses) else 'running'
+        elif errors:
+            state = 'failed'
+        else:
+            state = 'paused' if paused else 'done'
+
+        return {
+            'id': job_id,
+            'method': method,
+            'status': state,
+            'total': total,
+            'processed': counts['total'],
+            'successful': counts['successful'],
+            'failed': counts['failed'],
+            'pending': counts['pending'],
+            'paused': bool(paused),
+            'error': errors[0] if errors else None,
+            'created': created,
+        }
+
+    def results(self, job_id: str) -> Optional[Dict]:
+        """
+        {'results': [...en el orden del archivo], 'table': result_table(results),
+        'original_data': DataFrame enviado, 'summary': {...}} de un trabajo terminado.
+        Si el trabajo falló, las filas de los lotes fallidos salen como fallidas con su error
+        """
+        status = self.status(job_id)
+        if status is None or status['status'] not in JOB_FINISHED:
+            return None
+        with self._lock, closing(self._connect()) as conn:
+            batches = conn.execute("SELECT row_offset, rows, results, error FROM job_batches "
+                                   "WHERE job_id = ? ORDER BY batch_no", (job_id,)).fetchall()
+        results = []
+        original_rows = []
+        for row_offset, rows, batch_results, error in batches:
+            rows = json.loads(rows)
+            original_rows.extend(rows)
+            if batch_results is not None:
+                results.extend(json.loads(batch_results))
+            else:
+                results.extend({'row_index': row_offset + n, 'success': False,
+                                'error': f'Error procesando lote: {error}'} for n in range(len(rows)))
+        return {
+            'results': results,
+            'table': result_table(results),
+            'original_data': pd.DataFrame(original_rows),
+            'summary': summarize(status['total'], status['successful'], status['failed'],
+                                 status['pending'], status['paused'])
+        }
+
+
+def job_status_message(status: Dict) -> str:
+    """Texto de avance de un trabajo para la interfaz"""
+    if status['status'] == 'queued':
+        return f"⏳ Trabajo en cola: {status['total']} filas"
+    return (f"⚙️ Procesando: {status['processed']}/{status['total']} filas "
+            f"({status['successful']} exitosas, {status['failed']} fallidas)")
+
+
+class JobWorkerPool:
+    """
+    Workers (hilos) que toman lotes de la cola y los resuelven con resolve_dataframe
+    Un resolver por (método, API key), compartido por todos los trabajos
+    """
+
+    def __init__(self, queue: Optional[JobQueue] = None, workers: int = JOB_WORKERS,
+                 resolver_factory: Optional[Callable[[str, str], object]] = None,
+                 checkpoint_dir: Optional[str] = CHECKPOINT_DIR, poll_interval: float = 0.5):
+        self.queue = queue or JobQueue(JOBS_DB_PATH)
+        self.workers = workers
+        self.checkpoint_dir = checkpoint_dir
+        self.poll_interval = poll_interval
+        if resolver_factory is None:
+            from resolver_cli import build_resolver as resolver_factory
+        self._resolver_factory = resolver_factory
+        self._api_keys: Dict[str, str] = {}
+        self._resolvers: Dict[tuple, object] = {}
+        self._journals: Dict[str, CheckpointJournal] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> 'JobWorkerPool':
+        with self._lock:
+            if not self._threads:
+                self.queue.requeue_running()
+                self._stop.clear()
+                for n in range(self.workers):
+                    thread = threading.Thread(target=self._work, name=f"job-worker-{n}", daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def submit(self, df: pd.DataFrame, method: str, api_key: str, batch_size: int = JOB_BATCH_SIZE) -> str:
+        """Encola un CSV y despierta a los workers; retorna el ID del trabajo"""
+        journal = None
+        if self.checkpoint_dir is not None:
+            journal = journal_path(method, df['Match text'].astype(str), self.checkpoint_dir)
+        job_id = self.queue.submit(df, method, batch_size, journal)
+        with self._lock:
+            self._api_keys[job_id] = api_key
+        self._wake.set()
+        return job_id
+
+    def resume(self, job_id: str, api_key: str) -> bool:
+        """
+        Vuelve a asociar una API key a un trabajo sin ella (enviado antes de reiniciar
+        el proceso) para que los workers lo continúen. Retorna si el trabajo existe
+        """
+        status = self.queue.status(job_id)
+        if status is None:
+            return False
+        if status['status'] not in JOB_FINISHED:
+            with self._lock:
+                self._api_keys.setdefault(job_id, api_key)
+            self._wake.set()
+        return True
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Espera a que el trabajo termine (o el timeout) y retorna su estado (None si no existe)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            status = self.queue.status(job_id)
+            if status is None or status['status'] in JOB_FINISHED:
+                return status
+            if deadline is not None and time.monotonic() >= deadline:
+                return status
+            time.sleep(min(self.poll_interval, JOB_POLL_SECONDS))
+
+    def resolver(self, method: str, api_key: str):
+        """Resolver compartido del método y la API key (el mismo que usan los workers)"""
+        with self._lock:
+            key = (method, api_key)
+            if key not in self._resolvers:
+                self._resolvers[key] = self._resolver_factory(method, api_key)
+            return self._resolvers[key]
+
+    def _journal(self, path: Optional[str]) -> Optional[CheckpointJournal]:
+        if path is None:
+            return None
+        with self._lock:
+            if path not in self._journals:
+                self._journals[path] = CheckpointJournal(path)
+            return self._journals[path]
+
+    def _work(self):
+        while not self._stop.is_set():
+            with self._lock:
+                job_ids = list(self._api_keys)
+            try:
+                batch = self.queue.claim(job_ids)
+            except Exception as e:
+                # Base de datos bloqueada o inaccesible: el worker sigue vivo y reintenta
+                logger.error(f"Error tomando un lote de la cola: {e}")
+                self._stop.wait(self.poll_interval)
+                continue
+            if batch is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            self._process(batch)
+
+    def _process(self, batch: Dict):
+        job_id, batch_no = batch['job_id'], batch['batch_no']
+        try:
+            df = pd.DataFrame(batch['rows'])
+            df.index = range(batch['row_offset'], batch['row_offset'] + len(df))
+            processed = resolve_dataframe(df, self.resolver(batch['method'], self._api_keys[job_id]),
+                                          journal=self._journal(batch['journal']), paused=batch['paused'])
+            self.queue.complete(job_id, batch_no, processed)
+        except Exception as e:
+            logger.error(f"Trabajo {job_id}, lote {batch_no}: {e}")
+            try:
+                if self.queue.fail(job_id, batch_no, str(e)):
+                    self._wake.set()
+            except Exception as e:
+                logger.error(f"Trabajo {job_id}, lote {batch_no}: no se pudo registrar el error: {e}")
+        self._release_if_finished(job_id)
+
+    def _release_if_finished(self, job_id: str):
+        """Olvida la API key de un trabajo terminado: los workers dejan de reclamar sus lotes"""
+        try:
+            status = self.queue.status(job_id)
+        except Exception as e:
+            logger.error(f"Trabajo {job_id}: no se pudo consultar el estado: {e}")
+            return
+        if status is None or status['status'] in JOB_FINISHED:
+            with self._lock:
+                self._api_keys.pop(job_id, None)
+
+
+_pool: Optional[JobWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> JobWorkerPool:
+    """Pool compartido por todas las sesiones del proceso (arrancado al primer uso)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = JobWorkerPool(checkpoint_dir=CHECKPOINT_DIR).start()
+        return _pool
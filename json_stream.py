@@ -0,0 +1,303 @@
+"""
+Lectura incremental de exportaciones JSON de API Football
+Detecta el formato con los primeros tokens y entrega los equipos uno a uno,
+sin cargar el documento completo: la memoria no crece con el tamaño del archivo
+
+Formatos soportados (los mismos de normalizar_json_api_football):
+- 'response': {"response": [{"team": {...}}, ...], ...}
+- 'teams':    {"teams": [...]}
+- 'list':     [{...}, ...]
+- 'indexed':  {"1553": {...}, "8047": {...}}  (las primeras 5 claves son numéricas)
+- 'object':   {"id": 1, "name": "Team"}       (un solo equipo)
+Como último recurso se usa la lista más grande del objeto ('largest_list');
+ese caso sí materializa el objeto completo.
+"""
+
+import codecs
+import io
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Tamaño de cada lectura del archivo (caracteres o bytes)
+JSON_CHUNK_SIZE = 64 * 1024
+
+# Claves numéricas iniciales necesarias para tratar el objeto como indexado por ID
+INDEXED_SAMPLE_KEYS = 5
+
+_WHITESPACE = ' \t\n\r'
+
+
+class _JsonReader:
+    """Lector de tokens JSON sobre un archivo, con un buffer de tamaño acotado"""
+
+    def __init__(self, source, chunk_size: int = JSON_CHUNK_SIZE):
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        elif isinstance(source, str):
+            source = io.StringIO(source)
+
+        self._source = source
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self._json = json.JSONDecoder()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """Descarta lo ya consumido y lee otro bloque; False si el archivo terminó"""
+        if self.eof:
+            return False
+
+        chunk = self._source.read(max(self._chunk_size, min_size))
+        if isinstance(chunk, (bytes, bytearray)):
+            text = self._decoder.decode(chunk, final=not chunk)
+        else:
+            text = chunk
+        if not chunk:
+            self.eof = True
+
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        return bool(chunk)
+
+    def _error(self, message: str):
+        raise json.JSONDecodeError(message, self.buf, self.pos)
+
+    def peek(self) -> str:
+        """Siguiente carácter significativo ('' al final del archivo)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            self._error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def read_value(self) -> Any:
+        """Decodifica el valor completo que empieza en la posición actual"""
+        if not self.peek():
+            self._error("Expecting value")
+
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Valor cortado por el borde del bloque: leer más (crecimiento geométrico)
+                if self._fill(len(self.buf) - self.pos):
+                    continue
+                raise
+
+            # Un número al final del buffer podría continuar en el siguiente bloque
+            if end == len(self.buf) and self._fill():
+                continue
+
+            self.pos = end
+            return value
+
+    def skip_value(self):
+        """Salta el valor actual sin construir listas u objetos completos"""
+        char = self.peek()
+        if char == '[':
+            for _ in self.iter_array():
+                self.skip_value()
+        elif char == '{':
+            for _ in self.iter_object():
+                self.skip_value()
+        else:
+            self.read_value()
+
+    def iter_array(self) -> Iterator[None]:
+        """
+        Recorre un array; en cada paso el llamador debe consumir el elemento
+        (read_value o skip_value) antes de pedir el siguiente
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+
+        while True:
+            yield None
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                self.pos -= 1
+                self._error("Expecting ',' delimiter")
+
+    def iter_object(self) -> Iterator[str]:
+        """Recorre un objeto entregando cada clave; el llamador consume el valor"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+
+        while True:
+            if self.peek() != '"':
+                self._error("Expecting property name enclosed in double quotes")
+            key = self.read_value()
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                self.pos -= 1
+                self._error("Expecting ',' delimiter")
+
+    def iter_values(self) -> Iterator[Any]:
+        """Elementos de un array, decodificados de a uno"""
+        for _ in self.iter_array():
+            yield self.read_value()
+
+    def finish(self):
+        """Verifica que no quede contenido después del documento"""
+        if self.peek():
+            self._error("Extra data")
+
+
+class JsonTeamStream:
+    """
+    Itera los elementos de equipo de una exportación de API Football
+    Acepta un archivo (texto o binario), bytes, un string JSON o datos ya parseados.
+    Tras iterar, 'layout' indica el formato detectado.
+
+    Con las claves 'response' y 'teams' a la vez, gana la primera que aparezca
+    en el archivo (API Football solo envía 'response').
+    """
+
+    def __init__(self, source, chunk_size: int = JSON_CHUNK_SIZE):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.layout: Optional[str] = None
+
+    def __iter__(self) -> Iterator[Any]:
+        if isinstance(self.source, (dict, list)):
+            yield from self._iter_parsed(self.source)
+            return
+
+        reader = _JsonReader(self.source, self.chunk_size)
+        char = reader.peek()
+        if char == '[':
+            self.layout = 'list'
+            yield from reader.iter_values()
+        elif char == '{':
+            yield from self._iter_object(reader)
+        else:
+            reader.read_value()
+        reader.finish()
+
+    def _iter_object(self, reader: _JsonReader) -> Iterator[Any]:
+        members: List[Tuple[str, Any]] = []  # miembros leídos mientras no se decide el formato
+        sample_digits = True
+
+        for key in reader.iter_object():
+            if self.layout is not None:
+                # Formato ya decidido: en 'indexed' cada valor es un equipo
+                if self.layout == 'indexed':
+                    yield reader.read_value()
+                else:
+                    reader.skip_value()
+                continue
+
+            if key in ('response', 'teams'):
+                self.layout = key
+                if reader.peek() == '[':
+                    yield from reader.iter_values()
+                else:
+                    value = reader.read_value()
+                    if isinstance(value, dict):
+                        yield from value
+                continue
+
+            members.append((key, reader.read_value()))
+            if len(members) <= INDEXED_SAMPLE_KEYS:
+                sample_digits = sample_digits and key.isdigit()
+            if len(members) == INDEXED_SAMPLE_KEYS and sample_digits:
+                self.layout = 'indexed'
+                for _, value in members:
+                    yield value
+                members = []
+
+        if self.layout is None:
+            yield from self._iter_members(members, sample_digits)
+
+    def _iter_members(self, members: List[Tuple[str, Any]], sample_digits: bool) -> Iterator[Any]:
+        """Formatos que requieren el objeto completo (pocas claves o sin lista conocida)"""
+        if members and sample_digits:
+            self.layout = 'indexed'
+            for _, value in members:
+                yield value
+            return
+
+        data = dict(members)
+        if 'id' in data:
+            self.layout = 'object'
+            yield data
+            return
+
+        self.layout = 'largest_list'
+        largest: list = []
+        for value in data.values():
+            if isinstance(value, list) and len(value) > len(largest):
+                largest = value
+        yield from largest
+
+    def _iter_parsed(self, data) -> Iterator[Any]:
+        """Misma detección sobre datos ya cargados en memoria"""
+        if isinstance(data, list):
+            self.layout = 'list'
+            yield from data
+        elif 'response' in data or 'teams' in data:
+            self.layout = 'response' if 'response' in data else 'teams'
+            value = data[self.layout]
+            if isinstance(value, (list, dict)):
+                yield from value
+        else:
+            sample_keys = list(data.keys())[:INDEXED_SAMPLE_KEYS]
+            yield from self._iter_members(
+                list(data.items()), bool(sample_keys) and all(key.isdigit() for key in sample_keys)
+            )
+
+
+def iter_api_football_teams(source, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Dict]:
+    """Equipos normalizados de una exportación de API Football, de a uno"""
+    for item in JsonTeamStream(source, chunk_size):
+        team = normalize_api_football_team(item)
+        if team is not None:
+            yield team
+
+
+def normalize_api_football_team(item) -> Optional[Dict]:
+    """Estructura normalizada de un elemento de equipo (None si no tiene ID y nombre)"""
+    # Si el item tiene una estructura {"team": {...}}
+    if isinstance(item, dict) and "team" in item:
+        team_data = item["team"]
+    # Si el item es directamente los datos del equipo
+    elif isinstance(item, dict):
+        team_data = item
+    else:
+        return None
+
+    normalized_team = {
+        "id": team_data.get("id"),
+        "name": team_data.get("name", ""),
+        "code": team_data.get("code", ""),
+        "country": team_data.get("country", ""),
+        "founded": team_data.get("founded"),
+        "logo": team_data.get("logo", ""),
+        "national": team_data.get("national", False)
+    }
+
+    # Solo agregar si tiene al menos ID y nombre
+    if normalized_team["id"] and normalized_team["name"]:
+        return normalized_team
+    return None
@@ -1,8 +1,27 @@
 """
 Cargador de variables de entorno desde archivo .env
+y ruta de los archivos de datos locales (cachés, alias, trabajos, checkpoints)
 """
 import os
 
+# Carpeta de los archivos de datos; vacío = directorio actual
+DATA_DIR = os.getenv('DATA_DIR', '')
+
+
+def data_path(name: str) -> str:
+    """Ruta por defecto de un archivo de datos dentro de DATA_DIR"""
+    if not DATA_DIR:
+        return name
+    return os.path.join(DATA_DIR, name)
+
+
+def ensure_parent_dir(path: str) -> None:
+    """Crea la carpeta de un archivo de datos justo antes de abrirlo"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
 def load_env_file(env_file='.env'):
     """Carga variables de entorno desde un archivo .env"""
     if not os.path.exists(env_file):
@@ -0,0 +1,127 @@
+"""
+Caché persistente de resultados de matching entre ejecuciones (SQLite)
+Clave: (versión del catálogo, nombre normalizado, firma del contexto y del alias)
+La versión es un hash del contenido del catálogo, así que un catálogo distinto
+nunca reutiliza resultados viejos; la firma incluye el alias guardado para el
+nombre (ver TeamAssociationSystem.cache_key), así que escribir un alias invalida
+solo los resultados de ese nombre. Expulsión LRU con un máximo de entradas
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Dict, Iterable, Optional, Tuple
+
+from load_env import data_path, ensure_parent_dir
+
+# Ruta del archivo de caché y número máximo de resultados guardados
+MATCH_CACHE_PATH = os.getenv('MATCH_CACHE_PATH') or data_path('match_cache.db')
+MATCH_CACHE_MAX_ENTRIES = int(os.getenv('MATCH_CACHE_MAX_ENTRIES', '50000'))
+
+# Clave de un resultado: (nombre normalizado, firma del contexto y del alias)
+CacheKey = Tuple[str, str]
+
+
+class MatchCache:
+    """Resultados de find_best_match guardados por versión de catálogo con expulsión LRU"""
+
+    def __init__(self, path: str = MATCH_CACHE_PATH, max_entries: int = MATCH_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        ensure_parent_dir(self.path)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS match_results (
+                    catalog_version TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    context TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (catalog_version, name, context)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_match_results_last_used ON match_results (last_used)")
+            self._initialized = True
+        return conn
+
+    def get_many(self, catalog_version: str, keys: Iterable[CacheKey]) -> Dict[CacheKey, Optional[Dict]]:
+        """
+        Busca varios resultados de una vez y marca los encontrados como usados
+        Solo devuelve las claves presentes (el valor puede ser None: "sin coincidencia")
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        found = {}
+        now = time.time()
+        with self._lock, closing(self._connect()) as conn, conn:
+            for start in range(0, len(keys), 400):
+                chunk = keys[start:start + 400]
+                placeholders = ' OR '.join(['(name = ? AND context = ?)'] * len(chunk))
+                params = [value for key in chunk for value in key]
+                rows = conn.execute(
+                    f"SELECT name, context, result FROM match_results "
+                    f"WHERE catalog_version = ? AND ({placeholders})",
+                    [catalog_version] + params
+                ).fetchall()
+                for name, context, result in rows:
+                    found[(name, context)] = json.loads(result)
+
+            if found:
+                conn.executemany(
+                    "UPDATE match_results SET last_used = ? WHERE catalog_version = ? AND name = ? AND context = ?",
+                    [(now, catalog_version, name, context) for name, context in found]
+                )
+        return found
+
+    def put_many(self, catalog_version: str, results: Dict[CacheKey, Optional[Dict]]):
+        """Guarda resultados nuevos y expulsa los menos usados si se supera el máximo"""
+        if not results:
+            return
+
+        now = time.time()
+        rows = [
+            (catalog_version, name, context, json.dumps(result, ensure_ascii=False, default=float), now)
+            for (name, context), result in results.items()
+        ]
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO match_results VALUES (?, ?, ?, ?, ?)", rows)
+
+            excess = conn.execute("SELECT COUNT(*) FROM match_results").fetchone()[0] - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM match_results WHERE rowid IN "
+                    "(SELECT rowid FROM match_results ORDER BY last_used LIMIT ?)",
+                    (excess,)
+                )
+
+    def __len__(self) -> int:
+        with self._lock, closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM match_results").fetchone()[0]
+
+    def clear(self):
+        """Elimina todos los resultados guardados"""
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM match_results")
+
+
+_cache: Optional[MatchCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_match_cache() -> MatchCache:
+    """Instancia compartida por todas las sesiones del proceso"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MatchCache(MATCH_CACHE_PATH)
+        return _cache
@@ -0,0 +1,136 @@
+"""
+Reporte de avance desacoplado de la interfaz
+El pipeline solo llama a update()/message(); cada entorno decide cómo mostrarlo:
+nada (NullProgress), una línea en la terminal (ConsoleProgress) o barra y
+mensajes de Streamlit (StreamlitProgress). ThrottledProgress limita cuántas
+actualizaciones por segundo llegan a la interfaz (cada una es un viaje por el
+websocket en Streamlit)
+"""
+
+import sys
+import time
+from typing import Any, Callable, Optional
+
+# Actualizaciones de avance por segundo como máximo en la interfaz
+UI_MAX_UPDATES_PER_SECOND = 10
+
+
+class ProgressReporter:
+    """Interfaz de reporte de avance (la implementación base no hace nada)"""
+
+    def update(self, done: int, total: Optional[int] = None, message: str = ''):
+        """Avance: 'done' filas de 'total' (None si no se conoce aún)"""
+
+    def message(self, level: str, text: Any):
+        """
+        Mensaje suelto; level es 'info', 'success', 'warning', 'error', 'write'
+        (texto sin formato) o 'json' (text es un objeto)
+        """
+
+    def close(self):
+        """Fin del proceso"""
+
+
+class NullProgress(ProgressReporter):
+    """Sin salida: ejecución desatendida o pruebas"""
+
+
+class ConsoleProgress(ProgressReporter):
+    """Una línea de avance reescrita en la terminal (stderr por defecto)"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stderr
+        self._open_line = False
+
+    def update(self, done: int, total: Optional[int] = None, message: str = ''):
+        counter = f"{done}/{total}" if total else str(done)
+        line = f"[{counter}] {message}"[:120]
+        if self.stream.isatty():
+            self.stream.write(f"\r{line:<120}")
+            self._open_line = True
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def message(self, level: str, text: Any):
+        self._end_line()
+        prefix = "" if level in ('write', 'json') else f"{level.upper()}: "
+        self.stream.write(f"{prefix}{text}\n")
+        self.stream.flush()
+
+    def close(self):
+        self._end_line()
+
+    def _end_line(self):
+        if self._open_line:
+            self.stream.write("\n")
+            self._open_line = False
+
+
+class ThrottledProgress(ProgressReporter):
+    """
+    Deja pasar como máximo max_per_second actualizaciones de avance; las intermedias
+    se descartan salvo la última, que se entrega al terminar (o al llegar al total).
+    Los mensajes sueltos no se limitan
+    """
+
+    def __init__(self, reporter: ProgressReporter, max_per_second: float = UI_MAX_UPDATES_PER_SECOND,
+                 clock: Callable[[], float] = time.monotonic):
+        self.reporter = reporter
+        self.interval = 1.0 / max_per_second
+        self._clock = clock
+        self._last = None
+        self._pending = None
+
+    def update(self, done: int, total: Optional[int] = None, message: str = ''):
+        now = self._clock()
+        if self._last is None or now - self._last >= self.interval or (total and done >= total):
+            self._pending = None
+            self._last = now
+            self.reporter.update(done, total, message)
+        else:
+            self._pending = (done, total, message)
+
+    def flush(self):
+        """Entrega la última actualización retenida, si la hay"""
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._last = self._clock()
+            self.reporter.update(*pending)
+
+    def message(self, level: str, text: Any):
+        self.flush()
+        self.reporter.message(level, text)
+
+    def close(self):
+        self.flush()
+        self.reporter.close()
+
+
+class StreamlitProgress(ProgressReporter):
+    """Barra de progreso y texto de estado de Streamlit (creados al primer avance)"""
+
+    def __init__(self):
+        import streamlit as st
+
+        self._st = st
+        self.progress_bar = None
+        self.status_text = None
+
+    def update(self, done: int, total: Optional[int] = None, message: str = ''):
+        if total:
+            if self.progress_bar is None:
+                self.progress_bar = self._st.progress(0)
+            self.progress_bar.progress(min(done / total, 1.0))
+        if message:
+            if self.status_text is None:
+                self.status_text = self._st.empty()
+            self.status_text.text(message)
+
+    def message(self, level: str, text: Any):
+        getattr(self._st, level, self._st.info)(text)
+
+
+def streamlit_progress(max_per_second: float = UI_MAX_UPDATES_PER_SECOND) -> ThrottledProgress:
+    """Reporter de Streamlit limitado a max_per_second actualizaciones"""
+    return ThrottledProgress(StreamlitProgress(), max_per_second)
@@ -0,0 +1,98 @@
+"""
+Ejecutor por lotes sin navegador del resolver de partidos
+
+    python -m resolver_cli resolve quiniela.csv -o resultados.xlsx
+    python -m resolver_cli resolve quiniela.csv -o resultados.parquet
+    python -m resolver_cli resolve quiniela.csv -o resultados.csv --method fixtures --chunk-size 1000
+
+Mismo pipeline que las apps de Streamlit (resolver_pipeline.py): el CSV se lee por
+bloques y cada bloque se escribe en la salida apenas se resuelve. Las filas
+terminadas quedan en un checkpoint: si la cuota se agota (o la API no responde)
+el proceso termina con código 3 y volver a ejecutar el mismo comando continúa
+donde se quedó.
+La API key se toma de --api-key o de la variable de entorno RAPIDAPI_KEY (.env)
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import List, Optional
+
+from checkpoint import CHECKPOINT_DIR, CheckpointJournal, file_journal_path
+from progress import ConsoleProgress, NullProgress
+from resolver_pipeline import DEFAULT_CHUNK_SIZE, run_batch
+
+logger = logging.getLogger(__name__)
+
+
+def build_resolver(method: str, api_key: str):
+    """Resolver del método elegido: 'advanced' (AdvancedFixtureResolver) o 'fixtures' (FixtureMatcher)"""
+    if method == 'advanced':
+        from advanced_fixture_resolver import AdvancedFixtureResolver
+        return AdvancedFixtureResolver(api_key)
+    from fixture_matcher_improved import FixtureMatcher
+    return FixtureMatcher(api_key)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='resolver_cli', description="Resolver de fixtures e IDs de equipos por lotes")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    resolve = subparsers.add_parser('resolve', help="Resuelve un CSV con columna 'Match text'")
+    resolve.add_argument('input', help="CSV de entrada")
+    resolve.add_argument('-o', '--output', required=True, help="Archivo de salida (.parquet, .csv o .xlsx)")
+    resolve.add_argument('--method', choices=['advanced', 'fixtures'], default='advanced',
+                         help="Resolver a usar (por defecto: advanced)")
+    resolve.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                         help=f"Filas por bloque (por defecto: {DEFAULT_CHUNK_SIZE})")
+    resolve.add_argument('--api-key', default=None, help="API key de API Football (por defecto: RAPIDAPI_KEY)")
+    resolve.add_argument('--checkpoint', default=None,
+                         help=f"Diario de filas terminadas (por defecto: {CHECKPOINT_DIR}/<método>-<hash del archivo>.jsonl)")
+    resolve.add_argument('--no-checkpoint', action='store_true', help="No registrar ni reanudar filas terminadas")
+    resolve.add_argument('-q', '--quiet', action='store_true', help="Sin reporte de avance")
+    resolve.add_argument('-v', '--verbose', action='store_true', help="Log detallado en stderr")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stderr)
+
+    if args.api_key is None and os.path.exists('.env'):
+        from load_env import load_env_file
+        load_env_file()
+    api_key = args.api_key or os.getenv('RAPIDAPI_KEY')
+    if not api_key:
+        print("Error: falta la API key (--api-key o RAPIDAPI_KEY)", file=sys.stderr)
+        return 2
+    if not os.path.exists(args.input):
+        print(f"Error: no existe el archivo {args.input}", file=sys.stderr)
+        return 2
+
+    journal = None
+    if not args.no_checkpoint:
+        journal = CheckpointJournal(args.checkpoint or file_journal_path(args.method, args.input))
+
+    progress = NullProgress() if args.quiet else ConsoleProgress()
+    start = time.perf_counter()
+    try:
+        summary = run_batch(args.input, args.output, build_resolver(args.method, api_key),
+                            method=args.method, chunk_size=args.chunk_size, progress=progress, journal=journal)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    print(f"{summary['total']} filas: {summary['successful']} exitosas, {summary['failed']} fallidas, "
+          f"{summary['pending']} pendientes ({summary['success_rate']:.1f}%) en "
+          f"{time.perf_counter() - start:.1f}s -> {args.output}", file=sys.stderr)
+    # 3: quedan filas pendientes (cuota agotada o API sin respuesta); volver a ejecutar
+    # continúa desde el checkpoint
+    return 3 if summary['pending'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,581 @@
+"""
+Pipeline de resolución de partidos sin interfaz
+Lo usan las apps de Streamlit (app_advanced.py, app_fixed.py) y el ejecutor por
+lotes (resolver_cli.py). El avance se informa a un ProgressReporter, así que el
+mismo código corre con barra de Streamlit, en la terminal o sin salida.
+
+- resolve_dataframe: resuelve las filas de un DataFrame con 'Match text'
+- result_table: resultados como tabla columnar (una fila por partido, IDs tipados)
+- advanced_output_frames / fixture_output_frames: hojas de salida con un join contra el original
+- run_batch: CSV por bloques -> CSV/Parquet/Excel escrito a medida que avanza
+- export_results: resultados para descargar (Excel, CSV, Parquet o Arrow)
+
+Con un CheckpointJournal las filas terminadas se registran al momento y una nueva
+ejecución solo resuelve las pendientes. Si la cuota de la API se agota el proceso
+se pausa: las filas restantes quedan pendientes en lugar de marcarse como fallidas
+"""
+
+import csv
+import json
+import logging
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from api_client import FetchError, QuotaExceededError
+from checkpoint import CheckpointJournal, row_key
+from excel_stream import StreamingWorkbook
+from result_exporters import Tables, export_tables, pyarrow, typed_frame
+from progress import NullProgress, ProgressReporter
+
+logger = logging.getLogger(__name__)
+
+# Filas por bloque al leer el CSV de entrada
+DEFAULT_CHUNK_SIZE = 500
+
+# Columnas agregadas a los datos originales (hoja Datos_con_IDs)
+ADVANCED_DATA_COLUMNS = [
+    'Local_API_ID', 'Local_API_Name', 'Visitante_API_ID', 'Visitante_API_Name', 'Fixture_ID',
+    'Liga_ID', 'Liga_Name', 'Season', 'Match_Status', 'Match_Method', 'Match_Score', 'Error'
+]
+FIXTURE_DATA_COLUMNS = [
+    'Local_API_ID', 'Local_API_Name', 'Visitante_API_ID', 'Visitante_API_Name',
+    'Match_Status', 'Match_Method', 'Error'
+]
+
+# Columnas de la hoja de mapeo
+ADVANCED_MAPPING_COLUMNS = [
+    'Fila', 'Local_Original', 'Local_API_Name', 'Local_API_ID', 'Visitante_Original', 'Visitante_API_Name',
+    'Visitante_API_ID', 'Fixture_ID', 'Liga', 'Liga_ID', 'Season', 'Match_Score', 'Home_Score',
+    'Away_Score', 'Status', 'Error'
+]
+FIXTURE_MAPPING_COLUMNS = [
+    'Fila', 'Local_Original', 'Local_API_Name', 'Local_API_ID', 'Visitante_Original', 'Visitante_API_Name',
+    'Visitante_API_ID', 'Fecha_Fixture', 'Status', 'Error'
+]
+
+
+def _process_one_by_one(resolver, match_texts: List[str]) -> Iterator[Tuple[int, object]]:
+    """(posición, resultado) fila por fila para resolvers sin procesamiento por lotes"""
+    for pos, match_text in enumerate(match_texts):
+        try:
+            yield pos, resolver.process_match_text(match_text)
+        except Exception as e:
+            yield pos, e
+
+
+def resolve_dataframe(df: pd.DataFrame, resolver, progress: Optional[ProgressReporter] = None,
+                      row_offset: int = 0, total_rows: Optional[int] = None,
+                      journal: Optional[CheckpointJournal] = None, paused: bool = False) -> Dict:
+    """
+    Resuelve cada fila de df (columna 'Match text') con el resolver dado:
+    AdvancedFixtureResolver (por lotes agrupados por fecha) o FixtureMatcher (fila por fila).
+    Retorna {'results': [...en el orden del archivo], 'table': result_table(results), 'summary': {...}}.
+    row_offset y total_rows (0 = desconocido) permiten informar el avance global
+    al procesar por bloques.
+    journal: filas ya terminadas se toman de ahí y las nuevas se registran (solo resultados
+    reales: una fila sin respuesta de la API queda pendiente y no se registra).
+    paused=True no llama a la API: solo recupera filas del journal y deja el resto pendiente
+    """
+    progress = progress or NullProgress()
+    total = len(df)
+    if total_rows is None:
+        total_rows = row_offset + total
+    successful_matches = 0
+    failed_matches = 0
+
+    logger.info(f"Columnas disponibles en DataFrame: {list(df.columns)}")
+
+    # Filas con texto de partido válido; el resto se registra como error sin llamar a la API
+    if 'Match text' in df.columns:
+        texts = df['Match text'].astype(object).map(str).str.strip()
+    else:
+        texts = pd.Series('', index=df.index, dtype=object)
+    rows = {}
+    results_by_row = {}
+    for i, match_text in zip(df.index, texts.tolist()):
+        if not match_text or match_text == 'nan':
+            logger.warning(f"Fila {i+1}: Sin texto de partido válido")
+            results_by_row[i] = {
+                'row_index': i,
+                'success': False,
+                'error': 'Sin texto de partido'
+            }
+            failed_matches += 1
+        else:
+            rows[i] = match_text
+
+    # Filas terminadas en una ejecución anterior (checkpoint)
+    if journal is not None:
+        resumed = 0
+        for i in list(rows):
+            previous = journal.get(row_key(rows[i]))
+            if previous is None:
+                continue
+            del rows[i]
+            previous['row_index'] = i
+            results_by_row[i] = previous
+            resumed += 1
+            if previous.get('success'):
+                successful_matches += 1
+            else:
+                failed_matches += 1
+        if resumed and not paused:
+            progress.message('info', f"♻️ {resumed} filas recuperadas del checkpoint, {len(rows)} por procesar")
+
+    # AdvancedFixtureResolver agrupa por fecha: cada fecha se descarga una vez (en paralelo).
+    # El ritmo de las llamadas lo controla el rate limiter del cliente, sin pausas fijas por fila
+    progress.update(row_offset + len(results_by_row), total_rows, "Descargando fixtures de las fechas del archivo...")
+    row_ids = list(rows)
+    match_texts = [rows[i] for i in row_ids]
+    if paused or not rows:
+        processed = iter(())
+    elif hasattr(resolver, 'process_match_texts'):
+        processed = resolver.process_match_texts(match_texts)
+    else:
+        processed = _process_one_by_one(resolver, match_texts)
+
+    unreachable = set()
+    for done, (pos, result) in enumerate(processed, len(results_by_row) + 1):
+        i = row_ids[pos]
+        match_text = rows[i]
+
+        if isinstance(result, QuotaExceededError):
+            # Cuota agotada: pausar; esta fila y las que faltan quedan pendientes
+            logger.warning(f"Cuota de la API agotada en la fila {i+1}: {result}")
+            paused = True
+            break
+
+        if isinstance(result, FetchError):
+            # La API no respondió: resultado desconocido, la fila queda pendiente para reintentar
+            logger.warning(f"Fila {i+1} pendiente, la API no respondió: {result}")
+            unreachable.add(i)
+            continue
+
+        if isinstance(result, Exception):
+            logger.error(f"Excepción en fila {i+1}: {str(result)}")
+            result = {
+                'row_index': i,
+                'success': False,
+                'error': f'Error procesando fila: {str(result)}'
+            }
+            failed_matches += 1
+        else:
+            if journal is not None:
+                journal.append(row_key(match_text), result)
+            result['row_index'] = i
+
+            if result['success']:
+                successful_matches += 1
+                team_ids = result.get('team_ids', {})
+                logger.info(f"Éxito - Local: {team_ids.get('home', {}).get('name')} (ID: {team_ids.get('home', {}).get('id')}), "
+                            f"Visitante: {team_ids.get('away', {}).get('name')} (ID: {team_ids.get('away', {}).get('id')})")
+            else:
+                failed_matches += 1
+                logger.error(f"Error en fila {i+1}: {result.get('error', 'Error desconocido')}")
+
+        results_by_row[i] = result
+        counter = f"{i+1}/{total_rows}" if total_rows else f"{i+1}"
+        progress.update(row_offset + done, total_rows, f"Procesando fila {counter}: {match_text}")
+
+    if hasattr(processed, 'close'):
+        processed.close()
+
+    # Filas sin resolver por la pausa o sin respuesta de la API: pendientes para la próxima ejecución
+    pending_rows = [i for i in rows if i not in results_by_row]
+    for i in pending_rows:
+        results_by_row[i] = {
+            'row_index': i,
+            'success': False,
+            'pending': True,
+            'error': 'Pendiente: la API no respondió' if i in unreachable else 'Pendiente: cuota de la API agotada'
+        }
+
+    # Resultados en el orden del archivo
+    results = [results_by_row[i] for i in df.index if i in results_by_row]
+
+    logger.info(f"PROCESAMIENTO COMPLETADO - Exitosos: {successful_matches}, Fallidos: {failed_matches}, "
+                f"Pendientes: {len(pending_rows)}")
+
+    return {
+        'results': results,
+        'table': result_table(results),
+        'summary': summarize(total, successful_matches, failed_matches, len(pending_rows), paused)
+    }
+
+
+def summarize(total: int, successful: int, failed: int, pending: int = 0, paused: bool = False) -> Dict:
+    return {
+        'total': total,
+        'successful': successful,
+        'failed': failed,
+        'pending': pending,
+        'paused': paused,
+        'success_rate': (successful / total * 100) if total > 0 else 0
+    }
+
+
+def quota_pause_message(pending: int) -> str:
+    return (f"⏸️ Cuota de la API agotada: {pending} filas pendientes. "
+            f"Vuelve a procesar el archivo para continuar desde el checkpoint")
+
+
+def pending_message(summary: Dict) -> Optional[str]:
+    """Aviso de filas pendientes (cuota agotada o API sin respuesta), o None si no hay"""
+    if summary['paused']:
+        return quota_pause_message(summary['pending'])
+    if summary['pending']:
+        return (f"⚠️ La API no respondió para {summary['pending']} filas pendientes. "
+                f"Vuelve a procesar el archivo para reintentarlas desde el checkpoint")
+    return None
+
+
+# Tabla de resultados: una fila por partido (índice = fila del archivo) y columnas tipadas
+RESULT_TABLE_DTYPES = {
+    'success': 'bool', 'pending': 'bool',
+    'home_id': 'Int64', 'home_name': 'string', 'home_original': 'string',
+    'away_id': 'Int64', 'away_name': 'string', 'away_original': 'string',
+    'fixture_id': 'Int64', 'league_id': 'Int64', 'league_name': 'string', 'season': 'Int64',
+    'fixture_date': 'string', 'score': 'Float64', 's_home': 'Float64', 's_away': 'Float64',
+    'error': 'string',
+}
+
+
+def result_table(results: List[Dict]) -> pd.DataFrame:
+    """
+    Tabla columnar de los resultados del resolver (sin copiar los datos originales)
+    Las salidas se arman con un solo join contra el DataFrame original por número de fila
+    """
+    columns = {column: [] for column in RESULT_TABLE_DTYPES}
+    index = []
+    for result in results:
+        success = bool(result.get('success'))
+        team_ids = result.get('team_ids') or {} if success else {}
+        home, away = team_ids.get('home') or {}, team_ids.get('away') or {}
+        fixture = result.get('fixture') or {} if success else {}
+        debug_info = result.get('debug_info') or {} if success else {}
+        match_info = result.get('match_info') or {} if success else {}
+
+        index.append(result['row_index'])
+        columns['success'].append(success)
+        columns['pending'].append(bool(result.get('pending')))
+        columns['home_id'].append(home.get('id'))
+        columns['home_name'].append(home.get('name'))
+        columns['home_original'].append(home.get('original_name'))
+        columns['away_id'].append(away.get('id'))
+        columns['away_name'].append(away.get('name'))
+        columns['away_original'].append(away.get('original_name'))
+        columns['fixture_id'].append(fixture.get('id'))
+        columns['league_id'].append(fixture.get('league_id'))
+        columns['league_name'].append(fixture.get('league_name'))
+        columns['season'].append(fixture.get('season'))
+        columns['fixture_date'].append(match_info.get('date'))
+        columns['score'].append(debug_info.get('score', 0) if success else None)
+        columns['s_home'].append(debug_info.get('s_home', 0) if success else None)
+        columns['s_away'].append(debug_info.get('s_away', 0) if success else None)
+        columns['error'].append(None if success else result.get('error'))
+
+    return pd.DataFrame({column: pd.array(values, dtype=RESULT_TABLE_DTYPES[column])
+                         for column, values in columns.items()},
+                        index=pd.Index(index, dtype='int64', name='row_index'))
+
+
+def _join_original(original: pd.DataFrame, added: pd.DataFrame) -> pd.DataFrame:
+    """Datos originales + columnas agregadas (las que ya existían se reemplazan en su lugar)"""
+    columns = list(original.columns) + [c for c in added.columns if c not in original.columns]
+    data = original.drop(columns=[c for c in added.columns if c in original.columns])
+    return data.join(added, how='inner')[columns]
+
+
+def _original_teams(table: pd.DataFrame, original: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    """Nombres originales de local y visitante: los del resolver o, si falló, los del archivo"""
+    success = table['success']
+    teams = []
+    for side, column in (('home_original', 'Local'), ('away_original', 'Visitante')):
+        fallback = original[column].reindex(table.index) if column in original.columns else 'N/A'
+        teams.append(table[side].astype(object).where(success, fallback))
+    return teams[0], teams[1]
+
+
+def _status(table: pd.DataFrame, found: str, failed: str) -> np.ndarray:
+    return np.where(table['success'], found, np.where(table['pending'], 'PENDING', failed))
+
+
+def advanced_output_frames(table: pd.DataFrame, original: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Hojas Datos_con_IDs y Mapeo_Avanzado a partir de la tabla de resultados del resolver avanzado"""
+    success = table['success']
+    added = pd.DataFrame({
+        'Local_API_ID': table['home_id'],
+        'Local_API_Name': table['home_name'].where(success, 'NOT_FOUND'),
+        'Visitante_API_ID': table['away_id'],
+        'Visitante_API_Name': table['away_name'].where(success, 'NOT_FOUND'),
+        'Fixture_ID': table['fixture_id'],
+        'Liga_ID': table['league_id'],
+        'Liga_Name': table['league_name'].where(success, 'NOT_FOUND'),
+        'Season': table['season'],
+        'Match_Status': _status(table, 'FOUND', 'NOT_FOUND'),
+        'Match_Method': 'ADVANCED_RESOLVER',
+        'Match_Score': table['score'].where(success, 0),
+        'Error': table['error'].fillna('Unknown error').where(~success),
+    }, index=table.index)
+
+    local, visitante = _original_teams(table, original)
+    mapping = pd.DataFrame({
+        'Fila': table.index + 1,
+        'Local_Original': local,
+        'Local_API_Name': added['Local_API_Name'],
+        'Local_API_ID': table['home_id'],
+        'Visitante_Original': visitante,
+        'Visitante_API_Name': added['Visitante_API_Name'],
+        'Visitante_API_ID': table['away_id'],
+        'Fixture_ID': table['fixture_id'],
+        'Liga': added['Liga_Name'],
+        'Liga_ID': table['league_id'],
+        'Season': table['season'],
+        'Match_Score': table['score'].round(4).where(success, 0),
+        'Home_Score': table['s_home'].round(3).where(success, 0),
+        'Away_Score': table['s_away'].round(3).where(success, 0),
+        'Status': _status(table, 'SUCCESS', 'FAILED'),
+        'Error': table['error'].fillna('').where(~success),
+    }, index=table.index)
+
+    return _join_original(original, added), mapping
+
+
+def fixture_output_frames(table: pd.DataFrame, original: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Hojas Datos_con_IDs y Mapeo_Fixtures a partir de la tabla de resultados de FixtureMatcher"""
+    success = table['success']
+    added = pd.DataFrame({
+        'Local_API_ID': table['home_id'],
+        'Local_API_Name': table['home_name'].where(success, 'NOT_FOUND'),
+        'Visitante_API_ID': table['away_id'],
+        'Visitante_API_Name': table['away_name'].where(success, 'NOT_FOUND'),
+        'Match_Status': _status(table, 'FOUND', 'NOT_FOUND'),
+        'Match_Method': 'FIXTURE_BASED',
+        'Error': table['error'].fillna('Unknown error').where(~success),
+    }, index=table.index)
+
+    local, visitante = _original_teams(table, original)
+    mapping = pd.DataFrame({
+        'Fila': table.index + 1,
+        'Local_Original': local,
+        'Local_API_Name': added['Local_API_Name'],
+        'Local_API_ID': table['home_id'],
+        'Visitante_Original': visitante,
+        'Visitante_API_Name': added['Visitante_API_Name'],
+        'Visitante_API_ID': table['away_id'],
+        'Fecha_Fixture': table['fixture_date'].where(success, 'N/A'),
+        'Status': _status(table, 'SUCCESS', 'FAILED'),
+        'Error': table['error'].fillna('').where(~success),
+    }, index=table.index)
+
+    return _join_original(original, added), mapping
+
+
+def summary_rows(summary: Dict, method: Optional[str] = None) -> List[Dict]:
+    """Filas de la hoja Resumen"""
+    rows = [
+        {'Métrica': 'Total de partidos', 'Valor': summary['total']},
+        {'Métrica': 'Fixtures encontrados', 'Valor': summary['successful']},
+        {'Métrica': 'Fixtures no encontrados', 'Valor': summary['failed']},
+        {'Métrica': 'Tasa de éxito', 'Valor': f"{summary['success_rate']:.1f}%"},
+    ]
+    if summary.get('pending'):
+        rows.append({'Métrica': 'Pendientes', 'Valor': summary['pending']})
+    if method:
+        rows.append({'Métrica': 'Método usado', 'Valor': method})
+    return rows
+
+
+# Formato de salida por método: hojas de salida, hoja de mapeo y etiqueta del resumen
+OUTPUT_FORMATS = {
+    'advanced': (advanced_output_frames, 'Mapeo_Avanzado', 'Advanced Resolver con Tokenización'),
+    'fixtures': (fixture_output_frames, 'Mapeo_Fixtures', None),
+}
+
+
+class CsvResultWriter:
+    """Escribe la hoja Datos_con_IDs en CSV bloque por bloque"""
+
+    def __init__(self, path: str, mapping_sheet: str, method: Optional[str] = None):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._columns = None
+
+    def write(self, data: pd.DataFrame, mapping: pd.DataFrame):
+        header = self._columns is None
+        if header:
+            self._columns = list(data.columns)
+        data.to_csv(self._file, columns=self._columns, header=header, index=False)
+        self._file.flush()
+
+    def close(self, summary: Dict):
+        if self._columns is None:
+            csv.writer(self._file).writerow([])
+        self._file.close()
+
+
+class ExcelResultWriter:
+    """Excel escrito fila por fila (xlsxwriter constant_memory): Datos_con_IDs, hoja de mapeo y Resumen"""
+
+    def __init__(self, path: str, mapping_sheet: str, method: Optional[str] = None):
+        self.path = path
+        self.method = method
+        self._workbook = StreamingWorkbook(path)
+        self._mapping_sheet_name = mapping_sheet
+        self._data_sheet = None
+        self._mapping_sheet = None
+
+    def write(self, data: pd.DataFrame, mapping: pd.DataFrame):
+        if self._data_sheet is None:
+            # Las hojas se crean en orden: Datos_con_IDs, mapeo y (al cerrar) Resumen
+            self._data_sheet = self._workbook.add_sheet('Datos_con_IDs', list(data.columns))
+            self._mapping_sheet = self._workbook.add_sheet(self._mapping_sheet_name, list(mapping.columns))
+        for row in data.itertuples(index=False, name=None):
+            self._data_sheet.append(row)
+        for row in mapping.itertuples(index=False, name=None):
+            self._mapping_sheet.append(row)
+
+    def close(self, summary: Dict):
+        if self._data_sheet is None:
+            self._data_sheet = self._workbook.add_sheet('Datos_con_IDs', [])
+        summary_sheet = self._workbook.add_sheet('Resumen', ['Métrica', 'Valor'])
+        for row in summary_rows(summary, self.method):
+            summary_sheet.append([row['Métrica'], row['Valor']])
+        self._workbook.close()
+
+
+class ParquetResultWriter:
+    """
+    Escribe la tabla Datos_con_IDs en Parquet un row group por bloque (requiere pyarrow)
+    El esquema lo fija el primer bloque: IDs como enteros con nulos, columnas del
+    CSV original como texto y columnas sin valores todavía como texto
+    """
+
+    def __init__(self, path: str, mapping_sheet: str, method: Optional[str] = None):
+        if pyarrow is None:
+            raise ValueError("La salida .parquet requiere pyarrow (pip install pyarrow)")
+        self.path = path
+        self._writer = None
+        self._columns = None
+        self._text_columns = ()
+
+    def write(self, data: pd.DataFrame, mapping: pd.DataFrame):
+        import pyarrow.parquet as pq
+
+        if self._columns is None:
+            self._columns = list(data.columns)
+            self._text_columns = [c for c in self._columns if c not in ADVANCED_DATA_COLUMNS + FIXTURE_DATA_COLUMNS]
+        table = pyarrow.Table.from_pandas(typed_frame(self._columns, data, self._text_columns), preserve_index=False)
+        if self._writer is None:
+            schema = pyarrow.schema([
+                field.with_type(pyarrow.string()) if pyarrow.types.is_null(field.type) else field
+                for field in table.schema
+            ])
+            self._writer = pq.ParquetWriter(self.path, schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+
+    def close(self, summary: Dict):
+        if self._columns is None:
+            self.write(pd.DataFrame(), pd.DataFrame())
+        self._writer.close()
+
+
+def open_result_writer(path: str, method: str = 'advanced'):
+    """Writer según la extensión de salida (.xlsx, .csv o .parquet)"""
+    _, mapping_sheet, label = OUTPUT_FORMATS[method]
+    if path.lower().endswith('.csv'):
+        return CsvResultWriter(path, mapping_sheet, label)
+    if path.lower().endswith('.parquet'):
+        return ParquetResultWriter(path, mapping_sheet, label)
+    if path.lower().endswith('.xlsx'):
+        return ExcelResultWriter(path, mapping_sheet, label)
+    raise ValueError(f"Formato de salida no soportado: {path} (usa .xlsx, .csv o .parquet)")
+
+
+def output_frames(processing_results: Dict, method: str, original: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Hojas Datos_con_IDs y de mapeo: la tabla de resultados unida al DataFrame
+    original por número de fila (resultados sin 'table', p. ej. leídos de JSON, la reconstruyen)
+    """
+    table = processing_results.get('table')
+    if table is None:
+        table = result_table(processing_results['results'])
+    return OUTPUT_FORMATS[method][0](table, original)
+
+
+def result_tables(processing_results: Dict, method: str, original: pd.DataFrame) -> Tables:
+    """Tablas de salida (Datos_con_IDs, hoja de mapeo y Resumen) para los exportadores"""
+    _, mapping_sheet, label = OUTPUT_FORMATS[method]
+    data, mapping = output_frames(processing_results, method, original)
+    summary = [[row['Métrica'], row['Valor']] for row in summary_rows(processing_results['summary'], label)]
+    return {
+        'Datos_con_IDs': (list(data.columns), data),
+        mapping_sheet: (list(mapping.columns), mapping),
+        'Resumen': (['Métrica', 'Valor'], summary),
+    }
+
+
+def export_results(processing_results: Dict, method: str, original: pd.DataFrame, fmt: str = 'xlsx') -> bytes:
+    """Resultados para descargar en el formato dado ('xlsx', 'csv', 'parquet' o 'arrow')"""
+    return export_tables(result_tables(processing_results, method, original), fmt)
+
+
+def _json_value(value):
+    """Valores de los resultados que json no serializa solo (fechas y escalares de numpy)"""
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} no es serializable a JSON")
+
+
+def results_json(processing_results: Dict) -> str:
+    """
+    JSON descargable de un procesamiento: solo 'results' y 'summary'
+    ('table' y 'original_data' son DataFrames y ya van en las hojas exportadas)
+    """
+    payload = {'results': processing_results['results'], 'summary': processing_results['summary']}
+    return json.dumps(payload, indent=2, ensure_ascii=False, default=_json_value)
+
+
+def run_batch(input_path: str, output_path: str, resolver, method: str = 'advanced',
+              chunk_size: int = DEFAULT_CHUNK_SIZE, progress: Optional[ProgressReporter] = None,
+              journal: Optional[CheckpointJournal] = None) -> Dict:
+    """
+    Resuelve un CSV completo por bloques de chunk_size filas y escribe cada bloque
+    en la salida apenas termina (la memoria no crece con el tamaño del archivo).
+    El resolver se reutiliza entre bloques, así que su cache de fechas sigue sirviendo.
+    Si la cuota se agota, los bloques restantes se escriben con sus filas pendientes
+    (o recuperadas del journal) sin llamar a la API. Retorna el resumen global
+    """
+    progress = progress or NullProgress()
+    writer = open_result_writer(output_path, method)
+    total = successful = failed = pending = 0
+    paused = False
+
+    try:
+        for chunk in pd.read_csv(input_path, chunksize=chunk_size):
+            if 'Match text' not in chunk.columns:
+                raise ValueError(f"Falta la columna requerida 'Match text' en {input_path}")
+
+            processed = resolve_dataframe(chunk, resolver, progress, row_offset=total, total_rows=0,
+                                          journal=journal, paused=paused)
+            writer.write(*output_frames(processed, method, chunk))
+
+            total += processed['summary']['total']
+            successful += processed['summary']['successful']
+            failed += processed['summary']['failed']
+            pending += processed['summary']['pending']
+            paused = paused or processed['summary']['paused']
+            logger.info(f"Bloque escrito: {total} filas procesadas")
+    finally:
+        summary = summarize(total, successful, failed, pending, paused)
+        writer.close(summary)
+        progress.update(total, total, f"Completado: {successful} exitosos, {failed} fallidos")
+        if pending_message(summary):
+            progress.message('warning', pending_message(summary))
+        progress.close()
+
+    return summary
@@ -0,0 +1,165 @@
+"""
+Exportadores de resultados: Excel, CSV, Parquet y Arrow IPC
+Todos reciben las mismas tablas {nombre: (columnas, filas)} en el orden de las
+hojas. Excel escribe todas las hojas fila por fila; los formatos columnares
+escriben la tabla principal (la primera) con las columnas de IDs como enteros con
+nulos (Int64), así se vuelven a leer sin re-parsear ni convertir tipos.
+Parquet y Arrow requieren pyarrow (opcional): sin él solo se ofrecen Excel y CSV.
+Un formato nuevo se agrega con register_exporter()
+"""
+
+import io
+import os
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+import pandas as pd
+
+from excel_stream import workbook_bytes
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# Tablas a exportar: nombre -> (columnas, filas como listas de valores o un DataFrame)
+Tables = Dict[str, Tuple[List[str], Union[Iterable[Sequence], pd.DataFrame]]]
+
+# Columnas enteras de las salidas (IDs, temporada, fila): Int64 con nulos en los formatos columnares
+INTEGER_COLUMNS = {
+    'Fila', 'Local_API_ID', 'Visitante_API_ID', 'Local_1_API_ID', 'Visitante_1_API_ID',
+    'Fixture_ID', 'Liga_ID', 'Season', 'API_Football_ID',
+}
+# Columnas de puntajes: Float64 con nulos
+FLOAT_COLUMNS = {'Match_Score', 'Confidence'}
+
+# Filas a partir de las cuales Excel deja de ser el formato sugerido (sigue disponible a pedido)
+EXCEL_DEFAULT_MAX_ROWS = int(os.getenv('EXCEL_DEFAULT_MAX_ROWS', '20000'))
+
+
+def table_rows(rows: Union[Iterable[Sequence], pd.DataFrame]) -> Iterable[Sequence]:
+    """Filas de una tabla como tuplas de valores (un DataFrame se recorre con itertuples)"""
+    if isinstance(rows, pd.DataFrame):
+        return rows.itertuples(index=False, name=None)
+    return rows
+
+
+def typed_frame(columns: List[str], rows: Union[Iterable[Sequence], pd.DataFrame],
+                text_columns: Iterable[str] = ()) -> pd.DataFrame:
+    """
+    DataFrame de una tabla con tipos estables: IDs en Int64, puntajes en Float64,
+    columnas de objetos mezclados como texto y text_columns siempre como texto
+    """
+    if isinstance(rows, pd.DataFrame):
+        df = rows.reindex(columns=columns).reset_index(drop=True).infer_objects()
+    else:
+        df = pd.DataFrame.from_records(list(rows), columns=columns).infer_objects()
+    text_columns = set(text_columns)
+    for column in df.columns:
+        if column in INTEGER_COLUMNS:
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype('Int64')
+        elif column in FLOAT_COLUMNS:
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype('Float64')
+        elif column in text_columns or df[column].dtype == object:
+            df[column] = df[column].astype('string')
+    return df
+
+
+class ResultExporter:
+    """Formato de descarga: nombre, extensión, tipo MIME y export(tables) -> bytes"""
+
+    name = ''
+    label = ''
+    extension = ''
+    mime = 'application/octet-stream'
+    requires_pyarrow = False
+
+    def export(self, tables: Tables) -> bytes:
+        raise NotImplementedError
+
+    @staticmethod
+    def main_table(tables: Tables) -> pd.DataFrame:
+        columns, rows = next(iter(tables.values()))
+        return typed_frame(columns, rows)
+
+
+class ExcelExporter(ResultExporter):
+    """Todas las tablas como hojas, escritas fila por fila (ver excel_stream.py)"""
+
+    name = 'xlsx'
+    label = 'Excel (.xlsx)'
+    extension = 'xlsx'
+    mime = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+    def export(self, tables: Tables) -> bytes:
+        def fill(workbook):
+            for sheet_name, (columns, rows) in tables.items():
+                sheet = workbook.add_sheet(sheet_name, columns)
+                for row in table_rows(rows):
+                    sheet.append(row)
+        return workbook_bytes(fill)
+
+
+class CsvExporter(ResultExporter):
+    name = 'csv'
+    label = 'CSV (.csv)'
+    extension = 'csv'
+    mime = 'text/csv'
+
+    def export(self, tables: Tables) -> bytes:
+        return self.main_table(tables).to_csv(index=False).encode('utf-8')
+
+
+class ParquetExporter(ResultExporter):
+    name = 'parquet'
+    label = 'Parquet (.parquet)'
+    extension = 'parquet'
+    requires_pyarrow = True
+
+    def export(self, tables: Tables) -> bytes:
+        output = io.BytesIO()
+        self.main_table(tables).to_parquet(output, engine='pyarrow', index=False)
+        return output.getvalue()
+
+
+class ArrowExporter(ResultExporter):
+    name = 'arrow'
+    label = 'Arrow IPC (.arrow)'
+    extension = 'arrow'
+    mime = 'application/vnd.apache.arrow.file'
+    requires_pyarrow = True
+
+    def export(self, tables: Tables) -> bytes:
+        table = pyarrow.Table.from_pandas(self.main_table(tables), preserve_index=False)
+        sink = pyarrow.BufferOutputStream()
+        with pyarrow.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+
+EXPORTERS: Dict[str, ResultExporter] = {}
+
+
+def register_exporter(exporter: ResultExporter):
+    EXPORTERS[exporter.name] = exporter
+
+
+for _exporter in (ParquetExporter(), ArrowExporter(), CsvExporter(), ExcelExporter()):
+    register_exporter(_exporter)
+
+
+def available_formats() -> List[str]:
+    """Formatos utilizables en este entorno (los que requieren pyarrow solo si está instalado)"""
+    return [name for name, exporter in EXPORTERS.items() if pyarrow is not None or not exporter.requires_pyarrow]
+
+
+def default_format(rows: int) -> str:
+    """Excel para archivos chicos; para lotes grandes un formato columnar (Excel queda a pedido)"""
+    if rows <= EXCEL_DEFAULT_MAX_ROWS:
+        return 'xlsx'
+    return available_formats()[0]
+
+
+def export_tables(tables: Tables, fmt: str) -> bytes:
+    if fmt not in available_formats():
+        raise ValueError(f"Formato no disponible: {fmt} (disponibles: {', '.join(available_formats())})")
+    return EXPORTERS[fmt].export(tables)
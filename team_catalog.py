@@ -0,0 +1,436 @@
+"""
+Catálogo de equipos de API Football con índices precalculados
+Normaliza cada nombre una sola vez para que el matching no repita regex por candidato
+"""
+
+import hashlib
+import json
+import re
+from array import array
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+# Palabras comunes que se ignoran al comparar nombres
+COMMON_WORDS = frozenset(['fc', 'cf', 'club', 'de', 'del', 'la', 'el', 'los', 'las'])
+
+# Tamaño de los n-gramas de caracteres del índice invertido
+NGRAM_SIZE = 3
+
+# Fracción mínima de n-gramas de la consulta que un candidato debe compartir
+MIN_NGRAM_OVERLAP = 0.25
+
+_NON_WORD_PAT = re.compile(r'[^\w\s]')
+_SPACES_PAT = re.compile(r'\s+')
+
+
+def normalize_team_name(name: str) -> str:
+    """Normaliza el nombre del equipo"""
+    if not name:
+        return ""
+
+    normalized = name.lower().strip()
+    normalized = _NON_WORD_PAT.sub('', normalized)
+    normalized = _SPACES_PAT.sub(' ', normalized)
+
+    words = normalized.split()
+    filtered_words = [w for w in words if w not in COMMON_WORDS]
+
+    return ' '.join(filtered_words) if filtered_words else normalized
+
+
+def char_ngrams(text: str, size: int = NGRAM_SIZE) -> frozenset:
+    """N-gramas de caracteres con un espacio de relleno en cada extremo"""
+    padded = f" {text} "
+    if len(padded) <= size:
+        return frozenset([padded])
+    return frozenset(padded[i:i + size] for i in range(len(padded) - size + 1))
+
+
+# Campos de cada equipo guardados como columnas paralelas
+TEAM_FIELDS = ('id', 'name', 'code', 'country', 'founded', 'logo', 'national')
+
+# Los logos de API Football siguen este patrón; solo se guardan los que no lo siguen
+LOGO_TEMPLATE = "https://media.api-sports.io/football/teams/{id}.png"
+
+_MISSING = object()
+_TEMPLATE_LOGO = object()  # marcador: el logo coincide con LOGO_TEMPLATE
+
+
+class _IntColumn:
+    """Columna de enteros en un array compacto; los valores no enteros se guardan aparte"""
+
+    __slots__ = ('values', 'others')
+
+    def __init__(self):
+        self.values = array('q')
+        self.others: Dict[int, object] = {}
+
+    def append(self, value):
+        if type(value) is int and -2 ** 63 <= value < 2 ** 63:
+            self.values.append(value)
+        else:
+            self.others[len(self.values)] = value
+            self.values.append(0)
+
+    def __getitem__(self, idx: int):
+        if idx in self.others:
+            return self.others[idx]
+        return self.values[idx]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class _InternedColumn:
+    """Columna de pocos valores distintos: cada valor se guarda una vez y las filas con un código"""
+
+    __slots__ = ('codes', 'uniques', '_ids')
+
+    def __init__(self):
+        self.codes = array('i')
+        self.uniques: List = []
+        self._ids: Dict = {}
+
+    def append(self, value):
+        try:
+            code = self._ids.setdefault(value, len(self._ids))
+        except TypeError:  # valor no hasheable: se guarda sin compartir
+            code = len(self._ids)
+            self._ids[object()] = code
+        if code == len(self.uniques):
+            self.uniques.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, idx: int):
+        return self.uniques[self.codes[idx]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class TeamRow(Mapping):
+    """Vista de solo lectura de un equipo del catálogo, sin un dict por equipo"""
+
+    __slots__ = ('_catalog', '_idx')
+
+    def __init__(self, catalog: 'TeamCatalog', idx: int):
+        self._catalog = catalog
+        self._idx = idx
+
+    def __getitem__(self, key):
+        value = self._catalog._value(self._idx, key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = self._catalog._value(self._idx, key)
+        return default if value is _MISSING else value
+
+    def __contains__(self, key) -> bool:
+        return self._catalog._value(self._idx, key) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._catalog._row_keys(self._idx))
+
+    def __len__(self) -> int:
+        return len(self._catalog._row_keys(self._idx))
+
+    def to_dict(self) -> Dict:
+        return {key: self[key] for key in self}
+
+    def __repr__(self) -> str:
+        return f"TeamRow({self.to_dict()!r})"
+
+
+class _TeamRows(Sequence):
+    """Secuencia de filas del catálogo (se crean al acceder)"""
+
+    __slots__ = ('_catalog',)
+
+    def __init__(self, catalog: 'TeamCatalog'):
+        self._catalog = catalog
+
+    def __len__(self) -> int:
+        return len(self._catalog.ids)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [TeamRow(self._catalog, i) for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(idx)
+        return TeamRow(self._catalog, idx)
+
+
+def _source_fingerprint(api_teams: List[Dict]) -> tuple:
+    """Identidad, tamaño y hash de los IDs de una lista de equipos"""
+    return id(api_teams), len(api_teams), hash(tuple(team.get('id') for team in api_teams))
+
+
+class TeamCatalog:
+    """
+    Catálogo de equipos en formato columnar con nombre normalizado, tokens y hash de búsqueda exacta
+    Cada campo es una lista paralela; los países se guardan una sola vez (códigos enteros)
+    y los logos con el patrón de API Football no se guardan. catalog.teams[i] es una vista
+    TeamRow con la misma interfaz de lectura que el dict original
+    """
+
+    def __init__(self, api_teams: Iterable[Dict]):
+        # Huella de la lista original para reconocerla en get_catalog sin mantenerla viva
+        self._source_fingerprint = _source_fingerprint(api_teams) if isinstance(api_teams, list) else None
+        self.ids = _IntColumn()
+        self.names: List = []
+        self.codes = _InternedColumn()
+        self.countries = _InternedColumn()
+        self.founded = _IntColumn()
+        self.logos: List = []
+        self.national = _InternedColumn()
+        self.normalized: List[str] = []
+        self.by_normalized: Dict[str, int] = {}  # nombre normalizado -> primer índice
+        self._tokens: Optional[List[frozenset]] = None
+        self._normalize_cache: Dict[str, str] = {}
+        self._keys: List[tuple] = []  # claves presentes en cada equipo (tuplas compartidas)
+        self._extras: Dict[int, Dict] = {}  # campos fuera de TEAM_FIELDS, solo si existen
+        # Estructuras vectorizadas, construidas bajo demanda
+        self._gram_ids: Optional[Dict[str, int]] = None
+        self._char_counts: Optional[np.ndarray] = None
+        self._by_id: Optional[Dict] = None
+        self._version: Optional[str] = None
+        # Oponente normalizado -> país, compartido por todos los equipos de una carga
+        self.opponent_countries: Dict[str, Optional[str]] = {}
+
+        key_tuples: Dict[tuple, tuple] = {}
+        for idx, team in enumerate(api_teams):
+            keys = tuple(team)
+            self._keys.append(key_tuples.setdefault(keys, keys))
+            extras = {key: team[key] for key in keys if key not in TEAM_FIELDS}
+            if extras:
+                self._extras[idx] = extras
+
+            team_id = team.get('id')
+            logo = team.get('logo', _MISSING)
+            if isinstance(logo, str) and logo == LOGO_TEMPLATE.format(id=team_id):
+                logo = _TEMPLATE_LOGO
+            self.ids.append(team_id)
+            self.names.append(team.get('name', _MISSING))
+            self.codes.append(team.get('code', _MISSING))
+            self.founded.append(team.get('founded', _MISSING))
+            self.logos.append(logo)
+            self.national.append(team.get('national', _MISSING))
+            self.countries.append(team.get('country', ''))
+
+            norm = normalize_team_name(team.get('name', ''))
+            self.normalized.append(norm)
+            # Conservar el primer equipo, igual que el recorrido lineal original
+            self.by_normalized.setdefault(norm, idx)
+
+        self.teams = _TeamRows(self)
+
+    def _value(self, idx: int, key):
+        """Valor de un campo del equipo idx (_MISSING si el equipo no lo tiene)"""
+        if key == 'id':
+            return self.ids[idx] if 'id' in self._keys[idx] else _MISSING
+        if key == 'name':
+            return self.names[idx]
+        if key == 'country':
+            return self.countries[idx] if key in self._keys[idx] else _MISSING
+        if key == 'code':
+            return self.codes[idx]
+        if key == 'logo':
+            logo = self.logos[idx]
+            return LOGO_TEMPLATE.format(id=self.ids[idx]) if logo is _TEMPLATE_LOGO else logo
+        if key == 'founded':
+            return self.founded[idx]
+        if key == 'national':
+            return self.national[idx]
+        return self._extras.get(idx, {}).get(key, _MISSING)
+
+    @property
+    def tokens(self) -> List[frozenset]:
+        """Tokens del nombre normalizado de cada equipo (calculados bajo demanda)"""
+        if self._tokens is None:
+            self._tokens = [frozenset(norm.split()) for norm in self.normalized]
+        return self._tokens
+
+    @property
+    def country_values(self) -> List:
+        """Países distintos del catálogo, en orden de aparición"""
+        return self.countries.uniques
+
+    @property
+    def country_codes(self) -> np.ndarray:
+        """Código entero del país de cada equipo (índice en country_values)"""
+        return np.frombuffer(self.countries.codes, dtype=np.int32) if len(self) else np.zeros(0, dtype=np.int32)
+
+    def _row_keys(self, idx: int) -> tuple:
+        return self._keys[idx]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[TeamRow]:
+        return iter(self.teams)
+
+    def __getitem__(self, idx):
+        return self.teams[idx]
+
+    def team_dict(self, idx: int) -> Dict:
+        """Copia del equipo idx como dict (para resultados y serialización)"""
+        return self.teams[idx].to_dict()
+
+    def matches_source(self, api_teams) -> bool:
+        """Indica si el catálogo se construyó a partir de esta misma lista (identidad, tamaño e IDs)"""
+        return (self._source_fingerprint is not None and isinstance(api_teams, list)
+                and self._source_fingerprint == _source_fingerprint(api_teams))
+
+    @property
+    def version(self) -> str:
+        """Hash del contenido del catálogo (cambia si cambia cualquier equipo)"""
+        if self._version is None:
+            payload = json.dumps([row.to_dict() for row in self.teams], sort_keys=True,
+                                 ensure_ascii=False, default=str)
+            self._version = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+        return self._version
+
+    def normalize(self, name: str) -> str:
+        """Normaliza un nombre externo memorizando el resultado"""
+        if not name:
+            return normalize_team_name(name)
+
+        normalized = self._normalize_cache.get(name)
+        if normalized is None:
+            normalized = normalize_team_name(name)
+            self._normalize_cache[name] = normalized
+        return normalized
+
+    def index_of(self, normalized_name: str) -> Optional[int]:
+        """Índice del primer equipo cuyo nombre normalizado coincide exactamente"""
+        return self.by_normalized.get(normalized_name)
+
+    def index_of_id(self, team_id) -> Optional[int]:
+        """Índice del primer equipo con ese ID de API Football"""
+        if self._by_id is None:
+            self._by_id = {}
+            for idx, value in enumerate(self.ids):
+                self._by_id.setdefault(value, idx)
+        return self._by_id.get(team_id)
+
+    def lookup(self, name: str) -> Optional[Dict]:
+        """Busca un equipo por nombre (normalizado) en O(1)"""
+        idx = self.index_of(self.normalize(name))
+        return self.teams[idx] if idx is not None else None
+
+    def _build_ngram_index(self):
+        """Índice invertido n-grama -> equipos en formato CSR (arrays de NumPy)"""
+        gram_ids: Dict[str, int] = {}
+        team_grams: List[List[int]] = []
+        for norm in self.normalized:
+            team_grams.append([gram_ids.setdefault(gram, len(gram_ids)) for gram in char_ngrams(norm)])
+
+        lengths = np.fromiter((len(grams) for grams in team_grams), dtype=np.int64, count=len(team_grams))
+        flat_grams = np.fromiter((g for grams in team_grams for g in grams), dtype=np.int64, count=int(lengths.sum()))
+        flat_teams = np.repeat(np.arange(len(team_grams), dtype=np.int64), lengths)
+
+        # Ordenar por n-grama (estable, así cada posting queda en orden de catálogo)
+        order = np.argsort(flat_grams, kind='stable')
+        self._gram_ids = gram_ids
+        self._postings = flat_teams[order]
+        self._postings_indptr = np.zeros(len(gram_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(flat_grams, minlength=len(gram_ids)), out=self._postings_indptr[1:])
+        self._ngram_counts = lengths
+
+    def candidate_indices_many(self, normalized_names: List[str], min_overlap: float = MIN_NGRAM_OVERLAP) -> List[np.ndarray]:
+        """
+        Preselecciona, para cada nombre, los equipos que comparten suficientes n-gramas
+        Equivale al producto disperso consulta x n-grama x equipo, resuelto con NumPy
+        La fracción se mide sobre el nombre más corto para no perder abreviaturas
+        Devuelve los índices en el orden del catálogo para conservar los desempates
+        """
+        if self._gram_ids is None:
+            self._build_ngram_index()
+
+        n_teams = len(self.teams)
+        query_ids, posting_starts, posting_ends, query_sizes = [], [], [], []
+        for q, name in enumerate(normalized_names):
+            grams = char_ngrams(name)
+            query_sizes.append(len(grams))
+            for gram in grams:
+                gram_id = self._gram_ids.get(gram)
+                if gram_id is not None:
+                    query_ids.append(q)
+                    posting_starts.append(self._postings_indptr[gram_id])
+                    posting_ends.append(self._postings_indptr[gram_id + 1])
+
+        shortlists = [np.arange(n_teams) if not name else np.empty(0, dtype=np.int64)
+                      for name in normalized_names]
+        if not query_ids:
+            return shortlists
+
+        # Reunir todas las postings de golpe: (consulta, equipo) por cada n-grama compartido
+        starts = np.asarray(posting_starts, dtype=np.int64)
+        sizes = np.asarray(posting_ends, dtype=np.int64) - starts
+        offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(sizes)[:-1])), sizes)
+        teams = self._postings[np.arange(int(sizes.sum()), dtype=np.int64) + offsets]
+        queries = np.repeat(np.asarray(query_ids, dtype=np.int64), sizes)
+
+        keys, shared = np.unique(queries * n_teams + teams, return_counts=True)
+        key_queries, key_teams = np.divmod(keys, n_teams)
+
+        query_sizes = np.asarray(query_sizes, dtype=np.int64)
+        smaller = np.minimum(query_sizes[key_queries], self._ngram_counts[key_teams])
+        required = np.maximum(1, np.ceil(min_overlap * smaller))
+        keep = shared >= required
+        key_queries, key_teams = key_queries[keep], key_teams[keep]
+
+        bounds = np.searchsorted(key_queries, np.arange(len(normalized_names) + 1))
+        for q, name in enumerate(normalized_names):
+            if name:
+                shortlists[q] = key_teams[bounds[q]:bounds[q + 1]]
+        return shortlists
+
+    def candidate_indices(self, normalized_name: str, min_overlap: float = MIN_NGRAM_OVERLAP) -> List[int]:
+        """Preselección por n-gramas para un solo nombre"""
+        return self.candidate_indices_many([normalized_name], min_overlap)[0].tolist()
+
+    def _build_char_counts(self):
+        """Matriz equipos x caracteres con el conteo de cada carácter del nombre normalizado"""
+        char_ids: Dict[str, int] = {}
+        rows, cols, values = [], [], []
+        for idx, norm in enumerate(self.normalized):
+            for char, count in Counter(norm).items():
+                rows.append(idx)
+                cols.append(char_ids.setdefault(char, len(char_ids)))
+                values.append(count)
+
+        counts = np.zeros((len(self), len(char_ids)), dtype=np.int32)
+        counts[rows, cols] = values
+        self._char_ids = char_ids
+        self._char_counts = counts
+        self._name_lengths = np.fromiter((len(n) for n in self.normalized), dtype=np.int64, count=len(self.normalized))
+
+    def similarity_upper_bounds(self, normalized_name: str):
+        """
+        Cota superior vectorizada de SequenceMatcher.ratio() contra todo el catálogo
+        Usa la intersección de multiconjuntos de caracteres (como quick_ratio)
+        Devuelve (cotas, contención_posible): la segunda indica si uno de los dos
+        nombres puede estar contenido en el otro
+        """
+        if self._char_counts is None:
+            self._build_char_counts()
+
+        common = np.zeros(len(self.teams), dtype=np.int64)
+        for char, count in Counter(normalized_name).items():
+            col = self._char_ids.get(char)
+            if col is not None:
+                common += np.minimum(self._char_counts[:, col], count)
+
+        total = len(normalized_name) + self._name_lengths
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bounds = np.where(total > 0, 2.0 * common / total, 1.0)
+        containable = (common == len(normalized_name)) | (common == self._name_lengths)
+        return bounds, containable
@@ -0,0 +1,117 @@
+"""
+Script de prueba del cliente de API Football contra un servidor HTTP local
+(sin usar la API real ni consumir cuota)
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from api_client import ApiFootballClient, RateLimiter
+from app import obtener_equipos_desde_api
+
+LATENCY = 0.2  # segundos de respuesta simulados por liga
+
+
+class FakeApiFootball(BaseHTTPRequestHandler):
+    """Responde /teams?league=N con tres equipos por liga (la liga 500 falla)"""
+
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        try:
+            time.sleep(LATENCY)
+            url = urlparse(self.path)
+            league = int(parse_qs(url.query)['league'][0])
+            if league == 500:
+                self.send_response(500)
+                self.end_headers()
+                return
+
+            body = json.dumps({"response": [
+                {"team": {"id": league * 100 + i, "name": f"Equipo {league}-{i}", "code": "EQU",
+                          "country": f"Pais {league}", "logo": ""}}
+                for i in range(3)
+            ]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fake_api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeApiFootball)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    FakeApiFootball.max_active = 0
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_descarga_concurrente_de_ligas(fake_api):
+    """Nueve ligas en paralelo: tarda ~3 rondas de latencia, no nueve, y respeta el orden"""
+    leagues = [39, 140, 61, 78, 135, 262, 253, 71, 128]
+    client = ApiFootballClient({"x-apisports-key": "test"}, base_url=fake_api, max_concurrency=3)
+
+    start = time.perf_counter()
+    catalog = obtener_equipos_desde_api("test", leagues, client=client)
+    elapsed = time.perf_counter() - start
+
+    assert [team["id"] for team in catalog] == [league * 100 + i for league in leagues for i in range(3)]
+    assert FakeApiFootball.max_active <= 3
+    assert elapsed < len(leagues) * LATENCY
+    print(f"{len(leagues)} ligas en {elapsed:.2f}s (serial: ≥{len(leagues) * (LATENCY + 0.5):.1f}s)")
+
+
+def test_liga_con_error_no_detiene_el_resto(fake_api):
+    client = ApiFootballClient({"x-apisports-key": "test"}, base_url=fake_api)
+    catalog = obtener_equipos_desde_api("test", [500, 39], client=client)
+    assert [team["id"] for team in catalog] == [3900, 3901, 3902]
+
+
+def test_solicitudes_identicas_comparten_respuesta(fake_api):
+    """Seis hilos piden lo mismo a la vez: una sola solicitud llega al servidor"""
+    client = ApiFootballClient({"x-apisports-key": "test"}, base_url=fake_api, max_concurrency=6)
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        responses = list(executor.map(lambda _: client.get("/teams", {"league": 39}), range(6)))
+
+    assert FakeApiFootball.max_active == 1
+    assert all(r.json() == responses[0].json() for r in responses)
+
+
+def test_rate_limiter_token_bucket():
+    """Ráfaga hasta la capacidad y luego una solicitud cada 60/cuota segundos"""
+    now = [0.0]
+    limiter = RateLimiter(requests_per_minute=6, capacity=2, clock=lambda: now[0],
+                          sleep=lambda s: now.__setitem__(0, now[0] + s))
+
+    assert limiter.acquire() == 0 and limiter.acquire() == 0
+    assert not limiter.try_acquire()
+    assert limiter.acquire() == pytest.approx(10.0)
+    now[0] += 25
+    assert limiter.try_acquire() and limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,124 @@
+"""
+Script de prueba del resolver asyncio contra el servidor local (sin cuota)
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+from dateutil import tz
+
+from api_client import ApiFootballClient, RateLimiter
+from async_fixture_resolver import AsyncFixtureResolver
+from fake_api_football import FakeApiFootball, fixtures_from_csv, make_fixture
+from h2h_cache import H2HCache
+from test_batch_resolver import make_resolver
+
+
+def make_async_resolver(base_url: str, max_concurrency: int = 4) -> AsyncFixtureResolver:
+    resolver = AsyncFixtureResolver("test-key", max_concurrency=max_concurrency)
+    resolver.client = ApiFootballClient(resolver.headers, base_url=base_url, max_concurrency=max_concurrency,
+                                        rate_limiter=RateLimiter(requests_per_minute=60000))
+    resolver.h2h_cache = H2HCache(os.path.join(tempfile.mkdtemp(), "h2h.db"))
+    return resolver
+
+
+def test_mismo_resultado_que_el_resolver_sincrono():
+    """Mismos resultados en el mismo orden y cada fecha se pide una sola vez"""
+    texts = list(pd.read_csv("tashist.csv")["Match text"][:60]) + ["texto sin formato"]
+    with FakeApiFootball(fixtures_from_csv("tashist.csv"), latency=0.02) as api:
+        start = time.perf_counter()
+        results = make_async_resolver(api.base_url).resolve_many(texts)
+        elapsed = time.perf_counter() - start
+        assert len(api.hits) == len(set(api.hits))
+
+        expected = make_resolver(api.base_url)
+        assert results == [expected.process_match_text(t) for t in texts]
+    print(f"{len(texts)} filas en {elapsed:.2f}s con {len(set(api.hits))} solicitudes")
+
+
+def _h2h_setup():
+    """Tres candidatos empatados: el primero no jugó ese día, el segundo y el tercero sí"""
+    cdmx = tz.gettz("America/Mexico_City")
+    day = datetime(2025, 4, 5, 17, 0, tzinfo=cdmx)
+    pairs = [((1, "Uno"), (2, "Dos")), ((3, "Tres"), (4, "Cuatro")), ((5, "Cinco"), (6, "Seis"))]
+    fixtures = [
+        make_fixture(10, day - timedelta(days=30), *pairs[0]),
+        make_fixture(11, day, *pairs[1]),
+        make_fixture(12, day, *pairs[2]),
+    ]
+    candidates = [{"score": 1.0, "fixture": make_fixture(20 + i, day, *pair)} for i, pair in enumerate(pairs)]
+    return fixtures, candidates, day
+
+
+def test_h2h_concurrente_respeta_el_orden():
+    fixtures, candidates, day = _h2h_setup()
+    with FakeApiFootball(fixtures, latency=0.1) as api:
+        resolver = make_async_resolver(api.base_url)
+        start = time.perf_counter()
+        best = asyncio.run(resolver._break_tie_with_h2h_async(candidates, day))
+        elapsed = time.perf_counter() - start
+
+        assert best is candidates[1]
+        assert make_resolver(api.base_url)._break_tie_with_h2h(candidates, day) is candidates[1]
+    assert elapsed < 3 * 0.1
+
+
+def test_h2h_cancela_al_confirmar():
+    """Con un solo cupo, al confirmarse el primero los demás ya no llegan a la API"""
+    fixtures, candidates, day = _h2h_setup()
+    candidates = [candidates[1], candidates[0], candidates[2]]
+    with FakeApiFootball(fixtures, latency=0.05) as api:
+        best = asyncio.run(make_async_resolver(api.base_url, max_concurrency=1)
+                           ._break_tie_with_h2h_async(candidates, day))
+    assert best is candidates[0]
+    assert len(api.hits) == 1
+
+
+def test_cache_h2h_fuera_del_event_loop():
+    """Las consultas y escrituras de la caché H2H (SQLite) no bloquean el event loop"""
+    fixtures, candidates, day = _h2h_setup()
+    loop_threads = []
+    cache_threads = []
+
+    class RecordingCache(H2HCache):
+        def played_on(self, *args):
+            cache_threads.append(threading.get_ident())
+            return super().played_on(*args)
+
+        def merge(self, *args):
+            cache_threads.append(threading.get_ident())
+            return super().merge(*args)
+
+    async def break_tie(resolver):
+        loop_threads.append(threading.get_ident())
+        return await resolver._break_tie_with_h2h_async(candidates, day)
+
+    with FakeApiFootball(fixtures) as api:
+        resolver = make_async_resolver(api.base_url)
+        resolver.h2h_cache = RecordingCache(os.path.join(tempfile.mkdtemp(), "h2h.db"))
+        assert asyncio.run(break_tie(resolver)) is candidates[1]
+        assert asyncio.run(break_tie(resolver)) is candidates[1]
+    assert cache_threads and loop_threads[0] not in cache_threads and loop_threads[1] not in cache_threads
+
+
+def test_29_de_febrero_sin_anio_anterior():
+    """El 29 de febrero no tiene fecha equivalente un año antes: solo se consulta esa fecha"""
+    leap_day = datetime(2024, 2, 29, 19, 0)
+    with FakeApiFootball([]) as api:
+        result = asyncio.run(make_async_resolver(api.base_url).resolve_fixture_ids_async(leap_day, "América", "Toluca"))
+        assert result == {"status": "not_found", "reason": "no_fixtures_for_date"}
+        assert make_resolver(api.base_url).resolve_fixture_ids(leap_day, "América", "Toluca") == result
+        assert all("2023" not in hit for hit in api.hits)
+
+
+if __name__ == "__main__":
+    test_mismo_resultado_que_el_resolver_sincrono()
+    test_h2h_concurrente_respeta_el_orden()
+    test_h2h_cancela_al_confirmar()
+    test_cache_h2h_fuera_del_event_loop()
+    test_29_de_febrero_sin_anio_anterior()
@@ -0,0 +1,115 @@
+"""
+Script de prueba de la resolución por lotes agrupada por fecha (servidor local, sin cuota)
+"""
+
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from advanced_fixture_resolver import AdvancedFixtureResolver
+from api_client import ApiFootballClient, RateLimiter
+from checkpoint import CheckpointJournal
+from fake_api_football import FakeApiFootball, fixtures_from_csv, make_fixture
+from h2h_cache import H2HCache
+
+
+def make_resolver(base_url: str) -> AdvancedFixtureResolver:
+    """Resolver apuntando al servidor local, sin caché HTTP en disco y con cuota amplia"""
+    resolver = AdvancedFixtureResolver("test-key")
+    resolver.client = ApiFootballClient(resolver.headers, base_url=base_url,
+                                        rate_limiter=RateLimiter(requests_per_minute=60000))
+    resolver.h2h_cache = H2HCache(os.path.join(tempfile.mkdtemp(), "h2h.db"))
+    return resolver
+
+
+def test_csv_agrupado_por_fecha():
+    """Cada fecha se pide una sola vez y no hay pausas fijas por fila"""
+    from app_advanced import process_csv_with_advanced_resolver
+
+    df = pd.read_csv("tashist.csv")
+    with FakeApiFootball(fixtures_from_csv("tashist.csv"), latency=0.05) as api:
+        start = time.perf_counter()
+        output = process_csv_with_advanced_resolver(df, "test-key", resolver=make_resolver(api.base_url),
+                                                    journal=CheckpointJournal(os.path.join(tempfile.mkdtemp(), "j.jsonl")))
+        elapsed = time.perf_counter() - start
+
+    # Año actual sin fixtures + año anterior: dos solicitudes por fecha distinta
+    dates = {fecha.split()[0] for fecha in df["Fecha"]}
+    assert len(api.hits) == 2 * len(dates) == len(set(api.hits))
+
+    results = output["results"]
+    assert [r["row_index"] for r in results] == list(df.index)
+    ok = [r for r in results if r["success"]]
+    assert len(ok) == len(df)
+    for result, (_, row) in zip(results, df.iterrows()):
+        assert result["team_ids"]["home"]["name"] == row["Local"]
+        assert result["team_ids"]["away"]["name"] == row["Visitante"]
+    print(f"{len(df)} filas, {len(dates)} fechas, {len(api.hits)} solicitudes en {elapsed:.2f}s")
+    assert elapsed < 0.8 * len(df) / 10
+
+
+def test_lote_igual_que_fila_por_fila():
+    texts = list(pd.read_csv("tashist.csv")["Match text"][:40]) + ["texto sin formato"]
+    with FakeApiFootball(fixtures_from_csv("tashist.csv")) as api:
+        batch = dict(make_resolver(api.base_url).process_match_texts(texts))
+        one_by_one = make_resolver(api.base_url)
+        assert [batch[pos] for pos in range(len(texts))] == [one_by_one.process_match_text(t) for t in texts]
+
+
+def test_indice_preparado_por_fecha():
+    """La ventana por bisect coincide con recorrer todos los fixtures y el índice se construye una vez"""
+    from datetime import datetime, timedelta
+    from dateutil import tz
+
+    cdmx = tz.gettz("America/Mexico_City")
+    base = datetime(2025, 4, 5, 17, 0, tzinfo=cdmx)
+    clubs = ["Pachuca", "Toluca", "Chelsea", "Santos", "Lyon", "Sevilla", "Getafe", "Fulham"]
+    fixtures = [
+        make_fixture(i, base + timedelta(minutes=offset), (i, clubs[i]), (i + 100, f"Rival {clubs[i]}"), league, name)
+        for i, (offset, league, name) in enumerate([
+            (0, 262, "Liga MX"), (-91, 262, "Liga MX"), (90, 39, "Premier League"), (30, 262, "Liga MX U20"),
+            (-30, 999, "Otra liga"), (45, 140, "La Liga"), (-90, 140, "La Liga"), (200, 39, "Premier League"),
+        ])
+    ]
+    fixtures[5]["fixture"]["date"] = (base + timedelta(minutes=45)).astimezone(tz.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    resolver = AdvancedFixtureResolver("test-key")
+    resolver.cache["2025-04-05"] = fixtures
+    day = resolver._fixtures_by_date(base)
+    assert resolver._fixtures_by_date(base) is day and len(day) == len(fixtures)
+
+    window = [(day.positions[i], mins) for i, mins in day.in_window(base.timestamp(), 90)]
+    assert window == [(0, 0), (2, 90), (5, 45), (6, 90)]
+    assert resolver.resolve_fixture_ids(base, "Sevilla", "Rival Sevilla")["fixture_id"] == 5
+
+def test_indice_invertido_de_tokens():
+    """Solo se puntúan los fixtures que comparten tokens; sin coincidencias se recorre la ventana"""
+    resolver = AdvancedFixtureResolver("test-key")
+    fixtures = fixtures_from_csv("tashist.csv")
+    day = resolver._prepared_day("todas", fixtures)
+    target = day.kickoffs[len(day.kickoffs) // 2]
+    wide = 10 ** 7
+
+    local = set(resolver._tokenize(resolver._norm_name("Cruz Azul")))
+    visita = set(resolver._tokenize(resolver._norm_name("Pumas")))
+    shortlist = day.candidates(local, visita, target, wide)
+    assert 0 < len(shortlist) < len(day.in_window(target, wide))
+    for i, _ in shortlist:
+        assert (day._token_keys(day.home_tokens[i]) & day._token_keys(local) or
+                day._token_keys(day.away_tokens[i]) & day._token_keys(visita))
+
+    # Prefijo de 4 letras: "atlet" encuentra "atletico"
+    atletico = {"atlet"}
+    assert any("atletico" in day.home_norm[i] + day.away_norm[i]
+               for i, _ in day.candidates(atletico, atletico, target, wide))
+
+    # Sin tokens en común: se usa la ventana completa
+    assert day.candidates({"zzzz"}, {"yyyy"}, target, 60) == day.in_window(target, 60)
+
+if __name__ == "__main__":
+    test_csv_agrupado_por_fecha()
+    test_lote_igual_que_fila_por_fila()
+    test_indice_preparado_por_fecha()
+    test_indice_invertido_de_tokens()
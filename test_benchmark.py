@@ -0,0 +1,57 @@
+"""
+Script de prueba del benchmark con tamaños mínimos: datos sintéticos reproducibles,
+JSON con todos los casos y comparación contra otra ejecución
+"""
+
+import json
+import os
+import tempfile
+
+import benchmark
+from benchmark import compare_results, synthetic_catalog, synthetic_fixture_day
+
+
+def test_datos_sinteticos_reproducibles():
+    teams = synthetic_catalog(500, seed=3)
+    assert teams == synthetic_catalog(500, seed=3) != synthetic_catalog(500, seed=4)
+    assert len({team['name'] for team in teams}) == len({team['id'] for team in teams}) == 500
+
+    fixtures = synthetic_fixture_day(200)
+    assert len({fx['fixture']['id'] for fx in fixtures}) == 200
+    assert all(fx['fixture']['date'].startswith('2024-03-16') for fx in fixtures)
+
+
+def test_json_y_comparacion():
+    directory = tempfile.mkdtemp()
+    base_path, current_path = os.path.join(directory, "base.json"), os.path.join(directory, "actual.json")
+    args = ['--teams', '300', '--fixtures', '40', '--rows', '50', '--queries', '20', '--repeat', '1']
+
+    assert benchmark.main(args + ['-o', base_path]) == 0
+    with open(base_path, encoding='utf-8') as f:
+        report = json.load(f)
+
+    names = {case['name'] for case in report['results']}
+    assert names >= {'find_best_match', 'resolve_fixture_ids', 'find_matching_fixture',
+                     'crear_excel_con_ids', 'export_results'}
+    assert {'commit', 'python', 'seed'} <= set(report['meta'])
+    for case in report['results']:
+        assert case['seconds']['min'] <= case['seconds']['median'] and case['calls'] > 0
+        assert case.get('hits', case.get('bytes')) > 0, case['key']
+
+    # Una ejecución "más lenta" hace fallar --max-regression
+    for case in report['results']:
+        case['seconds']['median'] /= 100
+    with open(base_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f)
+    assert benchmark.main(args + ['--only', 'export', '-o', current_path, '--compare', base_path,
+                                  '--max-regression', '2']) == 1
+
+    with open(current_path, encoding='utf-8') as f:
+        comparison = compare_results(report, json.load(f))
+    assert comparison and {row['key'] for row in comparison} <= {case['key'] for case in report['results']}
+    assert all(row['ratio'] > 2 for row in comparison)
+
+
+if __name__ == "__main__":
+    test_datos_sinteticos_reproducibles()
+    test_json_y_comparacion()
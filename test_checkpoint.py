@@ -0,0 +1,148 @@
+"""
+Script de prueba del checkpoint y la pausa por cuota agotada (servidor local)
+"""
+
+import os
+import tempfile
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from api_client import QuotaExceededError
+from checkpoint import CheckpointJournal, row_key
+from fake_api_football import FakeApiFootball, fixtures_from_csv
+from resolver_pipeline import resolve_dataframe, run_batch
+from test_batch_resolver import make_resolver
+
+
+def _requested_dates(hits):
+    return {parse_qs(urlparse(hit).query)["date"][0] for hit in hits if urlparse(hit).path == "/fixtures"}
+
+
+def _outcome(results):
+    return [(r["row_index"], r["success"], r.get("team_ids")) for r in results]
+
+
+def test_pausa_y_reanuda():
+    """Con la cuota agotada se pausa sin marcar filas como fallidas; al reanudar solo se piden las pendientes"""
+    df = pd.read_csv("tashist.csv")[:60]
+    journal = CheckpointJournal(os.path.join(tempfile.mkdtemp(), "advanced.jsonl"))
+
+    with FakeApiFootball(fixtures_from_csv("tashist.csv"), quota=15) as api:
+        first = resolve_dataframe(df, make_resolver(api.base_url), journal=journal)
+        summary = first["summary"]
+        assert summary["paused"] and summary["pending"] > 0
+        assert summary["failed"] == 0
+        assert summary["successful"] + summary["pending"] == len(df) == len(first["results"])
+        assert len(journal) == summary["successful"]
+
+        pending_texts = [df.loc[r["row_index"], "Match text"] for r in first["results"] if r.get("pending")]
+        resolver = make_resolver(api.base_url)
+        pending_dates = set()
+        for text in pending_texts:
+            day = resolver.parse_match_text(text)["fecha_hora_cdmx"]
+            pending_dates |= {day.strftime("%Y-%m-%d"), resolver._previous_year(day).strftime("%Y-%m-%d")}
+
+        api.quota = None
+        del api.hits[:]
+        resumed = resolve_dataframe(df, resolver, journal=journal)
+        assert _requested_dates(api.hits) <= pending_dates
+        assert not resumed["summary"]["paused"] and resumed["summary"]["pending"] == 0
+
+        uninterrupted = resolve_dataframe(df, make_resolver(api.base_url))
+    assert _outcome(resumed["results"]) == _outcome(uninterrupted["results"])
+    assert len(journal) == len(df)
+
+
+def test_run_batch_pausado_escribe_pendientes():
+    """El archivo de salida incluye las filas pendientes y el resumen indica la pausa"""
+    tmp = tempfile.mkdtemp()
+    input_path = os.path.join(tmp, "entrada.csv")
+    output_path = os.path.join(tmp, "salida.csv")
+    pd.read_csv("tashist.csv")[:30].to_csv(input_path, index=False)
+
+    with FakeApiFootball(fixtures_from_csv("tashist.csv"), quota=0) as api:
+        summary = run_batch(input_path, output_path, make_resolver(api.base_url), chunk_size=10,
+                            journal=CheckpointJournal(os.path.join(tmp, "j.jsonl")))
+        # Tras la pausa los bloques siguientes no llaman a la API
+        assert len(api.hits) <= 2 * 10
+
+    assert summary["paused"] and summary["pending"] == 30 and summary["failed"] == 0
+    assert set(pd.read_csv(output_path)["Match_Status"]) == {"PENDING"}
+
+
+def test_api_caida_deja_filas_pendientes():
+    """Un 5xx no es 'no encontrado': las filas quedan pendientes, fuera del diario, y se reintentan"""
+    df = pd.read_csv("tashist.csv")[:20]
+    journal = CheckpointJournal(os.path.join(tempfile.mkdtemp(), "advanced.jsonl"))
+
+    with FakeApiFootball(fixtures_from_csv("tashist.csv")) as api:
+        api.unavailable = True
+        resolver = make_resolver(api.base_url)
+        first = resolve_dataframe(df, resolver, journal=journal)
+        summary = first["summary"]
+        assert summary["pending"] == len(df) and summary["failed"] == 0 and not summary["paused"]
+        assert all(r["pending"] and "no respondió" in r["error"] for r in first["results"])
+        assert len(journal) == 0 and not os.path.exists(journal.path)
+        assert not resolver.cache
+
+        api.unavailable = False
+        resumed = resolve_dataframe(df, resolver, journal=journal)
+    assert resumed["summary"]["successful"] == len(df) == len(journal)
+
+
+def test_cuota_agotada_en_la_descarga_paralela():
+    """La cuota agotada durante la descarga de fechas detiene las solicitudes y pausa el proceso"""
+    df = pd.read_csv("tashist.csv")
+    dates = {fecha.split()[0] for fecha in df["Fecha"]}
+    assert len(dates) > 10
+
+    with FakeApiFootball(fixtures_from_csv("tashist.csv"), quota=2) as api:
+        resolver = make_resolver(api.base_url)
+        try:
+            resolver.prefetch_dates(resolver.parse_match_text(t)["fecha_hora_cdmx"] for t in df["Match text"])
+            assert False, "debió lanzar QuotaExceededError"
+        except QuotaExceededError:
+            pass
+        # Solo las solicitudes ya en curso cuando se agotó la cuota
+        assert len(api.hits) <= 2 + resolver.client.max_concurrency
+
+        del api.hits[:]
+        result = resolve_dataframe(df, make_resolver(api.base_url))
+        assert len(api.hits) <= 2 + resolver.client.max_concurrency
+    assert result["summary"]["paused"] and result["summary"]["pending"] == len(df)
+
+
+def test_fallidas_vencen_en_el_diario():
+    path = os.path.join(tempfile.mkdtemp(), "j.jsonl")
+    journal = CheckpointJournal(path, failure_ttl=3600)
+    journal.append(row_key("A vs B"), {"success": True})
+    journal.append(row_key("C vs D"), {"success": False, "error": "No se encontró fixture"})
+    assert journal.get(row_key("C vs D"))["success"] is False
+
+    # Diario releído con vigencia cero: el éxito se reutiliza, el fallo se vuelve a resolver
+    expired = CheckpointJournal(path, failure_ttl=0)
+    assert expired.get(row_key("A vs B")) == {"success": True}
+    assert expired.get(row_key("C vs D")) is None
+
+
+def test_journal_tolera_linea_cortada():
+    path = os.path.join(tempfile.mkdtemp(), "sub", "j.jsonl")
+    journal = CheckpointJournal(path)
+    journal.append(row_key("A vs B"), {"success": True, "n": 1})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"key": "cortada", "result": {"succ')
+
+    reloaded = CheckpointJournal(path)
+    assert len(reloaded) == 1
+    assert row_key(" A vs B ") in reloaded
+    assert reloaded.get(row_key("A vs B")) == {"success": True, "n": 1}
+
+
+if __name__ == "__main__":
+    test_pausa_y_reanuda()
+    test_run_batch_pausado_escribe_pendientes()
+    test_api_caida_deja_filas_pendientes()
+    test_cuota_agotada_en_la_descarga_paralela()
+    test_fallidas_vencen_en_el_diario()
+    test_journal_tolera_linea_cortada()
@@ -0,0 +1,70 @@
+"""
+Script de prueba de extraer_contexto_partidos: mismo resultado que el recorrido
+fila por fila original y tiempo en un histórico grande
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from app import extraer_contexto_partidos
+
+
+def contexto_fila_por_fila(df):
+    """Implementación original con iterrows (referencia)"""
+    team_context = {}
+    for _, row in df.iterrows():
+        local = str(row.get('Local', '')).strip()
+        visitante = str(row.get('Visitante', '')).strip()
+        match_info = {
+            'opponent': visitante if local else local,
+            'match_text': str(row.get('Match text', '')).strip(),
+            'fecha': str(row.get('Fecha', '')).strip(),
+            'is_home': True if local else False
+        }
+        if local:
+            team_context.setdefault(local, []).append(dict(match_info, opponent=visitante, is_home=True))
+        if visitante:
+            team_context.setdefault(visitante, []).append(dict(match_info, opponent=local, is_home=False))
+    return team_context
+
+
+def _identico(df):
+    expected = contexto_fila_por_fila(df)
+    result = extraer_contexto_partidos(df)
+    assert result == expected
+    assert list(result) == list(expected)
+    for team in result:
+        assert [list(m) for m in result[team]] == [list(m) for m in expected[team]]
+        assert all(type(m['is_home']) is bool for m in result[team])
+
+
+def test_mismo_resultado_que_iterrows():
+    _identico(pd.read_csv("tashist.csv"))
+    _identico(pd.DataFrame({
+        'Local': [' América ', np.nan, '', 'Toluca', 'Pumas', None],
+        'Visitante': ['Chivas', 'Toluca', 'León', '', 'Pumas', 'Atlas'],
+        'Fecha': ['04/04/2025 21:00', np.nan, 'x', 'y', 'z', 'w'],
+        'Match text': [1, 2.5, 'a', ' b ', np.nan, 'c'],
+    }))
+    _identico(pd.DataFrame({'Visitante': ['Chivas', 'Chivas'], 'Local_1': ['A', 'B']}))
+    _identico(pd.DataFrame({'Local': [], 'Visitante': []}))
+
+
+def test_historico_grande():
+    base = pd.read_csv("tashist.csv")
+    df = pd.concat([base] * (100000 // len(base) + 1), ignore_index=True)[:100000]
+
+    start = time.perf_counter()
+    team_context = extraer_contexto_partidos(df)
+    elapsed = time.perf_counter() - start
+
+    assert sum(len(matches) for matches in team_context.values()) == 2 * len(df)
+    print(f"{len(df)} filas en {elapsed:.2f}s")
+    assert elapsed < 5
+
+
+if __name__ == "__main__":
+    test_mismo_resultado_que_iterrows()
+    test_historico_grande()
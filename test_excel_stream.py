@@ -0,0 +1,118 @@
+"""
+Script de prueba de los libros de Excel escritos fila por fila: mismo contenido que
+la exportación anterior (DataFrame completo + openpyxl en memoria) y memoria acotada
+"""
+
+import io
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from app import crear_excel_con_ids
+from resolver_pipeline import export_results, result_tables, summarize, summary_rows
+from result_exporters import export_tables
+from test_tabla_resultados import advanced_output_rows
+
+
+def _sheets(data: bytes):
+    return pd.read_excel(io.BytesIO(data), sheet_name=None)
+
+
+def _reference(sheets) -> bytes:
+    """Exportación anterior: DataFrames completos escritos con openpyxl en un BytesIO"""
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    return output.getvalue()
+
+
+def _assert_same(data: bytes, reference: bytes):
+    result, expected = _sheets(data), _sheets(reference)
+    assert list(result) == list(expected)
+    for name in expected:
+        pd.testing.assert_frame_equal(result[name], expected[name], check_dtype=False)
+
+
+def _advanced_results(df):
+    results = []
+    for i, row in df.iterrows():
+        original = row.to_dict()
+        if i % 4 == 3:
+            results.append({'row_index': i, 'success': False, 'error': 'Sin fixture', 'original_data': original})
+            continue
+        results.append({
+            'row_index': i, 'success': True, 'original_data': original,
+            'team_ids': {
+                'home': {'id': 1000 + i, 'name': row['Local'], 'original_name': row['Local']},
+                'away': {'id': 2000 + i, 'name': row['Visitante'], 'original_name': row['Visitante']},
+            },
+            'fixture': {'id': 5000 + i, 'league_id': 262, 'league_name': 'Liga MX', 'season': 2024},
+            'debug_info': {'score': 0.9, 's_home': 0.95, 's_away': 0.85},
+        })
+    return results
+
+
+def test_crear_excel_con_ids_igual_que_antes():
+    df = pd.read_csv("tashist.csv")
+    teams = sorted(set(df['Local']) | set(df['Visitante']))
+    results = {team: ({'api_team': {'id': n, 'name': team.upper(), 'country': 'Mexico'},
+                       'confidence': 0.9, 'method': 'exact'} if n % 3 else None)
+               for n, team in enumerate(teams)}
+    ids = {team: (result['api_team']['id'] if result else None) for team, result in results.items()}
+
+    mapping = pd.DataFrame([
+        {'Equipo_Original': team, 'API_Football_ID': r['api_team']['id'], 'API_Football_Name': r['api_team']['name'],
+         'Confidence': r['confidence'], 'Method': r['method'], 'Country': r['api_team']['country']} if r else
+        {'Equipo_Original': team, 'API_Football_ID': None, 'API_Football_Name': 'NO ENCONTRADO',
+         'Confidence': 0, 'Method': 'none', 'Country': 'N/A'}
+        for team, r in results.items()
+    ])
+    expected = df.assign(Local_API_ID=df['Local'].map(ids), Visitante_API_ID=df['Visitante'].map(ids))
+    _assert_same(crear_excel_con_ids(df, results),
+                 _reference({'Datos_con_IDs': expected, 'Mapeo_Equipos': mapping}))
+
+
+def test_libro_de_resultados_igual_que_antes():
+    df = pd.read_csv("tashist.csv")
+    df.loc[5, 'Fecha'] = np.nan
+    results = _advanced_results(df)
+    summary = summarize(len(df), sum(r['success'] for r in results), sum(not r['success'] for r in results))
+
+    rows = [advanced_output_rows(r, r['original_data']) for r in results]
+    reference = _reference({
+        'Datos_con_IDs': pd.DataFrame([data for data, _ in rows]),
+        'Mapeo_Avanzado': pd.DataFrame([mapping for _, mapping in rows]),
+        'Resumen': pd.DataFrame(summary_rows(summary, 'Advanced Resolver con Tokenización')),
+    })
+    data = export_results({'results': results, 'summary': summary}, 'advanced', df)
+    _assert_same(data, reference)
+
+
+def test_memoria_acotada():
+    """La memoria máxima al escribir el libro no crece con el número de filas (hojas ya unidas al original)"""
+    base = pd.read_csv("tashist.csv")
+    peaks = []
+    for copies in (5, 20):
+        df = pd.concat([base] * copies, ignore_index=True)
+        processing_results = {'results': _advanced_results(df), 'summary': summarize(len(df), len(df), 0)}
+
+        tables = result_tables(processing_results, 'advanced', df)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        data = export_tables(tables, 'xlsx')
+        elapsed = time.perf_counter() - start
+        peaks.append(tracemalloc.get_traced_memory()[1] - len(data))
+        tracemalloc.stop()
+        print(f"{len(df)} filas: {elapsed:.2f}s, pico {peaks[-1] / 1e6:.1f} MB, archivo {len(data) / 1e6:.1f} MB")
+
+    assert peaks[1] < 1.5 * peaks[0]
+
+
+if __name__ == "__main__":
+    test_crear_excel_con_ids_igual_que_antes()
+    test_libro_de_resultados_igual_que_antes()
+    test_memoria_acotada()
@@ -0,0 +1,79 @@
+"""
+Script de prueba de la caché H2H por par de equipos (servidor local, sin cuota)
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from dateutil import tz
+
+from fake_api_football import FakeApiFootball, make_fixture
+from h2h_cache import H2HCache
+from test_batch_resolver import make_resolver
+
+CDMX = tz.gettz("America/Mexico_City")
+
+
+def new_cache(today: str = "2025-06-01") -> H2HCache:
+    return H2HCache(os.path.join(tempfile.mkdtemp(), "h2h.db"), today=lambda: today)
+
+
+def test_par_sin_orden_y_fechas_ordenadas():
+    cache = new_cache()
+    assert cache.played_on(7, 3, "2025-04-05") is None
+    assert cache.request_params(7, 3, "2025-04-05") == {"h2h": "3-7"}
+
+    cache.merge(7, 3, ["2025-04-05", "2024-10-01", "2025-04-05"])
+    cache.merge(3, 7, ["2025-01-15"])
+    assert cache.get(3, 7) == {"dates": ["2024-10-01", "2025-01-15", "2025-04-05"], "covered_until": "2025-06-01"}
+    assert cache.played_on(3, 7, "2025-01-15") is True
+    assert cache.played_on(7, 3, "2025-01-16") is False
+    # Después de la fecha cubierta: consulta incremental
+    assert cache.played_on(3, 7, "2025-08-10") is None
+    assert cache.request_params(7, 3, "2025-08-10") == {"h2h": "3-7", "from": "2025-06-01", "to": "2025-08-10"}
+
+
+def test_desempate_h2h_usa_la_cache():
+    """El segundo desempate del mismo par (en cualquier orden) no llama a la API"""
+    day = datetime(2025, 4, 5, 17, 0, tzinfo=CDMX)
+    derby = ((1, "Uno"), (2, "Dos"))
+    other = ((3, "Tres"), (4, "Cuatro"))
+    fixtures = [make_fixture(10, day - timedelta(days=90), *derby), make_fixture(11, day, *other)]
+    candidates = [{"score": 1.0, "fixture": make_fixture(20, day, *derby)},
+                  {"score": 1.0, "fixture": make_fixture(21, day, *other)}]
+    swapped = [{"score": 1.0, "fixture": make_fixture(22, day, derby[1], derby[0])}, candidates[1]]
+
+    with FakeApiFootball(fixtures) as api:
+        resolver = make_resolver(api.base_url)
+        assert resolver._break_tie_with_h2h(candidates, day) is candidates[1]
+        assert len(api.hits) == 2
+        assert resolver._break_tie_with_h2h(swapped, day) is swapped[1]
+        assert len(api.hits) == 2
+
+    assert resolver.h2h_cache.get(2, 1)["dates"] == [(day - timedelta(days=90)).strftime("%Y-%m-%d")]
+
+
+def test_actualizacion_incremental():
+    """Solo se piden los partidos posteriores a la fecha cubierta y se agregan a la lista"""
+    first = datetime(2025, 3, 1, 19, 0, tzinfo=CDMX)
+    later = datetime(2025, 9, 20, 19, 0, tzinfo=CDMX)
+    fixtures = [make_fixture(10, first, (1, "Uno"), (2, "Dos")), make_fixture(11, later, (2, "Dos"), (1, "Uno"))]
+    candidate = {"score": 1.0, "fixture": make_fixture(20, later, (1, "Uno"), (2, "Dos"))}
+
+    with FakeApiFootball(fixtures) as api:
+        resolver = make_resolver(api.base_url)
+        resolver.h2h_cache = new_cache(today="2025-06-01")
+        resolver.h2h_cache.merge(1, 2, ["2025-03-01"])
+
+        assert resolver._h2h_cached(candidate, "2025-09-20") is None
+        assert resolver._break_tie_with_h2h([candidate, candidate], later) is candidate
+        assert api.hits == ["/fixtures/headtohead?h2h=1-2&from=2025-06-01&to=2025-09-20"]
+
+    assert resolver.h2h_cache.get(1, 2)["dates"] == ["2025-03-01", "2025-09-20"]
+
+
+if __name__ == "__main__":
+    test_par_sin_orden_y_fechas_ordenadas()
+    test_desempate_h2h_usa_la_cache()
+    test_actualizacion_incremental()
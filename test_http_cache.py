@@ -0,0 +1,130 @@
+"""
+Script de prueba de la caché HTTP persistente contra un servidor HTTP local
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from api_client import ApiFootballClient, QuotaExceededError
+from http_cache import (HttpCache, TTL_EMPTY_RESPONSE, TTL_TEAMS, TTL_TODAY_FIXTURES, cache_key,
+                        response_ttl, ttl_for)
+
+
+class EtagApi(BaseHTTPRequestHandler):
+    """
+    Responde con ETag fijo y 304 si el cliente lo envía; '/quota' simula cuota agotada
+    y '/empty' responde sin resultados
+    """
+
+    hits = []
+
+    def do_GET(self):
+        type(self).hits.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        errors = {"requests": "limit reached"} if self.path.startswith("/quota") else []
+        response = [] if self.path.startswith("/empty") else [{"path": self.path}]
+        body = json.dumps({"errors": errors, "response": response}).encode()
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def etag_api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EtagApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    EtagApi.hits = []
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_ttl_por_endpoint():
+    today = date.today()
+    assert ttl_for("/fixtures", {"date": str(today - timedelta(days=3))}) is None
+    assert ttl_for("/fixtures", {"date": str(today - timedelta(days=3)), "timezone": "America/Mexico_City"}) is None
+    assert ttl_for("fixtures", {"date": str(today + timedelta(days=3))}) > TTL_TODAY_FIXTURES
+    assert ttl_for("/teams", {"league": 39, "season": 2024}) == TTL_TEAMS
+    assert cache_key("/teams", {"season": 2024, "league": 39}) == cache_key("teams/", {"league": "39", "season": "2024"})
+    assert cache_key("/teams", {"league": 39}, "https://a/") != cache_key("/teams", {"league": 39}, "https://b")
+
+    # Una fecha pasada sin fixtures (aún no publicados) no se guarda para siempre
+    past = {"date": str(today - timedelta(days=3))}
+    assert response_ttl("/fixtures", past, b'{"errors": [], "response": []}') == TTL_EMPTY_RESPONSE
+    assert response_ttl("/fixtures", past, b'{"errors": [], "response": [{"id": 1}]}') is None
+
+
+def test_cache_vigente_y_revalidacion(etag_api):
+    now = [1000.0]
+    cache = HttpCache(os.path.join(tempfile.mkdtemp(), "api.db"), clock=lambda: now[0])
+    client = ApiFootballClient({}, base_url=etag_api, cache=cache)
+    params = {"league": 39, "season": 2024}
+
+    first = client.get("/teams", params)
+    again = ApiFootballClient({}, base_url=etag_api, cache=cache).get("/teams", params)
+    assert first.json() == again.json() and getattr(again, "from_cache", False)
+    assert len(EtagApi.hits) == 1
+
+    # Caducada: se revalida con If-None-Match y el 304 reutiliza el cuerpo guardado
+    now[0] += TTL_TEAMS + 1
+    revalidated = client.get("/teams", params)
+    assert revalidated.json() == first.json()
+    assert EtagApi.hits[-1][1] == '"v1"' and len(EtagApi.hits) == 2
+    client.get("/teams", params)
+    assert len(EtagApi.hits) == 2
+
+    # Las respuestas con 'errors' (cuota agotada) no se guardan
+    for _ in range(2):
+        with pytest.raises(QuotaExceededError):
+            client.get("/quota")
+    assert len(EtagApi.hits) == 4
+
+
+def test_respuestas_vacias_y_otra_api(etag_api):
+    now = [1000.0]
+    cache = HttpCache(os.path.join(tempfile.mkdtemp(), "api.db"), clock=lambda: now[0])
+    client = ApiFootballClient({}, base_url=etag_api, cache=cache)
+
+    client.get("/empty", {"league": 1})
+    client.get("/empty", {"league": 1})
+    assert len(EtagApi.hits) == 1
+    now[0] += TTL_EMPTY_RESPONSE + 1
+    client.get("/empty", {"league": 1})
+    assert len(EtagApi.hits) == 2
+
+    # Misma ruta en otra URL base (otro proxy de la API): entrada distinta
+    client.get("/teams", {"league": 1})
+    ApiFootballClient({}, base_url=etag_api + "/v3", cache=cache).get("/teams", {"league": 1})
+    assert len(EtagApi.hits) == 4
+
+
+def test_limite_de_tamano(etag_api):
+    now = [0.0]
+    cache = HttpCache(os.path.join(tempfile.mkdtemp(), "api.db"), max_bytes=250, clock=lambda: now[0])
+    client = ApiFootballClient({}, base_url=etag_api, cache=cache)
+    for league in range(6):
+        now[0] += 1
+        client.get("/teams", {"league": league})
+    assert 0 < cache.total_bytes() <= 250
+    assert cache.lookup(cache_key("/teams", {"league": 0}, etag_api)) is None
+    assert cache.lookup(cache_key("/teams", {"league": 5}, etag_api)) is not None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
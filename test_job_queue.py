@@ -0,0 +1,181 @@
+"""
+Script de prueba de la cola de trabajos en segundo plano (servidor local, sin cuota)
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+
+import pandas as pd
+
+from fake_api_football import FakeApiFootball, fixtures_from_csv
+from job_queue import JobQueue, JobWorkerPool
+from resolver_pipeline import resolve_dataframe
+from test_batch_resolver import make_resolver
+
+
+def make_pool(base_url: str, workers: int = 2, checkpoint_dir=None) -> JobWorkerPool:
+    queue = JobQueue(os.path.join(tempfile.mkdtemp(), "jobs.db"))
+    return JobWorkerPool(queue, workers=workers, resolver_factory=lambda method, api_key: make_resolver(base_url),
+                         checkpoint_dir=checkpoint_dir, poll_interval=0.05).start()
+
+
+def _outcome(results):
+    return [(r["row_index"], r["success"], r.get("team_ids")) for r in results]
+
+
+def test_trabajo_igual_que_proceso_directo():
+    """Los lotes se resuelven en segundo plano y el resultado sale en el orden del archivo"""
+    df = pd.read_csv("tashist.csv")[:60]
+    with FakeApiFootball(fixtures_from_csv("tashist.csv"), latency=0.02) as api:
+        pool = make_pool(api.base_url)
+        job_id = pool.submit(df, "advanced", "test-key", batch_size=15)
+        status = pool.wait(job_id, timeout=30)
+        pool.stop()
+        expected = resolve_dataframe(df, make_resolver(api.base_url))
+
+    assert status["status"] == "done" and status["processed"] == status["total"] == len(df)
+    results = pool.queue.results(job_id)
+    assert _outcome(results["results"]) == _outcome(expected["results"])
+    assert results["summary"] == expected["summary"]
+    pd.testing.assert_frame_equal(results["original_data"], df, check_dtype=False)
+    pd.testing.assert_frame_equal(results["table"], expected["table"])
+
+
+def test_segundo_trabajo_casi_gratis():
+    """Dos trabajos con las mismas fechas: el segundo no repite solicitudes a la API"""
+    df = pd.read_csv("tashist.csv")[:60]
+    with FakeApiFootball(fixtures_from_csv("tashist.csv"), latency=0.05) as api:
+        pool = make_pool(api.base_url, workers=3)
+        first = pool.submit(df, "advanced", "test-key", batch_size=20)
+        second = pool.submit(df.iloc[::-1], "advanced", "test-key", batch_size=7)
+        assert pool.wait(first, timeout=30)["status"] == "done"
+        assert pool.wait(second, timeout=30)["status"] == "done"
+        hits = len(api.hits)
+
+        third = pool.submit(df[10:40], "advanced", "test-key")
+        assert pool.wait(third, timeout=30)["status"] == "done"
+        pool.stop()
+
+    dates = {fecha.split()[0] for fecha in df["Fecha"]}
+    assert hits == len(set(api.hits)) == 2 * len(dates)
+    assert len(api.hits) == hits
+    assert pool.queue.status(second)["successful"] == len(df)
+
+
+def test_lotes_no_se_reclaman_dos_veces():
+    queue = JobQueue(os.path.join(tempfile.mkdtemp(), "jobs.db"))
+    job_id = queue.submit(pd.DataFrame({"Match text": [f"fila {i}" for i in range(200)]}), "advanced", batch_size=1)
+    claimed = []
+
+    def claim_all():
+        while True:
+            batch = queue.claim([job_id])
+            if batch is None:
+                return
+            claimed.append(batch["batch_no"])
+
+    threads = [threading.Thread(target=claim_all) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claimed) == list(range(200))
+    assert queue.status(job_id)["status"] == "running"
+    assert queue.requeue_running() == 200 and queue.status(job_id)["status"] == "queued"
+
+
+def test_lote_con_error_marca_el_trabajo():
+    calls = []
+
+    def broken_factory(method, api_key):
+        calls.append(method)
+        raise RuntimeError("sin resolver")
+
+    pool = JobWorkerPool(JobQueue(os.path.join(tempfile.mkdtemp(), "jobs.db"), max_attempts=2), workers=1,
+                         resolver_factory=broken_factory, checkpoint_dir=None, poll_interval=0.05).start()
+    job_id = pool.submit(pd.DataFrame({"Match text": ["a", "b"]}), "advanced", "test-key")
+    status = pool.wait(job_id, timeout=10)
+    pool.stop()
+    assert status["status"] == "failed" and status["error"] == "sin resolver"
+    assert len(calls) == 2 and job_id not in pool._api_keys
+    results = pool.queue.results(job_id)
+    assert [(r["row_index"], r["success"]) for r in results["results"]] == [(0, False), (1, False)]
+    assert pool.queue.status("no-existe") is None and pool.wait("no-existe") is None
+
+
+def test_lote_fallido_se_reintenta_y_no_oculta_los_demas():
+    """Un lote que falla una vez se reintenta; el trabajo no se marca fallido mientras quedan lotes"""
+    df = pd.read_csv("tashist.csv")[:30]
+    failures = []
+
+    with FakeApiFootball(fixtures_from_csv("tashist.csv")) as api:
+        resolver = make_resolver(api.base_url)
+        process_match_texts = resolver.process_match_texts
+
+        def flaky(match_texts):
+            if not failures:
+                failures.append(match_texts[0])
+                raise RuntimeError("fallo transitorio")
+            return process_match_texts(match_texts)
+
+        resolver.process_match_texts = flaky
+        queue = JobQueue(os.path.join(tempfile.mkdtemp(), "jobs.db"))
+        job_id = queue.submit(df, "advanced", batch_size=10)
+
+        batch = queue.claim([job_id])
+        assert queue.fail(job_id, batch["batch_no"], "caído") is True
+        assert queue.status(job_id)["status"] == "queued"
+
+        pool = JobWorkerPool(queue, workers=2, resolver_factory=lambda method, api_key: resolver,
+                             checkpoint_dir=None, poll_interval=0.05).start()
+        pool.resume(job_id, "test-key")
+        status = pool.wait(job_id, timeout=30)
+        pool.stop()
+
+    assert failures and status["status"] == "done" and status["successful"] == len(df)
+    assert status["error"] is None and not pool._api_keys
+
+
+def test_worker_sobrevive_error_de_la_cola():
+    queue = JobQueue(os.path.join(tempfile.mkdtemp(), "jobs.db"))
+    pool = JobWorkerPool(queue, workers=1, resolver_factory=lambda method, api_key: None,
+                         checkpoint_dir=None, poll_interval=0.01)
+    claim = queue.claim
+    errors = []
+
+    def broken_claim(job_ids):
+        if len(errors) < 3:
+            errors.append(job_ids)
+            raise sqlite3.OperationalError("database is locked")
+        return claim(job_ids)
+
+    queue.claim = broken_claim
+    pool.start()
+    job_id = pool.submit(pd.DataFrame({"Match text": ["texto sin formato"]}), "advanced", "test-key")
+    status = pool.wait(job_id, timeout=10)
+    pool.stop()
+    assert len(errors) == 3 and status["status"] == "done" and status["failed"] == 1
+
+
+def test_resolver_compartido_por_metodo_y_api_key():
+    """La interfaz reutiliza el resolver del pool en lugar de crear uno (y una sesión HTTP) por rerun"""
+    created = []
+    pool = JobWorkerPool(JobQueue(os.path.join(tempfile.mkdtemp(), "jobs.db")), workers=1,
+                         resolver_factory=lambda method, api_key: created.append((method, api_key)) or object(),
+                         checkpoint_dir=None)
+    matcher = pool.resolver("fixtures", "key-a")
+    assert pool.resolver("fixtures", "key-a") is matcher
+    assert pool.resolver("fixtures", "key-b") is not matcher
+    assert created == [("fixtures", "key-a"), ("fixtures", "key-b")]
+
+
+if __name__ == "__main__":
+    test_trabajo_igual_que_proceso_directo()
+    test_segundo_trabajo_casi_gratis()
+    test_lotes_no_se_reclaman_dos_veces()
+    test_lote_con_error_marca_el_trabajo()
+    test_lote_fallido_se_reintenta_y_no_oculta_los_demas()
+    test_worker_sobrevive_error_de_la_cola()
+    test_resolver_compartido_por_metodo_y_api_key()
@@ -0,0 +1,82 @@
+"""
+Script de prueba para la lectura incremental de JSON de API Football
+"""
+
+import io
+import json
+
+import pytest
+
+from json_stream import JsonTeamStream, _JsonReader, iter_api_football_teams
+
+TEAMS = [
+    {"id": 1553, "name": "Club América", "code": "AME", "country": "Mexico", "founded": 1916,
+     "logo": "https://media.api-sports.io/football/teams/1553.png", "national": False},
+    {"id": 8047, "name": "Cruz Azul \"La Máquina\"", "code": None, "country": "Mexico", "founded": 1927},
+    {"id": 2, "name": "Seleção", "country": "Brazil", "national": True, "venue": {"capacity": 78838}},
+    {"id": None, "name": "Sin ID"},
+]
+
+LAYOUTS = {
+    "response": {"get": "teams", "parameters": {"league": "262"}, "errors": [], "results": 4,
+                 "response": [{"team": team, "venue": {"id": 7}} for team in TEAMS]},
+    "teams": {"teams": TEAMS, "total": 4},
+    "list": TEAMS,
+    "indexed": {str(team["id"]): team for team in TEAMS[:3]},
+    "object": TEAMS[0],
+    "largest_list": {"meta": [1], "data": TEAMS},
+}
+
+
+@pytest.mark.parametrize("layout", list(LAYOUTS))
+def test_formatos_en_streaming(layout):
+    """Cada formato se detecta igual leyendo por bloques o con los datos ya cargados"""
+    data = LAYOUTS[layout]
+    text = json.dumps(data, ensure_ascii=False, indent=1)
+
+    parsed = JsonTeamStream(data)
+    expected = list(parsed)
+    assert parsed.layout == layout
+
+    # Bloques diminutos para cortar strings, números y caracteres multibyte
+    for source in (text, text.encode("utf-8"), io.BytesIO(text.encode("utf-8")), io.StringIO(text)):
+        for chunk_size in (1, 7, 4096):
+            if hasattr(source, "seek"):
+                source.seek(0)
+            stream = JsonTeamStream(source, chunk_size)
+            assert list(stream) == expected
+            assert stream.layout == layout
+
+    teams = list(iter_api_football_teams(text.encode("utf-8"), chunk_size=5))
+    assert all(team["id"] and team["name"] for team in teams)
+    print(f"{layout}: {len(teams)} equipos")
+
+
+def test_json_invalido():
+    """Un documento truncado o con datos extra produce JSONDecodeError"""
+    for text in ('{"response": [{"id": 1, "name": "A"}', '[{"id": 1}] []', '{"response": [1 2]}'):
+        with pytest.raises(json.JSONDecodeError):
+            list(JsonTeamStream(text, chunk_size=3))
+
+
+def test_memoria_acotada():
+    """El buffer no crece con el tamaño del documento"""
+    items = ",".join(json.dumps({"team": {"id": i, "name": f"Equipo {i}"}}) for i in range(1, 20001))
+    source = io.StringIO('{"response": [' + items + ']}')
+    assert sum(1 for _ in iter_api_football_teams(source, chunk_size=1024)) == 20000
+
+    source.seek(0)
+    reader = _JsonReader(source, chunk_size=1024)
+    max_buffer = 0
+    for _ in reader.iter_object():
+        for _ in reader.iter_array():
+            reader.read_value()
+            max_buffer = max(max_buffer, len(reader.buf))
+    assert max_buffer < 4 * 1024
+
+
+if __name__ == "__main__":
+    for name in LAYOUTS:
+        test_formatos_en_streaming(name)
+    test_json_invalido()
+    test_memoria_acotada()
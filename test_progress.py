@@ -0,0 +1,92 @@
+"""
+Script de prueba del reporte de avance: límite de actualizaciones por segundo y
+funciones de app.py sin efectos en la interfaz
+"""
+
+import json
+import os
+import tempfile
+
+import app
+import match_cache
+from alias_store import AliasStore
+from match_cache import MatchCache
+from progress import ProgressReporter, ThrottledProgress
+from team_catalog import TeamCatalog
+
+
+class RecordingProgress(ProgressReporter):
+    def __init__(self):
+        self.updates = []
+        self.messages = []
+
+    def update(self, done, total=None, message=''):
+        self.updates.append((done, total, message))
+
+    def message(self, level, text):
+        self.messages.append((level, text))
+
+
+class NoStreamlit:
+    """Reemplaza al módulo streamlit: cualquier llamada a la interfaz falla"""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"llamada a st.{name} fuera de la interfaz")
+
+
+def test_limite_de_actualizaciones_por_segundo():
+    now = [0.0]
+    recorder = RecordingProgress()
+    throttled = ThrottledProgress(recorder, max_per_second=10, clock=lambda: now[0])
+
+    # 1000 actualizaciones en 2 segundos: a lo más ~10 por segundo llegan a la interfaz
+    for done in range(1, 1001):
+        now[0] = done * 0.002
+        throttled.update(done, 1001, f"fila {done}")
+    assert 18 <= len(recorder.updates) <= 21
+
+    # La última retenida se entrega antes de un mensaje; el total siempre pasa
+    throttled.message('info', "aviso")
+    assert recorder.updates[-1][0] == 1000
+    throttled.update(1001, 1001, "fin")
+    assert recorder.updates[-1] == (1001, 1001, "fin") and recorder.messages == [('info', "aviso")]
+
+
+def test_funciones_sin_interfaz(monkeypatch):
+    """normalizar_json_api_football y procesar_equipos solo emiten eventos al callback"""
+    monkeypatch.setattr(app, "st", NoStreamlit())
+    monkeypatch.setattr(match_cache, "_cache", MatchCache(os.path.join(tempfile.mkdtemp(), "matches.db")))
+    aliases = AliasStore(os.path.join(tempfile.mkdtemp(), "aliases.db"), "teams")
+    api_teams = app.crear_datos_equipos_ejemplo()
+
+    events = RecordingProgress()
+    catalog = app.normalizar_json_api_football(json.dumps({"response": [{"team": t} for t in api_teams]}), events)
+    assert len(catalog) == len(api_teams)
+    assert ('info', f"📊 {len(api_teams)} equipos extraídos del JSON") in events.messages
+
+    # JSON inválido: catálogo vacío (no una lista) y el error va al callback
+    events = RecordingProgress()
+    empty = app.normalizar_json_api_football("{no es json", events)
+    assert isinstance(empty, TeamCatalog) and len(empty) == 0
+    assert events.messages[0][0] == 'error'
+
+    teams = [team["name"] for team in api_teams[:120]] + ["Xyz"]
+    events = RecordingProgress()
+    first = app.procesar_equipos(teams, catalog, progress=events, alias_store=aliases)
+    batches = -(-len(teams) // app.MATCH_BATCH_SIZE)
+    assert [done for done, _, _ in events.updates] == [min((b + 1) * app.MATCH_BATCH_SIZE, len(teams))
+                                                       for b in range(batches)] + [len(teams)]
+
+    # Segunda ejecución: todo sale de la caché y se informa con un mensaje
+    events = RecordingProgress()
+    assert app.procesar_equipos(teams, catalog, progress=events, alias_store=aliases) == first
+    assert events.messages[0][0] == 'info' and events.updates == [(0, 0, "✅ Procesamiento completado")]
+
+    # Sin callback no hay salida alguna
+    assert app.procesar_equipos(teams, catalog, alias_store=aliases) == first
+    assert app.procesar_equipos([], [], progress=events) == {} and events.messages[-1][0] == 'error'
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,66 @@
+"""
+Script de prueba del pipeline por lotes sin Streamlit (servidor local, sin cuota)
+"""
+
+import io
+import os
+import tempfile
+
+import pandas as pd
+
+from fake_api_football import FakeApiFootball, fixtures_from_csv
+from progress import ConsoleProgress
+from resolver_cli import main
+from resolver_pipeline import ADVANCED_DATA_COLUMNS, resolve_dataframe, run_batch
+from test_batch_resolver import make_resolver
+
+
+def test_excel_por_bloques():
+    """La salida por bloques coincide con resolver todo el DataFrame de una vez"""
+    df = pd.read_csv("tashist.csv")
+    output = os.path.join(tempfile.mkdtemp(), "salida.xlsx")
+    with FakeApiFootball(fixtures_from_csv("tashist.csv")) as api:
+        resolver = make_resolver(api.base_url)
+        summary = run_batch("tashist.csv", output, resolver, chunk_size=50)
+        expected = resolve_dataframe(df, make_resolver(api.base_url))
+
+    assert summary == expected['summary']
+    sheets = pd.read_excel(output, sheet_name=None)
+    assert list(sheets) == ['Datos_con_IDs', 'Mapeo_Avanzado', 'Resumen']
+
+    data = sheets['Datos_con_IDs']
+    assert list(data.columns) == list(df.columns) + ADVANCED_DATA_COLUMNS
+    assert list(data['Local']) == list(df['Local'])
+    assert list(data['Fixture_ID']) == [r['fixture']['id'] for r in expected['results']]
+    assert list(sheets['Mapeo_Avanzado']['Fila']) == list(range(1, len(df) + 1))
+    assert sheets['Resumen']['Valor'][0] == len(df)
+
+
+def test_csv_y_progreso_en_terminal():
+    df = pd.read_csv("tashist.csv").head(30)
+    df.loc[3, 'Match text'] = None
+    folder = tempfile.mkdtemp()
+    df.to_csv(os.path.join(folder, "entrada.csv"), index=False)
+    stream = io.StringIO()
+
+    with FakeApiFootball(fixtures_from_csv("tashist.csv")) as api:
+        summary = run_batch(os.path.join(folder, "entrada.csv"), os.path.join(folder, "salida.csv"),
+                            make_resolver(api.base_url), chunk_size=7, progress=ConsoleProgress(stream))
+
+    assert (summary['total'], summary['failed']) == (30, 1)
+    written = pd.read_csv(os.path.join(folder, "salida.csv"))
+    assert len(written) == 30 and written['Match_Status'][3] == 'NOT_FOUND'
+    assert written['Error'][3] == 'Sin texto de partido'
+    assert stream.getvalue().splitlines()[-1].startswith("[30/30] Completado: 29 exitosos")
+
+
+def test_cli_errores_de_uso():
+    folder = tempfile.mkdtemp()
+    assert main(["resolve", os.path.join(folder, "no_existe.csv"), "-o", "x.xlsx", "--api-key", "k", "-q"]) == 2
+    assert main(["resolve", "tashist.csv", "-o", os.path.join(folder, "x.txt"), "--api-key", "k", "-q"]) == 2
+
+
+if __name__ == "__main__":
+    test_excel_por_bloques()
+    test_csv_y_progreso_en_terminal()
+    test_cli_errores_de_uso()
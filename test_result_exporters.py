@@ -0,0 +1,100 @@
+"""
+Script de prueba de los exportadores de resultados: IDs como enteros con nulos en
+Parquet/Arrow/CSV, formatos según pyarrow y salida .parquet del ejecutor por lotes
+"""
+
+import io
+import os
+import tempfile
+import time
+
+import pandas as pd
+import pyarrow
+
+import result_exporters
+from app import exportar_con_ids
+from fake_api_football import FakeApiFootball, fixtures_from_csv
+from resolver_pipeline import export_results, run_batch, summarize
+from result_exporters import available_formats, default_format, export_tables
+from test_batch_resolver import make_resolver
+from test_excel_stream import _advanced_results
+
+
+def _processing_results(df):
+    results = _advanced_results(df)
+    return {'results': results, 'summary': summarize(len(df), sum(r['success'] for r in results),
+                                                     sum(not r['success'] for r in results))}
+
+
+def _check_ids(result: pd.DataFrame, df: pd.DataFrame):
+    """IDs Int64 con nulos en las filas fallidas (cada cuarta fila) y columnas originales intactas"""
+    for column in ['Local_API_ID', 'Visitante_API_ID', 'Fixture_ID', 'Liga_ID', 'Season']:
+        assert result[column].dtype == 'Int64', column
+    assert result['Local_API_ID'].isna().tolist() == [i % 4 == 3 for i in range(len(df))]
+    assert result['Local_API_ID'].dropna().tolist() == [1000 + i for i in range(len(df)) if i % 4 != 3]
+    assert result['Match text'].tolist() == df['Match text'].tolist()
+
+
+def test_parquet_y_arrow_conservan_tipos():
+    df = pd.read_csv("tashist.csv")
+    processing_results = _processing_results(df)
+
+    _check_ids(pd.read_parquet(io.BytesIO(export_results(processing_results, 'advanced', df, 'parquet'))), df)
+    data = export_results(processing_results, 'advanced', df, 'arrow')
+    _check_ids(pyarrow.ipc.open_file(pyarrow.BufferReader(data)).read_pandas(), df)
+
+
+def test_csv_sin_decimales_en_ids():
+    df = pd.read_csv("tashist.csv")
+    data = export_results(_processing_results(df), 'advanced', df, 'csv').decode('utf-8')
+    result = pd.read_csv(io.StringIO(data), dtype={'Local_API_ID': 'Int64'})
+    assert '1000.0' not in data
+    assert result['Local_API_ID'].iloc[0] == 1000 and pd.isna(result['Local_API_ID'].iloc[3])
+
+
+def test_ids_por_equipo():
+    df = pd.read_csv("tashist.csv")
+    teams = sorted(set(df['Local']) | set(df['Visitante']))
+    results = {team: ({'api_team': {'id': n, 'name': team, 'country': 'Mexico'}, 'confidence': 0.9,
+                       'method': 'exact'} if n % 3 else None) for n, team in enumerate(teams)}
+    result = pd.read_parquet(io.BytesIO(exportar_con_ids(df, results, 'parquet')))
+    assert result['Local_API_ID'].dtype == 'Int64'
+    assert result['Local_API_ID'].tolist() == [teams.index(t) if teams.index(t) % 3 else pd.NA for t in df['Local']]
+
+
+def test_formatos_segun_pyarrow(monkeypatch):
+    assert available_formats() == ['parquet', 'arrow', 'csv', 'xlsx']
+    assert default_format(10) == 'xlsx'
+    assert default_format(result_exporters.EXCEL_DEFAULT_MAX_ROWS + 1) == 'parquet'
+
+    monkeypatch.setattr(result_exporters, 'pyarrow', None)
+    assert available_formats() == ['csv', 'xlsx']
+    assert default_format(result_exporters.EXCEL_DEFAULT_MAX_ROWS + 1) == 'csv'
+    try:
+        export_tables({'Datos': (['a'], [[1]])}, 'parquet')
+        assert False, "parquet sin pyarrow debió fallar"
+    except ValueError:
+        pass
+
+
+def test_run_batch_a_parquet():
+    """El ejecutor por lotes escribe un row group por bloque con el mismo esquema"""
+    output_path = os.path.join(tempfile.mkdtemp(), "resultados.parquet")
+    df = pd.read_csv("tashist.csv")
+    with FakeApiFootball(fixtures_from_csv("tashist.csv")) as api:
+        summary = run_batch("tashist.csv", output_path, make_resolver(api.base_url), chunk_size=25)
+
+    start = time.perf_counter()
+    result = pd.read_parquet(output_path)
+    print(f"{len(result)} filas leídas en {time.perf_counter() - start:.3f}s")
+    assert summary['total'] == len(result) == len(df)
+    assert pd.api.types.is_integer_dtype(result['Local_API_ID'])
+    assert pd.api.types.is_float_dtype(result['Match_Score'])
+    assert result['Match text'].tolist() == df['Match text'].tolist()
+
+
+if __name__ == "__main__":
+    test_parquet_y_arrow_conservan_tipos()
+    test_csv_sin_decimales_en_ids()
+    test_ids_por_equipo()
+    test_run_batch_a_parquet()
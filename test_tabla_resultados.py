@@ -0,0 +1,244 @@
+"""
+Script de prueba de la tabla columnar de resultados: las hojas armadas con un join
+contra el DataFrame original son iguales a las del recorrido fila por fila original
+"""
+
+import json
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from resolver_pipeline import output_frames, result_table, results_json, summarize
+
+
+def advanced_output_rows(result, original):
+    """Implementación original fila por fila (referencia): Datos_con_IDs y Mapeo_Avanzado"""
+    row_data = original.copy()
+
+    if result['success']:
+        team_ids = result['team_ids']
+        fixture = result['fixture']
+        debug_info = result.get('debug_info', {})
+
+        # Agregar IDs a los datos originales
+        row_data['Local_API_ID'] = team_ids['home']['id']
+        row_data['Local_API_Name'] = team_ids['home']['name']
+        row_data['Visitante_API_ID'] = team_ids['away']['id']
+        row_data['Visitante_API_Name'] = team_ids['away']['name']
+        row_data['Fixture_ID'] = fixture['id']
+        row_data['Liga_ID'] = fixture['league_id']
+        row_data['Liga_Name'] = fixture['league_name']
+        row_data['Season'] = fixture['season']
+        row_data['Match_Status'] = 'FOUND'
+        row_data['Match_Method'] = 'ADVANCED_RESOLVER'
+        row_data['Match_Score'] = debug_info.get('score', 0)
+
+        mapping = {
+            'Fila': result['row_index'] + 1,
+            'Local_Original': team_ids['home']['original_name'],
+            'Local_API_Name': team_ids['home']['name'],
+            'Local_API_ID': team_ids['home']['id'],
+            'Visitante_Original': team_ids['away']['original_name'],
+            'Visitante_API_Name': team_ids['away']['name'],
+            'Visitante_API_ID': team_ids['away']['id'],
+            'Fixture_ID': fixture['id'],
+            'Liga': fixture['league_name'],
+            'Liga_ID': fixture['league_id'],
+            'Season': fixture['season'],
+            'Match_Score': round(debug_info.get('score', 0), 4),
+            'Home_Score': round(debug_info.get('s_home', 0), 3),
+            'Away_Score': round(debug_info.get('s_away', 0), 3),
+            'Status': 'SUCCESS'
+        }
+    else:
+        # Sin coincidencia
+        row_data['Local_API_ID'] = None
+        row_data['Local_API_Name'] = 'NOT_FOUND'
+        row_data['Visitante_API_ID'] = None
+        row_data['Visitante_API_Name'] = 'NOT_FOUND'
+        row_data['Fixture_ID'] = None
+        row_data['Liga_ID'] = None
+        row_data['Liga_Name'] = 'NOT_FOUND'
+        row_data['Season'] = None
+        row_data['Match_Status'] = 'PENDING' if result.get('pending') else 'NOT_FOUND'
+        row_data['Match_Method'] = 'ADVANCED_RESOLVER'
+        row_data['Match_Score'] = 0
+        row_data['Error'] = result.get('error', 'Unknown error')
+
+        mapping = {
+            'Fila': result['row_index'] + 1,
+            'Local_Original': original.get('Local', 'N/A'),
+            'Local_API_Name': 'NOT_FOUND',
+            'Local_API_ID': None,
+            'Visitante_Original': original.get('Visitante', 'N/A'),
+            'Visitante_API_Name': 'NOT_FOUND',
+            'Visitante_API_ID': None,
+            'Fixture_ID': None,
+            'Liga': 'NOT_FOUND',
+            'Liga_ID': None,
+            'Season': None,
+            'Match_Score': 0,
+            'Home_Score': 0,
+            'Away_Score': 0,
+            'Status': 'PENDING' if result.get('pending') else 'FAILED',
+            'Error': result.get('error', '')
+        }
+
+    return row_data, mapping
+
+
+def fixture_output_rows(result, original):
+    """Implementación original fila por fila (referencia): Datos_con_IDs y Mapeo_Fixtures"""
+    row_data = original.copy()
+
+    if result['success']:
+        team_ids = result['team_ids']
+
+        # Agregar IDs a los datos originales
+        row_data['Local_API_ID'] = team_ids['home']['id']
+        row_data['Local_API_Name'] = team_ids['home']['name']
+        row_data['Visitante_API_ID'] = team_ids['away']['id']
+        row_data['Visitante_API_Name'] = team_ids['away']['name']
+        row_data['Match_Status'] = 'FOUND'
+        row_data['Match_Method'] = 'FIXTURE_BASED'
+
+        mapping = {
+            'Fila': result['row_index'] + 1,
+            'Local_Original': team_ids['home']['original_name'],
+            'Local_API_Name': team_ids['home']['name'],
+            'Local_API_ID': team_ids['home']['id'],
+            'Visitante_Original': team_ids['away']['original_name'],
+            'Visitante_API_Name': team_ids['away']['name'],
+            'Visitante_API_ID': team_ids['away']['id'],
+            'Fecha_Fixture': result['match_info']['date'],
+            'Status': 'SUCCESS'
+        }
+    else:
+        # Sin coincidencia
+        row_data['Local_API_ID'] = None
+        row_data['Local_API_Name'] = 'NOT_FOUND'
+        row_data['Visitante_API_ID'] = None
+        row_data['Visitante_API_Name'] = 'NOT_FOUND'
+        row_data['Match_Status'] = 'PENDING' if result.get('pending') else 'NOT_FOUND'
+        row_data['Match_Method'] = 'FIXTURE_BASED'
+        row_data['Error'] = result.get('error', 'Unknown error')
+
+        mapping = {
+            'Fila': result['row_index'] + 1,
+            'Local_Original': original.get('Local', 'N/A'),
+            'Local_API_Name': 'NOT_FOUND',
+            'Local_API_ID': None,
+            'Visitante_Original': original.get('Visitante', 'N/A'),
+            'Visitante_API_Name': 'NOT_FOUND',
+            'Visitante_API_ID': None,
+            'Fecha_Fixture': 'N/A',
+            'Status': 'PENDING' if result.get('pending') else 'FAILED',
+            'Error': result.get('error', '')
+        }
+
+    return row_data, mapping
+
+
+def _results(df, method):
+    """Exitosos, fallidos, pendientes y un fallo sin mensaje de error"""
+    results = []
+    for i, row in zip(df.index, df.to_dict('records')):
+        if i % 5 == 3:
+            results.append({'row_index': i, 'success': False, 'error': 'Sin fixture'})
+        elif i % 5 == 4:
+            results.append({'row_index': i, 'success': False, 'pending': True,
+                            'error': 'Pendiente: cuota de la API agotada'})
+        elif i % 7 == 6:
+            results.append({'row_index': i, 'success': False})
+        else:
+            result = {
+                'row_index': i, 'success': True, 'original_text': row['Match text'],
+                'team_ids': {
+                    'home': {'id': 1000 + i, 'name': f"{row['Local']} FC", 'original_name': row['Local']},
+                    'away': {'id': 2000 + i, 'name': f"{row['Visitante']} FC", 'original_name': row['Visitante']},
+                },
+                'match_info': {'date': f"2024-03-{i % 28 + 1:02d}T20:00:00+00:00"},
+            }
+            if method == 'advanced':
+                result['fixture'] = {'id': 5000 + i, 'league_id': 262, 'league_name': 'Liga MX', 'season': 2024}
+                result['debug_info'] = {'score': 0.5 + (i % 50) / 100, 's_home': 0.95123, 's_away': 0.85}
+            results.append(result)
+    return results
+
+
+def _reference(results, df, method):
+    output_rows = advanced_output_rows if method == 'advanced' else fixture_output_rows
+    rows = [output_rows(result, df.loc[result['row_index']].to_dict()) for result in results]
+    return pd.DataFrame([data for data, _ in rows]), pd.DataFrame([mapping for _, mapping in rows])
+
+
+def _values(df):
+    """Columnas y valores sin tipos (NaN, None y NA como None)"""
+    df = df.reset_index(drop=True).astype(object)
+    return list(df.columns), df.where(df.notna(), None).values.tolist()
+
+
+def test_mismo_resultado_que_fila_por_fila():
+    df = pd.read_csv("tashist.csv")
+    df.loc[3, 'Local'] = np.nan
+    df['Local_API_ID'] = 'viejo'
+    for method in ('advanced', 'fixtures'):
+        results = _results(df, method)
+        data, mapping = output_frames({'results': results}, method, df)
+        expected_data, expected_mapping = _reference(results, df, method)
+        assert _values(data) == _values(expected_data)
+        assert _values(mapping) == _values(expected_mapping)
+
+    # Sin columnas Local/Visitante en el original
+    results = _results(df, 'advanced')
+    _, mapping = output_frames({'results': results}, 'advanced', df[['Match text']])
+    _, expected = _reference(results, df[['Match text']], 'advanced')
+    assert _values(mapping) == _values(expected)
+
+
+def test_tabla_tipada():
+    df = pd.read_csv("tashist.csv")
+    table = result_table(_results(df, 'advanced'))
+    assert list(table.index) == list(df.index)
+    assert table['home_id'].dtype == 'Int64' and table['score'].dtype == 'Float64'
+    assert table['home_id'].isna().sum() == sum(1 for i in df.index if i % 5 in (3, 4) or (i % 5 < 3 and i % 7 == 6))
+    assert result_table([]).empty
+
+
+def test_json_descargable_sin_dataframes():
+    """El JSON de descarga trae los resultados como datos, no el texto de los DataFrames"""
+    df = pd.read_csv("tashist.csv")[:10]
+    results = _results(df, 'advanced')
+    results[0]['parse_info'] = {'fecha_hora_cdmx': datetime(2025, 4, 5, 17, 0), 'score': np.float64(0.5)}
+    processing_results = {'results': results, 'table': result_table(results), 'original_data': df,
+                          'summary': summarize(10, 7, 3)}
+
+    payload = json.loads(results_json(processing_results))
+    assert set(payload) == {'results', 'summary'} and len(payload['results']) == 10
+    assert payload['results'][0]['parse_info'] == {'fecha_hora_cdmx': '2025-04-05T17:00:00', 'score': 0.5}
+
+
+def test_exportacion_rapida():
+    base = pd.read_csv("tashist.csv")
+    df = pd.concat([base] * (20000 // len(base) + 1), ignore_index=True)[:20000]
+    results = _results(df, 'advanced')
+    processing_results = {'results': results, 'table': result_table(results)}
+
+    start = time.perf_counter()
+    output_frames(processing_results, 'advanced', df)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _reference(results, df, 'advanced')
+    reference = time.perf_counter() - start
+    print(f"{len(df)} filas: join {elapsed:.2f}s, fila por fila {reference:.2f}s")
+    assert elapsed < reference / 5
+
+
+if __name__ == "__main__":
+    test_mismo_resultado_que_fila_por_fila()
+    test_tabla_tipada()
+    test_json_descargable_sin_dataframes()
+    test_exportacion_rapida()
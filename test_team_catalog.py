@@ -0,0 +1,212 @@
+"""
+Script de prueba para el catálogo indexado de equipos (sin llamadas a la API)
+"""
+
+import os
+import tempfile
+
+from team_catalog import TeamCatalog, normalize_team_name
+from alias_store import AliasStore
+from match_cache import MatchCache
+import match_cache
+from progress import NullProgress
+from app import TeamAssociationSystem, crear_datos_equipos_ejemplo, procesar_equipos
+
+def test_normalizacion_y_busqueda_exacta():
+    """El catálogo resuelve nombres normalizados en O(1)"""
+    catalog = TeamCatalog(crear_datos_equipos_ejemplo())
+
+    assert normalize_team_name("Club América") == "américa"
+    assert catalog.lookup("FC Barcelona")["id"] == 2
+    assert catalog.lookup("barcelona")["id"] == 2
+    assert catalog.lookup("Equipo Inexistente") is None
+    print(f"Catálogo con {len(catalog)} equipos: búsqueda exacta OK")
+
+def test_catalogo_columnar():
+    """Las filas del catálogo columnar se leen igual que los dicts originales"""
+    api_teams = crear_datos_equipos_ejemplo() + [
+        {"id": 1553, "name": "América", "code": None, "country": "Mexico", "founded": 1916,
+         "logo": "https://media.api-sports.io/football/teams/1553.png", "national": False},
+        {"id": "x1", "name": "Sin país", "logo": "otro.png", "venue": {"city": "Lima"}},
+    ]
+    catalog = TeamCatalog(api_teams)
+
+    assert len(catalog) == len(api_teams)
+    for team, row in zip(api_teams, catalog):
+        assert row == team and row.to_dict() == team and list(row) == list(team)
+        assert row.get("country", "") == team.get("country", "") and row.get("founded") == team.get("founded")
+    assert catalog.teams[-1]["venue"] == {"city": "Lima"} and "country" not in catalog.teams[-1]
+    assert catalog.country_values.count("England") == 1
+    assert [r["id"] for r in catalog[:2]] == [1, 2] and catalog.index_of_id(1553) == len(api_teams) - 2
+
+def test_find_best_match_con_catalogo():
+    """find_best_match da el mismo resultado con lista o con catálogo"""
+    api_teams = crear_datos_equipos_ejemplo()
+    system = TeamAssociationSystem()
+    catalog = system.get_catalog(api_teams)
+
+    assert system.get_catalog(api_teams) is catalog
+
+    for team in ["Man City", "ÁGUILAS", "Real Madrid", "Monterey", "Seattle"]:
+        from_list = system.find_best_match(team, api_teams)
+        from_catalog = system.find_best_match(team, catalog)
+        assert from_list == from_catalog
+        if from_catalog:
+            print(f"{team} -> {from_catalog['api_team']['name']} ({from_catalog['method']})")
+
+    assert system.find_best_match("Man City", catalog)["method"] == "manual_mapping"
+    assert system.find_best_match("Toluca FC", catalog)["method"] == "exact_match"
+
+    # La misma lista modificada en su lugar (mismo tamaño, otro equipo) reconstruye el catálogo
+    assert not hasattr(catalog, "source")
+    api_teams[0] = {"id": 999, "name": "Club Nuevo", "country": "Mexico"}
+    rebuilt = system.get_catalog(api_teams)
+    assert rebuilt is not catalog and rebuilt[0]["id"] == 999
+
+def test_indice_ngramas_igual_a_fuerza_bruta():
+    """La preselección por n-gramas devuelve lo mismo que recorrer todo el catálogo"""
+    api_teams = crear_datos_equipos_ejemplo()
+    catalog = TeamCatalog(api_teams)
+    indexed = TeamAssociationSystem()
+    brute_force = TeamAssociationSystem(use_ngram_index=False)
+
+    shortlist = catalog.candidate_indices(catalog.normalize("Manchester Cty"))
+    assert 2 in shortlist and len(shortlist) < len(catalog)
+
+    context = [{"opponent": "Chelsea"}, {"opponent": "Liverpool"}]
+    for team in ["Manchester Cty", "Bayern Múnich", "Atlético de Madrid", "LA Galaxi", "Pachuka", "Xyz"]:
+        assert indexed.find_best_match(team, catalog, context) == brute_force.find_best_match(team, catalog, context)
+
+def test_match_many_matriz_de_candidatos():
+    """match_many devuelve los top-k candidatos de todo el lote en una llamada"""
+    catalog = TeamCatalog(crear_datos_equipos_ejemplo())
+    system = TeamAssociationSystem()
+    teams = ["Man City", "Manchester Cty", "Inter Milán", "Xyz"]
+
+    batch = system.match_many(teams, catalog, {"Manchester Cty": [{"opponent": "Chelsea"}]}, top_k=3)
+
+    assert batch["indices"].shape == (4, 3) and batch["scores"].shape == (4, 3)
+    assert batch["candidates"]["Man City"][0]["method"] == "manual_mapping"
+    assert batch["candidates"]["Xyz"] == [] and batch["indices"][3, 0] == -1
+    for row, team in enumerate(teams):
+        confidences = [c["confidence"] for c in batch["candidates"][team]]
+        assert confidences == sorted(confidences, reverse=True)
+        assert confidences == [s for s in batch["scores"][row].tolist() if s == s]
+        assert system.best_candidate(batch["candidates"][team]) == system.find_best_match(
+            team, catalog, [{"opponent": "Chelsea"}] if team == "Manchester Cty" else None)
+    print(batch["scores"])
+
+def test_top_k_con_margen():
+    """Con top_k el mejor candidato trae alternativas y el margen frente al segundo"""
+    api_teams = crear_datos_equipos_ejemplo() + [{"id": 99, "name": "Arsenal de Sarandí", "country": "Argentina"}]
+    system = TeamAssociationSystem()
+
+    result = system.find_best_match("Arsenl", api_teams, top_k=3)
+    assert result["api_team"]["id"] == 7
+    assert result["alternatives"][0]["api_team"]["id"] == 99
+    assert result["margin"] == result["confidence"] - result["alternatives"][0]["confidence"] >= 0
+    assert all(0 <= c["confidence"] <= 1 for c in [result] + result["alternatives"])
+
+    # La coincidencia exacta no es ambigua: sin alternativas ni margen
+    exact = system.find_best_match("Arsenal", api_teams, top_k=3)
+    assert exact["method"] == "exact_match" and exact["confidence"] == 1.0
+    assert exact["alternatives"] == [] and exact["margin"] is None
+
+    # Sin top_k el resultado conserva su forma original
+    assert "margin" not in system.find_best_match("Arsenal", api_teams)
+    print(f"Arsenal -> margen {result['margin']:.3f}")
+
+def test_alias_store_persistente():
+    """Los matches confirmados se guardan y se resuelven por alias en otra sesión"""
+    api_teams = crear_datos_equipos_ejemplo()
+    path = os.path.join(tempfile.mkdtemp(), "aliases.db")
+
+    system = TeamAssociationSystem(alias_store=AliasStore(path, "teams"))
+    assert system.find_best_match("Man City", api_teams)["method"] == "manual_mapping"
+    result = system.find_best_match("Manchester Cty", api_teams)
+    assert result["method"] == "similarity"
+
+    assert result["confidence"] > 0.9 and result["name_similarity"] > 0.9
+    # Confianza alta solo por bonos (contenido/contexto): no se fija como alias
+    assert system.remember_confirmed({"Man Cty": dict(result, confidence=1.15, name_similarity=0.7)}) == 0
+    assert system.remember_confirmed({"Manchester Cty": result}) == 1
+
+    # Nueva instancia: el alias se carga desde SQLite bajo demanda
+    reloaded = TeamAssociationSystem(alias_store=AliasStore(path, "teams"))
+    match = reloaded.find_best_match("Manchester Cty", api_teams)
+    assert match["method"] == "alias_store" and match["api_team"]["id"] == 3
+    # Los alias semilla no se sobrescriben
+    assert reloaded.remember_confirmed({"Man City": dict(result, confidence=0.99)}) == 0
+    print(f"Alias persistentes: {len(reloaded.alias_store)}")
+
+def test_semilla_actualizada_en_base_existente():
+    """Los cambios en la semilla llegan a una base ya creada sin tocar los alias manuales"""
+    path = os.path.join(tempfile.mkdtemp(), "aliases.db")
+    store = AliasStore(path, "teams", seed={"Spurs": "Tottenham", "Wolves": "Wolverhampton"})
+    assert store.add("Gunners", "Arsenal", source="manual")
+    store.add("Man Utd", "Manchester United FC")
+
+    reloaded = AliasStore(path, "teams", seed={"Spurs": "Tottenham Hotspur", "Man Utd": "Manchester United",
+                                               "Gunners": "Arsenal FC"})
+    assert reloaded.get("Spurs")["target"] == "Tottenham Hotspur"
+    assert reloaded.get("Man Utd") == {"target": "Manchester United", "team_id": None,
+                                       "confidence": 1.0, "source": "seed"}
+    assert reloaded.get("Gunners")["source"] == "manual"
+    # Un alias retirado de la semilla desaparece
+    assert reloaded.get("Wolves") is None
+
+def test_cache_de_resultados_entre_ejecuciones():
+    """Los resultados se reutilizan con el mismo catálogo y se invalidan si cambia"""
+    path = os.path.join(tempfile.mkdtemp(), "matches.db")
+    cache = MatchCache(path, max_entries=3)
+    cache.put_many("v1", {("a", ""): {"confidence": 1.0}, ("b", ""): None})
+    assert cache.get_many("v1", [("a", ""), ("b", ""), ("c", "")]) == {("a", ""): {"confidence": 1.0}, ("b", ""): None}
+    assert cache.get_many("v2", [("a", "")]) == {}
+
+    # LRU: al superar el máximo se expulsa el menos usado
+    cache.get_many("v1", [("a", "")])
+    cache.put_many("v1", {("c", ""): None, ("d", ""): None})
+    assert len(cache) == 3 and ("b", "") not in cache.get_many("v1", [("b", "")])
+
+    # procesar_equipos: la segunda ejecución sale de la caché con el mismo resultado,
+    # salvo el nombre cuyo alias se confirmó en la primera (se resuelve por alias)
+    match_cache._cache = MatchCache(os.path.join(tempfile.mkdtemp(), "matches.db"))
+    api_teams = crear_datos_equipos_ejemplo()
+    teams = ["Man City", "Manchester Cty", "Real Madrid", "Xyz"]
+    context = {"Manchester Cty": [{"opponent": "Chelsea"}]}
+    aliases = AliasStore(os.path.join(tempfile.mkdtemp(), "aliases.db"), "teams")
+    first = procesar_equipos(teams, api_teams, context, alias_store=aliases)
+    assert len(match_cache._cache) == len(teams) and "Manchester Cty" in aliases
+    second = procesar_equipos(teams, api_teams, context, alias_store=aliases)
+    assert second["Manchester Cty"]["method"] == "alias_store" and len(match_cache._cache) == len(teams) + 1
+    assert {team: r and r["api_team"]["id"] for team, r in second.items()} == \
+        {team: r and r["api_team"]["id"] for team, r in first.items()}
+    assert {t: second[t] for t in teams if t != "Manchester Cty"} == {t: first[t] for t in teams if t != "Manchester Cty"}
+    assert procesar_equipos(teams, api_teams, context, alias_store=aliases) == second
+    catalog = TeamCatalog(api_teams)
+    assert catalog.version == TeamCatalog(crear_datos_equipos_ejemplo()).version
+    assert catalog.version != TeamCatalog(api_teams[:-1]).version
+
+def test_validacion_de_estructura_con_catalogo():
+    """La validación de claves también se aplica a filas del catálogo (Mapping, no dict)"""
+    events = []
+
+    class Recorder(NullProgress):
+        def message(self, level, text):
+            events.append(level)
+
+    incomplete = TeamCatalog([{"name": "Arsenal", "country": "England"}])
+    assert procesar_equipos(["Arsenal"], incomplete, progress=Recorder()) == {}
+    assert events[0] == 'error'
+
+if __name__ == "__main__":
+    test_normalizacion_y_busqueda_exacta()
+    test_catalogo_columnar()
+    test_find_best_match_con_catalogo()
+    test_indice_ngramas_igual_a_fuerza_bruta()
+    test_match_many_matriz_de_candidatos()
+    test_top_k_con_margen()
+    test_alias_store_persistente()
+    test_semilla_actualizada_en_base_existente()
+    test_cache_de_resultados_entre_ejecuciones()
+    test_validacion_de_estructura_con_catalogo()